@@ -0,0 +1,10 @@
+# ====== 탐지 공용 모듈 ======
+# drone_counter/dc.py 와 image_stitching_head_counter/people_head_counter.py 가 함께 쓰는
+# 박스 묶음, IoU/NMS/WBF, 크기/비율 필터, 타일 분할
+# 각 도구는 저장소 루트를 sys.path 에 넣고 `from detection_core import ...` 로 사용
+# ===========================
+from .boxes import Boxes, size_aspect_mask, filter_boxes
+from .iou import iou_xyxy, iou_matrix, pair_iou, pair_iou_eps
+from .nms import dedup_boxes, dedup_boxes_py, nms
+from .wbf import wbf_merge, wbf_merge_fast
+from .tiling import tile_windows, tile_to_global
@@ -0,0 +1,205 @@
+import os, sys, json, time, argparse
+import numpy as np
+
+if __package__ in (None, ""):  # python detection_core/bench.py 로 직접 실행한 경우
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection_core import (Boxes, filter_boxes, dedup_boxes, dedup_boxes_py, nms, wbf_merge, wbf_merge_fast,
+                            tile_windows, tile_to_global)
+
+# ====== 탐지 공용 모듈 벤치마크 ======
+# 모델 가중치/GPU 없이 합성 박스와 가짜 타일 탐지기로 속도와 정확도를 측정
+#   python -m detection_core.bench                       # 표 출력 (tool_merge = dc.merge_boxes 와 같은 이미지별 호출)
+#   python -m detection_core.bench --save base.json      # 기준 저장
+#   python -m detection_core.bench --baseline base.json  # 기준 대비 느려진 항목 표시(종료 코드 1)
+# ====================================
+SLOWDOWN_TOL = 1.25    # 기준보다 이 배수 이상 느리면 회귀로 봄
+REPEAT = 3             # 항목마다 반복 측정 후 최솟값 사용
+TOOL_IMAGES = 200      # tool_merge: 이미지 수 (이미지마다 dc.merge_boxes 와 같은 호출 1회)
+
+
+def synthetic_scene(people, size=(8000, 5000), seed=0):
+    """사람(정답 박스) 배치: 폭 10~60px, 세로/가로 비 1.5~3"""
+    rng = np.random.default_rng(seed)
+    W, H = size
+    w = rng.uniform(10, 60, people)
+    h = w * rng.uniform(1.5, 3.0, people)
+    x1 = rng.uniform(0, W - w); y1 = rng.uniform(0, H - h)
+    return np.c_[x1, y1, x1 + w, y1 + h]
+
+
+class StubTileDetector:
+    """타일 안에 중심이 있는 정답 박스를 흔들어 돌려주는 가짜 탐지기 (놓침/오탐 포함)"""
+
+    def __init__(self, truth, miss=0.05, false_pos=2, jitter=0.06, seed=0):
+        self.truth = truth
+        self.miss, self.false_pos, self.jitter = miss, false_pos, jitter
+        self.rng = np.random.default_rng(seed)
+        self.cx = (truth[:, 0] + truth[:, 2]) / 2
+        self.cy = (truth[:, 1] + truth[:, 3]) / 2
+
+    def __call__(self, win, scale=1.0):
+        """win: 확대 이미지 좌표 타일 창 → 타일 좌표 (boxes, scores)"""
+        x0, y0, x1, y1 = win
+        cx, cy = self.cx * scale, self.cy * scale
+        inside = (cx >= x0) & (cx < x1) & (cy >= y0) & (cy < y1)
+        inside &= self.rng.random(len(inside)) >= self.miss
+        b = self.truth[inside] * scale
+        wh = np.c_[b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]]
+        b = b + self.rng.normal(0, self.jitter, b.shape) * np.tile(wh, 2)
+        fp = self.rng.uniform(0, 1, (self.false_pos, 2)) * [x1 - x0, y1 - y0]
+        fp = np.c_[fp, fp + 20 * scale] + [x0, y0, x0, y0]
+        b = np.r_[b, fp] - [x0, y0, x0, y0]
+        scores = np.r_[self.rng.uniform(0.4, 0.95, int(inside.sum())), self.rng.uniform(0.15, 0.3, self.false_pos)]
+        return b.tolist(), scores.tolist()
+
+
+def stub_pipeline(truth, size, scales=(1.0, 1.5), tile=1024, overlap=0.4, iou_thr=0.55, conf=0.35,
+                  merge=wbf_merge_fast, seed=0):
+    """people_head_counter 와 같은 흐름(스케일 × 타일 → 좌표 변환 → WBF)을 가짜 탐지기로 실행"""
+    det = StubTileDetector(truth, seed=seed)
+    W, H = size
+    all_boxes, all_scores = [], []
+    for s in scales:
+        Hs, Ws = (H, W) if s == 1.0 else (int(H*s), int(W*s))
+        for win in tile_windows(Hs, Ws, tile, overlap):
+            boxes, scores = det(win, s)
+            gb, gs = [], []
+            tile_to_global(boxes, scores, win, Hs, Ws, gb, gs)
+            all_boxes.extend([v / s for v in b] for b in gb); all_scores.extend(gs)
+    merged, merged_scores = merge(all_boxes, all_scores, iou_thr=iou_thr)
+    return [b for b, sc in zip(merged, merged_scores) if sc >= conf], len(all_boxes)
+
+
+def filter_boxes_py(boxes_per_model, min_size=10, max_size=400, min_aspect=0.3, max_aspect=3.0):
+    """dc.py 의 기존 파이썬 루프 필터 (비교용)"""
+    out = []
+    for boxes in boxes_per_model:
+        for (x1, y1, x2, y2) in boxes:
+            w, h = x2 - x1, y2 - y1
+            if w < min_size or h < min_size or w > max_size or h > max_size:
+                continue
+            aspect = h / w if w > 0 else 0
+            if min_aspect <= aspect <= max_aspect:
+                out.append((x1, y1, x2, y2))
+    return out
+
+
+def merge_boxes_py(raw, iou_thr=0.4):
+    """dc.py 의 기존 방식: 파이썬 루프 필터 → 파이썬 O(n²) 중복 제거 (비교용)"""
+    return dedup_boxes_py(filter_boxes_py(raw), iou_thr)
+
+
+def merge_boxes_tool(raw, iou_thr=0.4):
+    """dc.merge_boxes 가 실제로 부르는 경로: 모델별 튜플 리스트 → filter_boxes → dedup_boxes"""
+    return dedup_boxes(filter_boxes(raw), iou_thr)
+
+
+def synthetic_raw(n, seed=0):
+    """두 모델의 원시 정수 박스 (중복 5배, 필터에 걸리는 크기/비율 섞음)"""
+    truth = synthetic_scene(max(1, n // 5), size=(4000, 3000), seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    idx = rng.integers(0, len(truth), n)
+    b = (truth[idx] + rng.integers(-6, 7, (n, 4))).astype(np.int64)
+    half = n // 2
+    return [[tuple(x) for x in b[:half].tolist()], [tuple(x) for x in b[half:].tolist()]]
+
+
+def timed(fn, *args, **kw):
+    best, out = float("inf"), None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = fn(*args, **kw)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def run_suite(sizes, ref_max, per_image=()):
+    """[{name, n, seconds, ref_seconds, check}] — check: 기준 구현과 결과 일치 여부 또는 계수 오차"""
+    rows = []
+    # 도구가 실제로 부르는 경로: 이미지 1장 분량(per_image 개)의 튜플 리스트를 TOOL_IMAGES 장 처리
+    for n in per_image:
+        images = [synthetic_raw(n, seed=k) for k in range(TOOL_IMAGES)]
+        out, t = timed(lambda: [merge_boxes_tool(r) for r in images])
+        ref, t_ref = timed(lambda: [merge_boxes_py(r) for r in images]) if n <= ref_max else (None, None)
+        rows.append(dict(name="tool_merge", n=n, seconds=t, ref_seconds=t_ref, check=None if ref is None else ref == out))
+
+    for n in sizes:
+        raw = synthetic_raw(n)
+        out, t = timed(filter_boxes, raw)
+        ref, t_ref = timed(filter_boxes_py, raw) if n <= ref_max else (None, None)
+        rows.append(dict(name="filter", n=n, seconds=t, ref_seconds=t_ref, check=None if ref is None else ref == out))
+
+        arr = Boxes.concat([Boxes(r, dtype=np.int64) for r in raw])
+        out_arr, t = timed(filter_boxes, arr)
+        rows.append(dict(name="filter_arr", n=n, seconds=t, ref_seconds=t_ref,
+                         check=None if ref is None else ref == out_arr.totuples()))
+
+        flat = filter_boxes(raw)
+        out, t = timed(dedup_boxes, flat, 0.4)
+        ref, t_ref = timed(dedup_boxes_py, flat, 0.4) if n <= ref_max else (None, None)
+        rows.append(dict(name="dedup", n=n, seconds=t, ref_seconds=t_ref, check=None if ref is None else ref == out))
+
+        scores = np.random.default_rng(n).uniform(0.1, 1.0, len(flat))
+        _, t = timed(nms, flat, scores, 0.4)
+        rows.append(dict(name="nms", n=n, seconds=t, ref_seconds=None, check=None))
+
+        fb = [list(map(float, b)) for b in flat]; fs = scores.tolist()
+        out, t = timed(wbf_merge_fast, fb, fs, 0.55)
+        ref, t_ref = timed(wbf_merge, fb, fs, 0.55) if n <= ref_max else (None, None)
+        rows.append(dict(name="wbf", n=n, seconds=t, ref_seconds=t_ref, check=None if ref is None else ref == out))
+
+        # 가짜 탐지기 전체 흐름: n ≈ 정답 인원 × 스케일 수 × 타일 겹침 수
+        size = (8000, 5000)
+        truth = synthetic_scene(max(1, n // 4), size=size)
+        (found, raw_n), t = timed(stub_pipeline, truth, size)
+        rows.append(dict(name="stub_pipeline", n=raw_n, seconds=t, ref_seconds=None,
+                         check=round(abs(len(found) - len(truth)) / len(truth), 4)))
+    return rows
+
+
+def print_rows(rows, baseline=None):
+    base = {(r["name"], r["n"]): r["seconds"] for r in (baseline or [])}
+    print(f"{'case':>14} {'n':>7} {'sec':>9} {'ref sec':>9} {'speedup':>8}  check      vs base")
+    slow = []
+    for r in rows:
+        ref = "-" if r["ref_seconds"] is None else f"{r['ref_seconds']:9.4f}"
+        sp = "-" if r["ref_seconds"] is None else f"{r['ref_seconds'] / r['seconds']:7.1f}x"
+        check = "-" if r["check"] is None else (f"err {r['check']:.1%}" if r["name"] == "stub_pipeline" else str(r["check"]))
+        vs = ""
+        b = base.get((r["name"], r["n"]))
+        if b:
+            vs = f"{r['seconds'] / b:5.2f}x"
+            if r["seconds"] > b * SLOWDOWN_TOL:
+                vs += "  느려짐"; slow.append(r)
+        print(f"{r['name']:>14} {r['n']:7d} {r['seconds']:9.4f} {ref:>9} {sp:>8}  {check:<10} {vs}")
+    return slow
+
+
+def main():
+    ap = argparse.ArgumentParser(description="탐지 공용 모듈 속도/정확도 벤치마크 (가중치 불필요)")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    ap.add_argument("--per-image", type=int, nargs="+", default=[10, 30, 100, 300],
+                    help=f"tool_merge: 이미지 1장의 원시 박스 수 (이미지 {TOOL_IMAGES}장)")
+    ap.add_argument("--ref-max", type=int, default=5000, help="기준 파이썬 구현을 돌릴 최대 박스 수")
+    ap.add_argument("--save", default=None, help="결과를 JSON 으로 저장(다음 실행의 --baseline)")
+    ap.add_argument("--baseline", default=None, help="이전 --save 결과와 비교")
+    args = ap.parse_args()
+
+    rows = run_suite(args.sizes, args.ref_max, args.per_image)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["rows"]
+    slow = print_rows(rows, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"sizes": args.sizes, "rows": rows}, f, indent=1)
+    mismatch = [r for r in rows if r["check"] is False]
+    if mismatch:
+        print("기준 구현과 결과가 다름:", ", ".join(f"{r['name']}@{r['n']}" for r in mismatch))
+    if slow or mismatch:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
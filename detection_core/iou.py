@@ -0,0 +1,60 @@
+import numpy as np
+
+# -------------------------
+# IoU 계산 (xyxy)
+#   두 도구의 규칙이 조금 달라 둘 다 둠
+#   - union 규칙 (dc.py 중복 제거): union == 0 인 쌍은 0
+#   - eps 규칙 (people_head_counter WBF): 면적 하한 1e-9, 교집합 ≤ 0 이면 0
+# -------------------------
+
+
+def iou_xyxy(a, b):
+    """박스 1쌍 IoU (eps 규칙)"""
+    ax1, ay1, ax2, ay2 = a; bx1, by1, bx2, by2 = b
+    ix1, iy1 = max(ax1, bx1), max(ay1, by1)
+    ix2, iy2 = min(ax2, bx2), min(ay2, by2)
+    iw, ih = max(0.0, ix2 - ix1), max(0.0, iy2 - iy1)
+    inter = iw * ih
+    if inter <= 0: return 0.0
+    area_a = max(1e-9, (ax2 - ax1) * (ay2 - ay1))
+    area_b = max(1e-9, (bx2 - bx1) * (by2 - by1))
+    return inter / (area_a + area_b - inter)
+
+
+def iou_matrix(a, b):
+    """(N,4) × (M,4) → (N,M) IoU 행렬. union == 0 인 칸은 0"""
+    ix1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    iy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    ix2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    iy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    iou = np.zeros(inter.shape, dtype=np.float64)
+    np.divide(inter, union, out=iou, where=union != 0)
+    return iou
+
+
+def pair_iou(b, i, j):
+    """박스 쌍 (i[k], j[k]) 들의 IoU. union == 0 인 쌍은 0"""
+    ix1 = np.maximum(b[i, 0], b[j, 0])
+    iy1 = np.maximum(b[i, 1], b[j, 1])
+    ix2 = np.minimum(b[i, 2], b[j, 2])
+    iy2 = np.minimum(b[i, 3], b[j, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area[i] + area[j] - inter
+    iou = np.zeros(inter.shape, dtype=np.float64)
+    np.divide(inter, union, out=iou, where=union != 0)
+    return iou
+
+
+def pair_iou_eps(b, i, j):
+    """iou_xyxy 와 같은 식(면적 하한 1e-9, 교집합 ≤ 0 이면 0)으로 쌍별 IoU"""
+    iw = np.maximum(0.0, np.minimum(b[i, 2], b[j, 2]) - np.maximum(b[i, 0], b[j, 0]))
+    ih = np.maximum(0.0, np.minimum(b[i, 3], b[j, 3]) - np.maximum(b[i, 1], b[j, 1]))
+    inter = iw * ih
+    area = np.maximum(1e-9, (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]))
+    iou = inter / (area[i] + area[j] - inter)
+    return np.where(inter > 0, iou, 0.0)
@@ -0,0 +1,144 @@
+import numpy as np
+
+from .iou import iou_matrix, pair_iou
+
+# -------------------------
+# IoU 중복 제거 / NMS 엔진 (dc.py 의 greedy 규칙과 같은 결과)
+#   - 입력 순서대로 보면서, 이미 남긴 박스와 IoU > thr 이면 버림
+#   - union == 0 인 쌍은 비교하지 않음
+# -------------------------
+PY_MAX_BOXES = 32           # 이 개수 미만이면 auto 모드에서 파이썬 루프(배열 변환 비용이 더 큼)
+GRID_MIN_BOXES = 150        # 이 개수 이상이면 auto 모드에서 격자 사전필터 사용
+BLOCK_MAX_ELEMS = 4_000_000 # 블록 방식에서 IoU 행렬 한 번에 계산할 최대 원소 수
+GRID_CHUNK = 4096           # 격자 방식에서 한 번에 후보쌍을 펼칠 박스 수
+
+
+def dedup_boxes_py(boxes_all, iou_thr=0.4):
+    """기존 순수 파이썬 O(n²) 루프 (비교/검증용)"""
+    final_boxes = []
+    for (x1, y1, x2, y2) in boxes_all:
+        overlap = False
+        for (fx1, fy1, fx2, fy2) in final_boxes:
+            inter_w = max(0, min(x2, fx2) - max(x1, fx1))
+            inter_h = max(0, min(y2, fy2) - max(y1, fy1))
+            inter_area = inter_w * inter_h
+            union_area = (x2 - x1) * (y2 - y1) + (fx2 - fx1) * (fy2 - fy1) - inter_area
+            if union_area == 0:
+                continue
+            iou = inter_area / union_area
+            if iou > iou_thr:
+                overlap = True
+                break
+        if not overlap:
+            final_boxes.append((x1, y1, x2, y2))
+    return final_boxes
+
+
+def _keep_block(b, iou_thr):
+    """블록 방식: 후보 블록을 남긴 박스 전체와 한 번에 비교하고, 블록 내부만 순서대로 처리"""
+    n = len(b)
+    keep = np.zeros(n, dtype=bool)
+    kept = b[:0]
+    start = 0
+    while start < n:
+        rows = max(32, min(int(BLOCK_MAX_ELEMS ** 0.5), BLOCK_MAX_ELEMS // max(1, len(kept))))
+        cand = b[start:start + rows]
+        alive = np.ones(len(cand), dtype=bool)
+        if len(kept):
+            alive &= ~(iou_matrix(cand, kept) > iou_thr).any(axis=1)
+        inner = iou_matrix(cand, cand) > iou_thr
+        for i in range(len(cand)):
+            if alive[i]:
+                alive[i + 1:] &= ~inner[i, i + 1:]
+        keep[start:start + len(cand)] = alive
+        kept = np.concatenate([kept, cand[alive]])
+        start += len(cand)
+    return keep
+
+
+def _expand_ranges(lo, hi):
+    """각 k 에 대해 [lo[k], hi[k]) 구간을 펼쳐 (k, 위치) 배열 쌍으로 반환"""
+    cnt = hi - lo
+    rows = np.repeat(np.arange(len(lo)), cnt)
+    offs = np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+    return rows, np.repeat(lo, cnt) + offs
+
+
+def _keep_grid(b, iou_thr, cell=None):
+    """격자(공간 해시) 방식: 겹칠 수 있는 이웃 칸끼리만 IoU 계산 후, 순서대로 억제 여부 결정"""
+    n = len(b)
+    if cell is None:
+        cell = int(np.ceil(max(1, (b[:, 2] - b[:, 0]).max(), (b[:, 3] - b[:, 1]).max())))  # 실수 박스도 크기 ≤ cell
+    # 박스 크기 ≤ cell 이면 서로 겹치는 두 박스의 (x1, y1) 칸 번호 차이는 최대 1
+    cx = b[:, 0] // cell
+    cy = b[:, 1] // cell
+    cx = cx - cx.min()
+    cy = cy - cy.min() + 1
+    ny = int(cy.max()) + 2
+    key = cx * ny + cy
+    order = np.argsort(key, kind="stable")
+    skey = key[order]
+
+    src, dst = [], []
+    for start in range(0, n, GRID_CHUNK):
+        idx = np.arange(start, min(n, start + GRID_CHUNK))
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nkey = key[idx] + dx * ny + dy
+                lo = np.searchsorted(skey, nkey, side="left")
+                hi = np.searchsorted(skey, nkey, side="right")
+                r, pos = _expand_ranges(lo, hi)
+                i, j = idx[r], order[pos]
+                m = i < j
+                i, j = i[m], j[m]
+                hit = pair_iou(b, i, j) > iou_thr
+                src.append(i[hit]); dst.append(j[hit])
+
+    src = np.concatenate(src) if src else np.empty(0, dtype=np.int64)
+    dst = np.concatenate(dst) if dst else np.empty(0, dtype=np.int64)
+    # (앞 박스 → 뒤 박스) 간선을 뒤 박스 순으로 처리하면 앞 박스의 생존 여부는 이미 확정됨
+    o = np.lexsort((src, dst))
+    keep = [True] * n
+    for i, j in zip(src[o].tolist(), dst[o].tolist()):
+        if keep[i]:
+            keep[j] = False
+    return np.array(keep, dtype=bool)
+
+
+def dedup_boxes(boxes_all, iou_thr=0.4, method="auto"):
+    """greedy IoU 중복 제거. method: "auto" / "block" / "grid" / "python" """
+    if method == "python":
+        return dedup_boxes_py(boxes_all, iou_thr)
+    if method == "auto" and len(boxes_all) < PY_MAX_BOXES:
+        if boxes_all and not isinstance(boxes_all[0][0], int):  # 배열 경로와 같게 정수 좌표로
+            boxes_all = [tuple(map(int, box)) for box in boxes_all]
+        return dedup_boxes_py(boxes_all, iou_thr)
+    if len(boxes_all) == 0:
+        return []
+    b = np.asarray(boxes_all, dtype=np.int64).reshape(-1, 4)
+    if method == "auto":
+        method = "grid" if len(b) >= GRID_MIN_BOXES else "block"
+    if method == "block":
+        keep = _keep_block(b, iou_thr)
+    elif method == "grid":
+        keep = _keep_grid(b, iou_thr)
+    else:
+        raise ValueError(f"알 수 없는 중복 제거 방식: {method}")
+    return [tuple(box) for box in b[keep].tolist()]
+
+
+def nms(boxes, scores, iou_thr=0.4, method="auto"):
+    """점수 내림차순으로 dedup_boxes 를 적용한 표준 NMS. 남은 박스의 원래 번호 배열 반환"""
+    b = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if len(b) == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
+    if method == "auto":
+        method = "grid" if len(b) >= GRID_MIN_BOXES else "block"
+    if method == "block":
+        keep = _keep_block(b[order], iou_thr)
+    elif method == "grid":
+        keep = _keep_grid(b[order], iou_thr)
+    else:
+        raise ValueError(f"알 수 없는 NMS 방식: {method}")
+    return order[keep]
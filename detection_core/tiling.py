@@ -0,0 +1,39 @@
+# -------------------------
+# 큰 이미지 타일 분할
+#   tile_windows: 겹침 있는 타일 창 목록 (메인 그리드 + 오른쪽/아래 가장자리)
+#   tile_to_global: 타일 좌표 박스 → 이미지 좌표 (이미지 밖은 잘라냄)
+# -------------------------
+
+
+def tile_windows(H, W, tile=1024, overlap=0.4):
+    """(x0, y0, x1, y1) 타일 창 목록: 메인 그리드 + 오른쪽/아래 가장자리"""
+    step = int(tile * (1.0 - overlap))
+    if step <= 0: raise ValueError("OVERLAP이 너무 큽니다.")
+    wins = []
+    # 메인 그리드
+    for y0 in range(0, max(1, H - tile + 1), step):
+        for x0 in range(0, max(1, W - tile + 1), step):
+            wins.append((x0, y0, min(x0 + tile, W), min(y0 + tile, H)))
+    # 오른쪽/아래 가장자리 커버
+    if (W - tile) % step != 0:
+        x0 = max(0, W - tile)
+        for y0 in range(0, max(1, H - tile + 1), step):
+            wins.append((x0, y0, W, min(y0 + tile, H)))
+    if (H - tile) % step != 0:
+        y0 = max(0, H - tile)
+        for x0 in range(0, max(1, W - tile + 1), step):
+            wins.append((x0, y0, min(x0 + tile, W), H))
+    return wins
+
+
+def tile_to_global(boxes, scores, win, H, W, out_boxes, out_scores):
+    """타일 좌표 박스를 (H, W) 이미지 좌표로 옮겨 out_* 에 추가(이미지 밖은 잘라냄)"""
+    x0, y0 = win[0], win[1]
+    for (bx1, by1, bx2, by2), sc in zip(boxes, scores):
+        gx1, gy1 = bx1 + x0, by1 + y0
+        gx2, gy2 = bx2 + x0, by2 + y0
+        gx1, gy1 = max(0, gx1), max(0, gy1)
+        gx2, gy2 = min(W - 1, gx2), min(H - 1, gy2)
+        if gx2 > gx1 and gy2 > gy1:
+            out_boxes.append([gx1, gy1, gx2, gy2]); out_scores.append(sc)
+
@@ -0,0 +1,121 @@
+import numpy as np
+
+from .iou import iou_xyxy, pair_iou_eps
+
+# ====== 빠른 WBF ======
+# wbf_merge(기존 O(n²) 루프)와 같은 클러스터/결과를 내지만,
+# 균일 격자에 박스를 넣어 같은 칸을 공유하는 이웃끼리만 IoU(NumPy)를 계산
+# =====================
+GRID_CELL_K = 1.0   # 격자 한 칸 = 박스 변 길이 중앙값 × K
+
+
+def _candidate_pairs(b, cell):
+    """같은 격자 칸에 걸치는 박스 쌍 (i < j) 목록"""
+    n = len(b)
+    gx1 = np.floor(b[:, 0] / cell).astype(np.int64)
+    gy1 = np.floor(b[:, 1] / cell).astype(np.int64)
+    gx2 = np.floor(b[:, 2] / cell).astype(np.int64)
+    gy2 = np.floor(b[:, 3] / cell).astype(np.int64)
+    nx = np.maximum(1, gx2 - gx1 + 1)  # 뒤집힌 박스는 IoU 가 0 이라 한 칸만 차지해도 됨
+    ny = np.maximum(1, gy2 - gy1 + 1)
+    cnt = nx * ny
+
+    # 박스마다 걸치는 모든 칸을 펼침
+    box = np.repeat(np.arange(n), cnt)
+    k = np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+    cx = gx1[box] + k % nx[box]
+    cy = gy1[box] + k // nx[box]
+    cx -= cx.min(); cy -= cy.min()
+    key = cx * (cy.max() + 1) + cy
+
+    order = np.argsort(key, kind="stable")
+    key, box = key[order], box[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    sizes = np.diff(np.r_[starts, len(key)])
+
+    # 칸 안의 모든 (a, b) 조합 (크기 1인 칸은 건너뜀)
+    multi = sizes > 1
+    starts, sizes = starts[multi], sizes[multi]
+    if len(starts) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    per = sizes * sizes
+    cell_id = np.repeat(np.arange(len(starts)), per)
+    r = np.arange(per.sum()) - np.repeat(np.cumsum(per) - per, per)
+    a = box[starts[cell_id] + r // sizes[cell_id]]
+    c = box[starts[cell_id] + r % sizes[cell_id]]
+    m = a < c
+    pair = np.unique(a[m] * n + c[m])  # 여러 칸을 공유하는 쌍 중복 제거
+    return pair // n, pair % n
+
+
+def wbf_merge(boxes, scores, iou_thr=0.55):
+    """간단 WBF: IoU가 임계 이상인 박스들 가중평균(가중치=score)으로 병합 (기준 구현)"""
+    if not boxes: return [], []
+    idxs = sorted(range(len(boxes)), key=lambda i: scores[i], reverse=True)
+    used = [False]*len(boxes)
+    merged_boxes, merged_scores = [], []
+    for i in idxs:
+        if used[i]: continue
+        group, group_scores = [boxes[i]], [scores[i]]
+        used[i] = True
+        for j in idxs:
+            if used[j]: continue
+            if iou_xyxy(boxes[i], boxes[j]) >= iou_thr:
+                group.append(boxes[j]); group_scores.append(scores[j]); used[j] = True
+        # 가중 평균
+        w = sum(group_scores)
+        xs1 = sum(b[0]*s for b,s in zip(group, group_scores))/w
+        ys1 = sum(b[1]*s for b,s in zip(group, group_scores))/w
+        xs2 = sum(b[2]*s for b,s in zip(group, group_scores))/w
+        ys2 = sum(b[3]*s for b,s in zip(group, group_scores))/w
+        merged_boxes.append([int(xs1), int(ys1), int(xs2), int(ys2)])
+        merged_scores.append(max(group_scores))  # 보수적으로 최대 점수 유지
+    return merged_boxes, merged_scores
+
+
+def wbf_merge_fast(boxes, scores, iou_thr, cell=None):
+    """격자 사전필터 + 벡터 IoU 로 찾은 이웃만 보고 wbf_merge 와 같은 순서로 병합"""
+    if not boxes: return [], []
+    b = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    s = np.asarray(scores, dtype=np.float64)
+    n = len(b)
+    idxs = np.argsort(-s, kind="stable")          # sorted(..., reverse=True) 와 같은 순서
+    rank = np.empty(n, np.int64); rank[idxs] = np.arange(n)
+
+    if cell is None:
+        side = np.r_[b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]]
+        cell = max(1.0, float(np.median(side)) * GRID_CELL_K)
+    if iou_thr > 0:
+        i, j = _candidate_pairs(b, cell)
+    else:  # 겹치지 않는 쌍(IoU 0)도 묶이는 설정은 격자로 거를 수 없으므로 전체 쌍
+        i, j = np.triu_indices(n, 1)
+    hit = pair_iou_eps(b, i, j) >= iou_thr
+    i, j = i[hit], j[hit]
+
+    # 이웃 목록(양방향)을 점수 순위대로 정렬해 CSR 로 보관
+    src = np.r_[i, j]; dst = np.r_[j, i]
+    o = np.lexsort((rank[dst], src))
+    src, dst = src[o], dst[o]
+    ptr = np.searchsorted(src, np.arange(n + 1)).tolist()
+    dst = dst.tolist()
+
+    used = [False] * n
+    merged_boxes, merged_scores = [], []
+    for i in idxs.tolist():
+        if used[i]: continue
+        used[i] = True
+        members = [i]
+        for j in dst[ptr[i]:ptr[i + 1]]:
+            if not used[j]:
+                members.append(j); used[j] = True
+        # 가중 평균 (원래 구현과 같은 순서로 더해 결과가 비트 단위로 같음)
+        group = [boxes[m] for m in members]
+        group_scores = [scores[m] for m in members]
+        w = sum(group_scores)
+        xs1 = sum(bb[0]*sc for bb, sc in zip(group, group_scores))/w
+        ys1 = sum(bb[1]*sc for bb, sc in zip(group, group_scores))/w
+        xs2 = sum(bb[2]*sc for bb, sc in zip(group, group_scores))/w
+        ys2 = sum(bb[3]*sc for bb, sc in zip(group, group_scores))/w
+        merged_boxes.append([int(xs1), int(ys1), int(xs2), int(ys2)])
+        merged_scores.append(max(group_scores))
+    return merged_boxes, merged_scores
@@ -0,0 +1,60 @@
+import sys
+sys.path.append(r"D:\seolgit\python_packages")
+
+import os
+import argparse
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from detection_core import dedup_boxes, dedup_boxes_py
+
+# -------------------------
+# IoU 중복 제거 벤치마크: 기존 파이썬 루프 vs 배열 기반(block / grid)
+#   python bench_dedup.py --sizes 1000 5000 10000 50000 --py-max 10000
+# -------------------------
+
+def synthetic_boxes(n, frame=(4000, 3000), dup=5, seed=0):
+    """드론 사진과 비슷한 박스 집합: 사람 1명당 흔들린 박스 dup개(두 모델 + 낮은 conf 중복)"""
+    rng = np.random.default_rng(seed)
+    W, H = frame
+    people = max(1, n // dup)
+    cx = rng.integers(0, W, people)
+    cy = rng.integers(0, H, people)
+    w = rng.integers(10, 60, people)
+    h = (w * rng.uniform(0.5, 2.5, people)).astype(int)
+    idx = rng.integers(0, people, n)
+    jit = rng.integers(-6, 7, (n, 4))
+    x1 = cx[idx] - w[idx] // 2 + jit[:, 0]
+    y1 = cy[idx] - h[idx] // 2 + jit[:, 1]
+    x2 = x1 + w[idx] + jit[:, 2]
+    y2 = y1 + h[idx] + jit[:, 3]
+    return [tuple(b) for b in np.stack([x1, y1, x2, y2], axis=1).tolist()]
+
+def timed(fn, *args, **kw):
+    t0 = time.perf_counter()
+    out = fn(*args, **kw)
+    return out, time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="IoU 중복 제거 벤치마크")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000, 20000, 50000])
+    ap.add_argument("--py-max", type=int, default=10000, help="기존 파이썬 루프를 돌릴 최대 박스 수")
+    ap.add_argument("--iou", type=float, default=0.4)
+    args = ap.parse_args()
+
+    print(f"{'boxes':>7} {'kept':>7} {'python(s)':>10} {'block(s)':>9} {'grid(s)':>9} {'speedup':>8}  same")
+    for n in args.sizes:
+        boxes = synthetic_boxes(n)
+        ref, t_py = (None, None)
+        if n <= args.py_max:
+            ref, t_py = timed(dedup_boxes_py, boxes, args.iou)
+        out_b, t_b = timed(dedup_boxes, boxes, args.iou, method="block")
+        out_g, t_g = timed(dedup_boxes, boxes, args.iou, method="grid")
+        same = out_b == out_g and (ref is None or ref == out_g)
+        py_txt = f"{t_py:10.3f}" if t_py is not None else f"{'-':>10}"
+        speed = f"{t_py / min(t_b, t_g):7.1f}x" if t_py is not None else f"{'-':>8}"
+        print(f"{n:7d} {len(out_g):7d} {py_txt} {t_b:9.3f} {t_g:9.3f} {speed}  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+# -------------------------
+# 추론 결과 캐시 (SQLite)
+#   키: 파일 내용 해시 + 모델/추론 설정 지문
+#   값: 모델별 원시 박스 (필터/중복 제거 전)
+# 박스 필터 기준만 바꾼 재실행은 추론 없이 캐시된 원시 박스에 필터만 다시 적용
+# -------------------------
+CACHE_NAME = ".dc_cache.sqlite"
+
+
+def file_digest(path, chunk=1 << 20):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def detector_fingerprint(detector):
+    """모델 파일(이름/크기/수정시각)과 추론 파라미터로 만든 지문. 하나라도 바뀌면 캐시 무효"""
+    models = []
+    for name in detector.model_names:
+        path = os.path.join(getattr(detector, "model_dir", ""), name)
+        st = os.stat(path) if os.path.exists(path) else None
+        models.append([name, st.st_size if st else None, st.st_mtime_ns if st else None])
+    info = {"models": models, "params": getattr(detector, "params", {})}
+    return hashlib.sha256(json.dumps(info, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class ResultCache:
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " digest TEXT NOT NULL, fingerprint TEXT NOT NULL,"
+            " name TEXT, boxes TEXT NOT NULL, created REAL,"
+            " PRIMARY KEY (digest, fingerprint))"
+        )
+        self.db.commit()
+
+    def get(self, digest):
+        row = self.db.execute(
+            "SELECT boxes FROM results WHERE digest = ? AND fingerprint = ?",
+            (digest, self.fingerprint),
+        ).fetchone()
+        if row is None:
+            return None
+        return [[tuple(b) for b in boxes] for boxes in json.loads(row[0])]
+
+    def put_many(self, items):
+        """items: [(digest, 파일 이름, 모델별 원시 박스), ...]"""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+            [(d, self.fingerprint, name, json.dumps(boxes), time.time()) for d, name, boxes in items],
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class CachedDetector:
+    """탐지기를 감싸서 캐시에 없는(새로 추가/변경된) 이미지만 실제로 추론"""
+
+    def __init__(self, detector, cache):
+        self.detector = detector
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.digests = {}       # 경로 → 내용 해시 (이번 실행 안에서 같은 파일을 두 번 읽지 않게)
+
+    def __getattr__(self, name):
+        # policy, model_names, load_times, infer_times 등은 원래 탐지기 것을 그대로 사용
+        return getattr(self.detector, name)
+
+    def digest(self, path):
+        if path not in self.digests:
+            self.digests[path] = file_digest(path)
+        return self.digests[path]
+
+    def first_pending(self, image_paths):
+        """캐시에 없어 실제로 추론해야 하는 첫 이미지 경로 (전부 캐시에 있으면 None)"""
+        return next((p for p in image_paths if self.cache.get(self.digest(p)) is None), None)
+
+    def predict_batch(self, imgs, keys):
+        digests = [self.digest(k) for k in keys]
+        out = [self.cache.get(d) for d in digests]
+        miss = [i for i, boxes in enumerate(out) if boxes is None]
+        self.hits += len(out) - len(miss)
+        self.misses += len(miss)
+        if miss:
+            fresh = self.detector.predict_batch([imgs[i] for i in miss], [keys[i] for i in miss])
+            for i, boxes in zip(miss, fresh):
+                out[i] = boxes
+            self.cache.put_many([(digests[i], os.path.basename(keys[i]), out[i]) for i in miss])
+        return out
+
+    def predict(self, img, key=None, names=None):
+        return self.predict_batch([img], [key])[0]
+
+    def detect_paths(self, image_paths):
+        cached, todo, digests = {}, [], {}
+        for path in image_paths:
+            digests[path] = self.digest(path)
+            boxes = self.cache.get(digests[path])
+            if boxes is None:
+                todo.append(path)
+            else:
+                cached[path] = boxes
+        self.hits += len(cached)
+        self.misses += len(todo)
+        for path in image_paths:
+            if path in cached:
+                yield path, None, cached[path]
+        for path, img, boxes in self.detector.detect_paths(todo):
+            if boxes is not None:
+                self.cache.put_many([(digests[path], os.path.basename(path), boxes)])
+            yield path, img, boxes
+
+    def close(self):
+        self.detector.close()
+        self.cache.close()
@@ -2,108 +2,283 @@ import sys
 sys.path.append(r"D:\seolgit\python_packages")
 
 import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # detection_core
+import time
+import argparse
+import functools
 import cv2
 import numpy as np
-from ultralytics import YOLO
 from glob import glob
 
+from detection_core import dedup_boxes, filter_boxes  # 크기/비율 필터 / IoU 중복 제거 (짧은 리스트는 파이썬 루프)
+from pipeline import run_pipeline, StubDetector, DEFAULT_WORKERS, DEFAULT_PREFETCH
+from cache import ResultCache, CachedDetector, detector_fingerprint, CACHE_NAME
+
 MODEL_DIR = r"D:\seolgit\python_packages"
 IMAGE_DIR = r"C:\Users\seolpc\Desktop\drone"
 
-def detect_people_folder():
-    image_paths = glob(os.path.join(IMAGE_DIR, "*.JPG"))
-    if not image_paths:
-        print("분석할 JPG 파일이 없습니다.")
-        return
+# 사용할 모델(순서대로 추론 후 결과 병합)
+MODEL_NAMES = ["yolov8x.pt", "yolov8x-seg.pt"]
 
-    summary = {}
+# 메모리 정책
+#   "resident"   : 두 모델을 모두 올려둔 채 이미지마다 A → B 추론 (가장 빠름)
+#   "sequential" : 모델을 하나씩 올려 전체 이미지를 A로 처리한 뒤 B로 처리 (메모리 절약)
+MEMORY_POLICY = "resident"
 
-    for IMAGE_PATH in image_paths:
-        print(f"\n{os.path.basename(IMAGE_PATH)} 분석 중...")
+# YOLO 설정
+PREDICT_PARAMS = dict(
+    imgsz=2048,       # 메모리 절약
+    conf=0.003,
+    iou=0.9,
+    classes=[0],
+    agnostic_nms=False,
+    save=False,
+    verbose=False
+)
 
-        name, ext = os.path.splitext(IMAGE_PATH)
-        OUTPUT_PATH = name + "_2" + ext
+# 박스 필터 기준 (바꿔도 캐시된 원시 박스에 다시 적용되므로 재추론 없음)
+FILTER_PARAMS = dict(
+    min_size=10,      # 가로/세로 최소 px
+    max_size=400,     # 가로/세로 최대 px
+    min_aspect=0.3,   # 세로/가로 비 최소
+    max_aspect=3.0,   # 세로/가로 비 최대
+    iou=0.4,          # 중복 제거 IoU
+)
 
-        img = cv2.imread(IMAGE_PATH)
+OUTPUT_SUFFIX = "_2"  # 결과 이미지 접미사 (분석 대상에서 제외)
+
+# 배치 추론 (--batch auto 일 때 메모리 예산 안에서 가장 큰 배치 선택)
+MAX_BATCH = 16
+MEMORY_BUDGET_MB = 8192      # CPU 에서 추론에 쓸 메모리 예산 (GPU 는 남은 메모리와 비교해 작은 쪽)
+CPU_MB_PER_MPIX = 800        # CPU 추정치: 입력 1M 픽셀당 yolov8x 활성값 메모리(MB)
+
+
+# -------------------------
+# 탐지 세션: 모델을 폴더 전체에서 한 번만 로드
+# -------------------------
+class DetectorSession:
+    """여러 YOLO 모델을 한 번 로드해 재사용하고, 로드/추론 시간을 따로 기록"""
+
+    def __init__(self, model_dir=MODEL_DIR, model_names=MODEL_NAMES,
+                 params=PREDICT_PARAMS, policy=MEMORY_POLICY, threads=None):
+        if policy not in ("resident", "sequential"):
+            raise ValueError(f"알 수 없는 메모리 정책: {policy}")
+        self.model_dir = model_dir
+        self.model_names = list(model_names)
+        self.params = dict(params)
+        self.policy = policy
+        self.threads = threads  # torch intra-op 스레드 수 (None 이면 torch 기본값)
+        self.max_batch = MAX_BATCH
+        self.models = {}
+        self.load_times = {}    # 모델 이름 → 로드 시간(초, 누적)
+        self.infer_times = {}   # 이미지 키 → 추론 시간(초, 모든 모델 합)
+
+    def load(self, name):
+        if name not in self.models:
+            from ultralytics import YOLO
+            if self.threads and not self.models:
+                import torch
+                torch.set_num_threads(self.threads)
+            t0 = time.perf_counter()
+            self.models[name] = YOLO(os.path.join(self.model_dir, name))
+            self.load_times[name] = self.load_times.get(name, 0.0) + time.perf_counter() - t0
+        return self.models[name]
+
+    def unload(self, name):
+        self.models.pop(name, None)  # 메모리 확보
+
+    def close(self):
+        self.models.clear()
+
+    def auto_batch(self, sample_path, budget_mb=MEMORY_BUDGET_MB):
+        """샘플 1장으로 1장당 메모리를 재서 예산 안에 들어가는 가장 큰 배치 크기를 정함"""
+        import torch
+        img = cv2.imread(sample_path)
         if img is None:
-            print(f"이미지를 불러올 수 없습니다: {IMAGE_PATH}")
-            continue
-
-        # YOLO 설정
-        params = dict(
-            imgsz=2048,       # 메모리 절약
-            conf=0.003,
-            iou=0.9,
-            classes=[0],
-            agnostic_nms=False,
-            save=False,
-            verbose=False
-        )
-
-        # 1️⃣ yolov8x.pt 모델
-        model_a = YOLO(os.path.join(MODEL_DIR, "yolov8x.pt"))
-        results_a = model_a.predict(source=img, **params)
-        del model_a  # 메모리 확보
-
-        # 2️⃣ yolov8x-seg.pt 모델
-        model_b = YOLO(os.path.join(MODEL_DIR, "yolov8x-seg.pt"))
-        results_b = model_b.predict(source=img, **params)
-        del model_b  # 메모리 확보
-
-        # 결과 병합
-        boxes_all = []
-        for results in [results_a, results_b]:
-            for box in results[0].boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                w, h = x2 - x1, y2 - y1
-
-                if w < 10 or h < 10:
+            return 1
+        budget = budget_mb * 2**20
+        if torch.cuda.is_available():
+            for name in self.model_names:
+                self.load(name)
+            free, _ = torch.cuda.mem_get_info()
+            budget = min(budget, int(free * 0.9))
+            torch.cuda.reset_peak_memory_stats()
+            base = torch.cuda.memory_allocated()
+            self.predict(img, key="__probe__")
+            per_image = max(1, torch.cuda.max_memory_allocated() - base)
+        else:
+            self.predict(img, key="__probe__")  # 워밍업
+            per_image = self.params["imgsz"] ** 2 / 1e6 * CPU_MB_PER_MPIX * 2**20
+        self.infer_times.pop("__probe__", None)
+        self.max_batch = int(max(1, min(MAX_BATCH, budget // per_image)))
+        print(f"자동 배치: {self.max_batch}장 (1장당 약 {per_image / 2**20:.0f}MB, 예산 {budget / 2**20:.0f}MB)")
+        return self.max_batch
+
+    def predict_batch(self, imgs, keys=None, names=None):
+        """이미지 여러 장을 max_batch 장씩 나눠 추론. 메모리 부족이면 배치를 절반으로 줄여 다시 시도"""
+        keys = keys or [None] * len(imgs)
+        out, i = [], 0
+        while i < len(imgs):
+            n = min(self.max_batch, len(imgs) - i)
+            try:
+                out.extend(self._predict_chunk(imgs[i:i + n], keys[i:i + n], names))
+                i += n
+            except (RuntimeError, MemoryError) as e:
+                if n == 1 or not (isinstance(e, MemoryError) or "out of memory" in str(e).lower()):
+                    raise
+                self.max_batch = max(1, n // 2)
+                print(f"메모리 부족: 배치 {n}장 → {self.max_batch}장으로 줄여 다시 시도")
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        return out
+
+    def _predict_chunk(self, imgs, keys, names=None):
+        """
+        이미지 여러 장을 모델별로 한 번에 추론. 이미지마다 모델별 원시 박스 리스트 [(x1, y1, x2, y2), ...] 반환
+        추론 시간은 모든 모델이 성공한 뒤에 기록 (메모리 부족으로 다시 시도하는 배치의 시간은 넣지 않음)
+        """
+        out = [[] for _ in imgs]
+        dt = 0.0
+        for name in (names or self.model_names):
+            model = self.load(name)
+            t0 = time.perf_counter()
+            results = model.predict(source=list(imgs), **self.params)
+            dt += (time.perf_counter() - t0) / len(imgs)
+            for boxes_per_model, res in zip(out, results):
+                boxes_per_model.append([tuple(map(int, box.xyxy[0])) for box in res.boxes])
+        for key in keys:
+            self.infer_times[key] = self.infer_times.get(key, 0.0) + dt
+        return out
+
+    def predict(self, img, key=None, names=None):
+        """모델별 원시 박스 리스트를 모델 순서대로 반환"""
+        return self.predict_batch([img], [key], names)[0]
+
+    def detect_paths(self, image_paths):
+        """(경로, 이미지 또는 None, 모델별 원시 박스) 를 정책에 맞게 차례로 생성"""
+        if self.policy == "resident":
+            for path in image_paths:
+                img = cv2.imread(path)
+                if img is None:
+                    yield path, None, None
                     continue
-                if w > 400 or h > 400:
+                yield path, img, self.predict(img, key=path)
+            return
+
+        # sequential: 모델 A로 전체 이미지 처리 → 해제 → 모델 B로 전체 이미지 처리
+        raw = {}
+        for name in self.model_names:
+            for path in image_paths:
+                if path in raw and raw[path] is None:
                     continue
-                aspect = h / w if w > 0 else 0
-                if aspect > 3 or aspect < 0.3:
+                img = cv2.imread(path)
+                if img is None:
+                    raw[path] = None
                     continue
+                raw.setdefault(path, []).extend(self.predict(img, key=path, names=[name]))
+            self.unload(name)
+        for path in image_paths:
+            yield path, None, raw.get(path)
 
-                boxes_all.append((x1, y1, x2, y2))
-
-        # IoU 중복 제거
-        final_boxes = []
-        for (x1, y1, x2, y2) in boxes_all:
-            overlap = False
-            for (fx1, fy1, fx2, fy2) in final_boxes:
-                inter_w = max(0, min(x2, fx2) - max(x1, fx1))
-                inter_h = max(0, min(y2, fy2) - max(y1, fy1))
-                inter_area = inter_w * inter_h
-                union_area = (x2 - x1) * (y2 - y1) + (fx2 - fx1) * (fy2 - fy1) - inter_area
-                if union_area == 0:
-                    continue
-                iou = inter_area / union_area
-                if iou > 0.4:
-                    overlap = True
-                    break
-            if not overlap:
-                final_boxes.append((x1, y1, x2, y2))
-
-        # 사각형 표시
-        for (x1, y1, x2, y2) in final_boxes:
-            cv2.rectangle(img, (x1, y1), (x2, y2), (255, 0, 0), 2)
-
-        # 인원수 표시
-        count = len(final_boxes)
-        text = f"People: {count}"
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        scale = 2.0
-        thickness = 6
-        cv2.putText(img, text, (30, img.shape[0] - 50),
-                    font, scale, (255, 255, 255), thickness + 2, cv2.LINE_AA)
-        cv2.putText(img, text, (30, img.shape[0] - 50),
-                    font, scale, (0, 0, 0), thickness, cv2.LINE_AA)
-
-        cv2.imwrite(OUTPUT_PATH, img)
-        print(f"{os.path.basename(OUTPUT_PATH)} 저장 완료 (탐지된 사람 수: {count}명)")
-
-        summary[os.path.basename(IMAGE_PATH)] = count
+
+# -------------------------
+# 박스 필터링
+# -------------------------
+def merge_boxes(boxes_per_model, filter_params=FILTER_PARAMS):
+    """모델별 원시 박스 → 크기/비율 필터 → IoU 중복 제거"""
+    params = dict(filter_params)
+    iou_thr = params.pop("iou")
+    return dedup_boxes(filter_boxes(boxes_per_model, **params), iou_thr)
+
+def draw_result(img, final_boxes):
+    # 사각형 표시
+    for (x1, y1, x2, y2) in final_boxes:
+        cv2.rectangle(img, (x1, y1), (x2, y2), (255, 0, 0), 2)
+
+    # 인원수 표시
+    count = len(final_boxes)
+    text = f"People: {count}"
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    scale = 2.0
+    thickness = 6
+    cv2.putText(img, text, (30, img.shape[0] - 50),
+                font, scale, (255, 255, 255), thickness + 2, cv2.LINE_AA)
+    cv2.putText(img, text, (30, img.shape[0] - 50),
+                font, scale, (0, 0, 0), thickness, cv2.LINE_AA)
+    return img
+
+def list_images(image_dir):
+    # 이전 실행에서 저장한 *_2.JPG 결과 이미지는 제외
+    return [p for p in glob(os.path.join(image_dir, "*.JPG"))
+            if not os.path.splitext(p)[0].endswith(OUTPUT_SUFFIX)]
+
+def print_time_summary(session, wall, n_images):
+    print("\n==================== 시간 요약 ====================")
+    if isinstance(session, CachedDetector):
+        print(f"캐시: 재사용 {session.hits}장, 새로 추론 {session.misses}장")
+    for name, sec in session.load_times.items():
+        print(f"모델 로드 {name}: {sec:.2f}초")
+    if session.infer_times:
+        total = sum(session.infer_times.values())
+        print(f"추론: 이미지 {len(session.infer_times)}장, 총 {total:.2f}초, "
+              f"장당 평균 {total / len(session.infer_times):.2f}초, "
+              f"{len(session.infer_times) / total if total else 0:.2f}장/초")
+    print(f"전체 소요: {wall:.2f}초 ({n_images / wall if wall else 0:.2f}장/초)")
+    print("===================================================")
+
+def save_result(IMAGE_PATH, img, boxes_per_model, filter_params=FILTER_PARAMS):
+    """필터 → 중복 제거 → 표시 → 저장 후 탐지 인원 수 반환 (이미지를 못 읽으면 None)"""
+    name, ext = os.path.splitext(IMAGE_PATH)
+    OUTPUT_PATH = name + OUTPUT_SUFFIX + ext
+
+    if boxes_per_model is None:
+        print(f"이미지를 불러올 수 없습니다: {IMAGE_PATH}")
+        return None
+    if img is None:  # sequential 정책: 표시용으로 다시 읽음
+        img = cv2.imread(IMAGE_PATH)
+
+    # 결과 병합
+    final_boxes = merge_boxes(boxes_per_model, filter_params)
+    draw_result(img, final_boxes)
+    count = len(final_boxes)
+
+    cv2.imwrite(OUTPUT_PATH, img)
+    print(f"{os.path.basename(OUTPUT_PATH)} 저장 완료 (탐지된 사람 수: {count}명)")
+    return count
+
+def detect_people_folder(image_dir=IMAGE_DIR, policy=MEMORY_POLICY, workers=DEFAULT_WORKERS,
+                         prefetch=DEFAULT_PREFETCH, batch=1, detector=None,
+                         filter_params=FILTER_PARAMS, cache_path=None, use_cache=True,
+                         threads=None, memory_mb=MEMORY_BUDGET_MB):
+    image_paths = list_images(image_dir)
+    if not image_paths:
+        print("분석할 JPG 파일이 없습니다.")
+        return
+
+    session = detector or DetectorSession(policy=policy, threads=threads)
+    if use_cache:
+        cache_path = cache_path or os.path.join(image_dir, CACHE_NAME)
+        session = CachedDetector(session, ResultCache(cache_path, detector_fingerprint(session)))
+    if batch == "auto":
+        # 배치 크기 측정은 모델 로드 + 시험 추론이 필요하므로 추론할 이미지가 남아 있을 때만
+        sample = session.first_pending(image_paths) if use_cache else image_paths[0]
+        batch = session.auto_batch(sample, memory_mb) if sample and hasattr(session, "auto_batch") else 1
+    handle = functools.partial(save_result, filter_params=filter_params)
+    t_start = time.perf_counter()
+    print(f"{len(image_paths)}장 분석 시작 (workers={workers}, prefetch={prefetch}, batch={batch})")
+
+    if getattr(session, "policy", "resident") == "resident":
+        counts = run_pipeline(image_paths, session, handle,
+                              workers=workers, prefetch=prefetch, batch=batch)
+    else:
+        # sequential 정책은 모델별로 폴더를 두 번 돌아야 하므로 순차 처리
+        counts = {path: handle(path, img, boxes)
+                  for path, img, boxes in session.detect_paths(image_paths)}
+    session.close()
+    wall = time.perf_counter() - t_start
+
+    summary = {os.path.basename(p): counts[p] for p in image_paths if counts.get(p) is not None}
 
     # 요약 출력
     print("\n==================== 결과 요약 ====================")
@@ -112,6 +287,31 @@ def detect_people_folder():
         print(f"{fname}: {cnt}명")
     print(f"총합: {total_people}명")
     print("===================================================")
+    print_time_summary(session, wall, len(image_paths))
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="드론 사진 폴더 인원 계수")
+    ap.add_argument("image_dir", nargs="?", default=IMAGE_DIR, help="JPG 폴더")
+    ap.add_argument("--policy", choices=["resident", "sequential"], default=MEMORY_POLICY,
+                    help="모델 메모리 정책")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="디코딩/저장 스레드 수")
+    ap.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, help="미리 읽어 둘 최대 이미지 수")
+    ap.add_argument("--batch", type=lambda v: v if v == "auto" else int(v), default=1,
+                    help="추론 1회당 이미지 수 (auto: 메모리 예산으로 자동 결정)")
+    ap.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET_MB, help="--batch auto 의 메모리 예산(MB)")
+    ap.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    ap.add_argument("--stub", action="store_true", help="가중치 없이 가짜 탐지기로 실행(파이프라인 시험용)")
+    ap.add_argument("--cache", default=None, help=f"결과 캐시 파일 (기본: 폴더/{CACHE_NAME})")
+    ap.add_argument("--no-cache", action="store_true", help="캐시를 쓰지 않고 전부 다시 추론")
+    for key, value in FILTER_PARAMS.items():
+        ap.add_argument(f"--{key.replace('_', '-')}", type=float, default=value, help=f"박스 필터 (기본 {value})")
+    return ap.parse_args(argv)
 
 if __name__ == "__main__":
-    detect_people_folder()
+    args = parse_args()
+    detect_people_folder(args.image_dir, policy=args.policy, workers=args.workers,
+                         prefetch=args.prefetch, batch=args.batch,
+                         detector=StubDetector() if args.stub else None,
+                         filter_params={key: getattr(args, key) for key in FILTER_PARAMS},
+                         cache_path=args.cache, use_cache=not args.no_cache,
+                         threads=args.threads, memory_mb=args.memory_mb)
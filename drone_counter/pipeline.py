@@ -0,0 +1,122 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# -------------------------
+# 폴더 처리 파이프라인
+#   디코딩(스레드 풀, prefetch 장 미리 읽기)
+#   → 추론(현재 스레드, batch 장씩 묶음)
+#   → 필터/표시/저장(스레드 풀)
+# 각 단계 사이 대기열은 prefetch 장으로 제한되어 메모리 사용량이 폴더 크기와 무관
+# -------------------------
+DEFAULT_WORKERS = 4
+DEFAULT_PREFETCH = 8
+
+
+class StubDetector:
+    """가중치 파일 없이 파이프라인을 시험하기 위한 가짜 탐지기 (DetectorSession 과 같은 인터페이스)"""
+
+    def __init__(self, n_models=2, boxes_per_image=200, delay=0.05, seed=0):
+        self.model_names = [f"stub{i}" for i in range(n_models)]
+        self.boxes_per_image = boxes_per_image
+        self.delay = delay          # 이미지 1장당 가짜 추론 시간(초)
+        self.seed = seed
+        self.params = dict(boxes_per_image=boxes_per_image, seed=seed)
+        self.load_times = {name: 0.0 for name in self.model_names}
+        self.infer_times = {}
+
+    def _boxes(self, img, m):
+        h, w = img.shape[:2]
+        rng = np.random.default_rng([self.seed, m, int(img[::64, ::64].sum())])
+        n = self.boxes_per_image
+        x1 = rng.integers(0, max(1, w - 80), n)
+        y1 = rng.integers(0, max(1, h - 80), n)
+        bw = rng.integers(5, 80, n)
+        bh = rng.integers(5, 80, n)
+        return list(zip(x1.tolist(), y1.tolist(), (x1 + bw).tolist(), (y1 + bh).tolist()))
+
+    def predict_batch(self, imgs, keys=None):
+        keys = keys or [None] * len(imgs)
+        t0 = time.perf_counter()
+        time.sleep(self.delay * len(imgs))
+        out = [[self._boxes(img, m) for m in range(len(self.model_names))] for img in imgs]
+        dt = (time.perf_counter() - t0) / max(1, len(imgs))
+        for key in keys:
+            self.infer_times[key] = self.infer_times.get(key, 0.0) + dt
+        return out
+
+    def predict(self, img, key=None, names=None):
+        return self.predict_batch([img], [key])[0]
+
+    def close(self):
+        pass
+
+
+def _iter_decoded(pool, image_paths, prefetch):
+    """디코딩 작업을 최대 prefetch 개까지 미리 걸어 두고 입력 순서대로 (경로, 이미지) 반환"""
+    pending = deque()
+    it = iter(image_paths)
+    for path in it:
+        pending.append((path, pool.submit(cv2.imread, path)))
+        if len(pending) >= prefetch:
+            break
+    while pending:
+        path, fut = pending.popleft()
+        nxt = next(it, None)
+        if nxt is not None:
+            pending.append((nxt, pool.submit(cv2.imread, nxt)))
+        yield path, fut.result()
+
+
+def run_pipeline(image_paths, detector, handle_result,
+                 workers=DEFAULT_WORKERS, prefetch=DEFAULT_PREFETCH, batch=1):
+    """
+    image_paths 를 3단계 파이프라인으로 처리
+    handle_result(path, img, boxes_per_model) 는 저장 스레드에서 호출되며,
+    반환값을 {경로: 반환값} 으로 모아 돌려줌 (이미지를 읽지 못하면 boxes_per_model=None)
+    """
+    workers = max(1, workers)
+    prefetch = max(1, prefetch, batch)
+    results = {}
+    in_flight = threading.BoundedSemaphore(prefetch)  # 저장 대기 중인 이미지 수 제한
+    write_futs = []
+
+    def write(path, img, boxes_per_model):
+        try:
+            return path, handle_result(path, img, boxes_per_model)
+        finally:
+            in_flight.release()
+
+    def submit_write(path, img, boxes_per_model):
+        in_flight.acquire()
+        write_futs.append(writer.submit(write, path, img, boxes_per_model))
+
+    def flush(items):
+        if not items:
+            return
+        paths = [p for p, _ in items]
+        imgs = [img for _, img in items]
+        for path, img, boxes in zip(paths, imgs, detector.predict_batch(imgs, paths)):
+            submit_write(path, img, boxes)
+        items.clear()
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="decode") as reader, \
+         ThreadPoolExecutor(workers, thread_name_prefix="write") as writer:
+        items = []
+        for path, img in _iter_decoded(reader, image_paths, prefetch):
+            if img is None:
+                submit_write(path, None, None)
+                continue
+            items.append((path, img))
+            if len(items) >= batch:
+                flush(items)
+        flush(items)
+
+        for fut in write_futs:
+            path, value = fut.result()
+            results[path] = value
+    return results
@@ -0,0 +1,172 @@
+import sys
+sys.path.append(r"D:\seolgit\python_packages")
+
+import os
+import csv
+import time
+import argparse
+from glob import glob
+
+import cv2
+import numpy as np
+
+from dc import DetectorSession, FILTER_PARAMS, merge_boxes, draw_result
+from pipeline import StubDetector
+
+# -------------------------
+# 동영상 / 연속 사진 모드
+#   k 프레임마다 한 번만 탐지하고, 사이 프레임은 광류 추적으로 박스를 옮김
+#   프레임별 인원 수를 CSV 로 한 줄씩 기록 (영상 길이와 무관하게 메모리 일정)
+# -------------------------
+DETECT_EVERY = 10          # k: 탐지 간격(프레임)
+TRACK_SCALE = 0.5          # 광류 계산용 축소 비율
+SEQUENCE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def iter_frames(source):
+    """(프레임 번호, 이미지) 를 하나씩 생성. source: 동영상 파일 / 사진 폴더 / glob 패턴"""
+    if os.path.isfile(source):
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            raise IOError(f"동영상을 열 수 없습니다: {source}")
+        try:
+            idx = 0
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                yield idx, frame
+                idx += 1
+        finally:
+            cap.release()
+        return
+
+    if os.path.isdir(source):
+        paths = sorted(p for p in glob(os.path.join(source, "*"))
+                       if p.lower().endswith(SEQUENCE_EXTS))
+    else:
+        paths = sorted(glob(source))
+    for idx, path in enumerate(paths):
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f"이미지를 불러올 수 없습니다: {path}")
+            continue
+        yield idx, frame
+
+
+def source_fps(source, default=1.0):
+    if os.path.isfile(source):
+        cap = cv2.VideoCapture(source)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+        if fps and fps > 0:
+            return fps
+    return default
+
+
+class BoxTracker:
+    """탐지 프레임 사이에서 박스 중심을 Lucas-Kanade 광류로 따라가 박스를 평행이동"""
+
+    def __init__(self, scale=TRACK_SCALE):
+        self.scale = scale
+        self.prev_gray = None
+        self.boxes = np.empty((0, 4), dtype=np.float32)
+
+    def _gray(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def reset(self, frame, boxes):
+        self.prev_gray = self._gray(frame)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+    def update(self, frame):
+        gray = self._gray(frame)
+        if len(self.boxes) and self.prev_gray is not None:
+            centers = np.stack([(self.boxes[:, 0] + self.boxes[:, 2]) / 2,
+                                (self.boxes[:, 1] + self.boxes[:, 3]) / 2], axis=1)
+            pts = (centers * self.scale).reshape(-1, 1, 2)
+            nxt, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, pts, None,
+                                                      winSize=(15, 15), maxLevel=2)
+            ok = status.reshape(-1) == 1
+            shift = (nxt - pts).reshape(-1, 2) / self.scale
+            boxes = self.boxes[ok] + np.tile(shift[ok], 2)
+            h, w = frame.shape[:2]
+            cx = (boxes[:, 0] + boxes[:, 2]) / 2
+            cy = (boxes[:, 1] + boxes[:, 3]) / 2
+            inside = (cx >= 0) & (cx < w) & (cy >= 0) & (cy < h)  # 화면 밖으로 나간 박스 제거
+            self.boxes = boxes[inside]
+        self.prev_gray = gray
+        return [tuple(map(int, b)) for b in self.boxes]
+
+
+def count_stream(source, detector, csv_path, every=DETECT_EVERY, filter_params=FILTER_PARAMS,
+                 fps=None, out_video=None):
+    """프레임별 인원 수를 csv_path 에 기록하고 (프레임 수, 탐지 횟수) 반환"""
+    fps = fps or source_fps(source)
+    tracker = BoxTracker()
+    writer = None
+    n_frames = n_detect = 0
+    t0 = time.perf_counter()
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        out = csv.writer(f)
+        out.writerow(["frame", "time_s", "count", "mode"])
+        for idx, frame in iter_frames(source):
+            if n_frames % every == 0:
+                boxes = merge_boxes(detector.predict(frame, key=idx), filter_params)
+                tracker.reset(frame, boxes)
+                mode = "detect"
+                n_detect += 1
+            else:
+                boxes = tracker.update(frame)
+                mode = "track"
+            out.writerow([idx, f"{idx / fps:.3f}", len(boxes), mode])
+            n_frames += 1
+
+            if out_video:
+                if writer is None:
+                    h, w = frame.shape[:2]
+                    writer = cv2.VideoWriter(out_video, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+                writer.write(draw_result(frame, boxes))
+
+            if n_frames % 100 == 0:
+                print(f"{n_frames}프레임 처리 ({n_frames / (time.perf_counter() - t0):.1f}프레임/초)")
+
+    if writer is not None:
+        writer.release()
+    return n_frames, n_detect
+
+
+def main():
+    ap = argparse.ArgumentParser(description="드론 동영상/연속 사진 프레임별 인원 계수")
+    ap.add_argument("source", help="동영상 파일, 사진 폴더 또는 glob 패턴")
+    ap.add_argument("--every", type=int, default=DETECT_EVERY, help="탐지 간격(프레임), 사이는 추적")
+    ap.add_argument("--csv", default=None, help="결과 CSV (기본: source_counts.csv)")
+    ap.add_argument("--fps", type=float, default=None, help="연속 사진의 초당 프레임 수 (기본 1)")
+    ap.add_argument("--out-video", default=None, help="박스를 그린 동영상 저장 경로(선택)")
+    ap.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    ap.add_argument("--stub", action="store_true", help="가중치 없이 가짜 탐지기로 실행")
+    args = ap.parse_args()
+
+    csv_path = args.csv
+    if csv_path is None:
+        if os.path.isfile(args.source):
+            csv_path = os.path.splitext(args.source)[0] + "_counts.csv"
+        elif os.path.isdir(args.source):
+            csv_path = os.path.join(args.source, "counts.csv")
+        else:
+            csv_path = "counts.csv"
+    detector = StubDetector(delay=0) if args.stub else DetectorSession(threads=args.threads)
+    t0 = time.perf_counter()
+    n_frames, n_detect = count_stream(args.source, detector, csv_path, every=max(1, args.every),
+                                      fps=args.fps, out_video=args.out_video)
+    detector.close()
+    wall = time.perf_counter() - t0
+    print(f"\n{n_frames}프레임 (탐지 {n_detect}회) {wall:.2f}초, {n_frames / wall if wall else 0:.1f}프레임/초")
+    print(f"저장: {csv_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import sys, os, csv, json, time, argparse
+import cv2
+from glob import glob
+
+import people_head_counter as phc
+
+# ====== 폴더/glob 일괄 계수 ======
+# 모델을 한 번만 로드해 여러 이미지를 처리하고, 결과를 매니페스트 하나(JSON 또는 CSV)로 저장
+#   python batch_count.py <폴더|glob|파일> ... --manifest results.json [--save-images]
+#   (--manifest results.csv 면 설정은 results_config.json 에 따로 저장)
+# ================================
+
+IMG_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".npy")
+
+def collect_images(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found = glob(os.path.join(item, "*"))
+        elif os.path.isfile(item):
+            found = [item]
+        else:
+            found = glob(item)
+        for p in sorted(found):
+            # 이전 실행의 *_out 결과 이미지는 제외
+            if p.lower().endswith(IMG_EXTS) and not os.path.splitext(p)[0].endswith("_out"):
+                paths.append(p)
+    return list(dict.fromkeys(paths))  # 순서 유지 중복 제거
+
+def write_manifest(path, config, records):
+    """
+    .json: config + 이미지별 결과를 한 파일에
+    .csv : 첫 줄이 헤더인 결과표(csv.DictReader/pandas 로 바로 읽힘), config 는 <이름>_config.json 에 따로
+    저장한 경로 목록 반환
+    """
+    if path.lower().endswith(".csv"):
+        config_path = os.path.splitext(path)[0] + "_config.json"
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=1)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["image", "count", "load_s", "infer_s", "save_s", "output", "boxes", "scores"])
+            for r in records:
+                t = r["seconds"]
+                w.writerow([r["image"], r["count"], t["load"], t["infer"], t["save"], r["output"] or "",
+                            json.dumps(r["boxes"]), json.dumps(r["scores"])])
+        return [path, config_path]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"config": config, "images": records}, f, ensure_ascii=False, indent=1)
+    return [path]
+
+def main():
+    ap = argparse.ArgumentParser(description="여러 이미지 인원 계수 → JSON/CSV 매니페스트")
+    ap.add_argument("inputs", nargs="+", help="이미지 폴더, glob 패턴 또는 파일")
+    ap.add_argument("--conf", type=float, default=phc.DEFAULT_CONF)
+    ap.add_argument("--manifest", default="head_count_manifest.json", help="결과 파일(.json 또는 .csv)")
+    ap.add_argument("--save-images", action="store_true", help="머리 원을 그린 *_out 이미지도 저장")
+    ap.add_argument("--workers", type=int, default=phc.PROCESS_WORKERS, help=">0 이면 멀티프로세스 추론")
+    ap.add_argument("--adaptive", action="store_true", default=phc.ADAPTIVE,
+                    help="1차 축소 추론으로 이미지마다 타일 크기/겹침/스케일 선택")
+    ap.add_argument("--profile", action="store_true", help="단계별 시간 리포트(<매니페스트>_timing.json) 저장 "
+                    "(--workers 면 부모 쪽 단계만: 워커 안의 추론은 workers 한 단계로)")
+    ap.add_argument("--cprofile", action="store_true", help="cProfile 덤프(<매니페스트>.prof) 저장")
+    args = ap.parse_args()
+
+    paths = collect_images(args.inputs)
+    if not paths:
+        print("처리할 이미지가 없습니다."); sys.exit(1)
+
+    prof = phc.StageProfiler() if args.profile else None
+    if args.cprofile:
+        import cProfile
+        cprof = cProfile.Profile(); cprof.enable()
+
+    from ultralytics import YOLO
+    t0 = time.perf_counter()
+    runner = model = None
+    if args.workers > 0:
+        from mp_infer import ProcessTileRunner
+        runner = ProcessTileRunner(args.workers, phc.WORKER_THREADS)
+        runner.warmup()
+    else:
+        model = YOLO(phc.MODEL_PATH)
+    # 사전 검사와 적응 격자 1차 추론은 실행 방식과 상관없이 같은 소형 모델로
+    screen_model = phc.load_screen_model(adaptive=args.adaptive)
+    model_load = time.perf_counter() - t0
+    print(f"모델 로드 {model_load:.1f}s, 이미지 {len(paths)}장")
+
+    records = []
+    for i, path in enumerate(paths, 1):
+        t = time.perf_counter()
+        img = phc.load_image(path)
+        t_load = time.perf_counter() - t
+        if img is None:
+            print(f"[{i}/{len(paths)}] 이미지 로드 실패: {path}")
+            records.append(dict(image=path, count=None, error="load failed", boxes=[], scores=[], output=None,
+                                seconds=dict(load=round(t_load, 4), infer=0.0, save=0.0)))
+            continue
+
+        stats = {}
+        t = time.perf_counter()
+        if runner is not None:
+            boxes, scores = runner.infer(img, args.conf, screen_model=screen_model, stats=stats,
+                                         adaptive=args.adaptive, prof=prof)
+        else:
+            boxes, scores = phc.batched_multi_scale_inference(model, img, args.conf, screen_model=screen_model,
+                                                              stats=stats, prof=prof, adaptive=args.adaptive)
+        t_infer = time.perf_counter() - t
+
+        out_path, t_save = None, 0.0
+        if args.save_images:
+            t = time.perf_counter()
+            out_path = phc.output_path(path)
+            cv2.imwrite(out_path, phc.annotate(img, boxes))
+            t_save = time.perf_counter() - t
+
+        records.append(dict(image=path, count=len(boxes), boxes=boxes, scores=[round(s, 4) for s in scores],
+                            output=out_path, tiles=stats.get("tiles"), skipped_tiles=stats.get("skipped"),
+                            grid=stats.get("grid"), grid_info=stats.get("grid_info"),
+                            seconds=dict(load=round(t_load, 4), infer=round(t_infer, 4), save=round(t_save, 4))))
+        print(f"[{i}/{len(paths)}] {os.path.basename(path)}: {len(boxes)}명 ({t_infer:.1f}s)")
+        if stats.get("grid_info"):
+            print("    " + phc.format_grid(stats["grid"], stats["grid_info"]))
+
+    if runner is not None:
+        runner.close()
+    config = phc.config_dict(args.conf)
+    config.update(ADAPTIVE=args.adaptive)
+    config.update(model_load_s=round(model_load, 3), total_s=round(time.perf_counter() - t0, 3))
+    saved = write_manifest(args.manifest, config, records)
+    total = sum(r["count"] or 0 for r in records)
+    print(f"총 {total}명, 매니페스트 저장: {', '.join(saved)}")
+
+    root = os.path.splitext(args.manifest)[0]
+    if prof is not None:
+        prof.print_report()
+        print("시간 리포트:", prof.write(f"{root}_timing.json", config=config, images=len(paths)))
+    if args.cprofile:
+        cprof.disable(); cprof.dump_stats(f"{root}.prof")
+        print("cProfile:", f"{root}.prof")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import time, argparse
+import numpy as np
+
+from people_head_counter import wbf_merge, wbf_merge_fast, WBF_IOU
+
+# ====== WBF 벤치마크 ======
+# 합성 군중: 사람마다 타일 겹침/멀티스케일로 생긴 흔들린 박스 여러 개
+#   python bench_wbf.py --sizes 1000 5000 20000 50000 --py-max 5000
+# =========================
+
+def synthetic_crowd(n, size=(20000, 8000), per_person=6, seed=0):
+    rng = np.random.default_rng(seed)
+    W, H = size
+    people = max(1, n // per_person)
+    cx, cy = rng.uniform(0, W, people), rng.uniform(0, H, people)
+    hh = rng.uniform(15, 150, people)               # 사람 크기(px)
+    ww = hh * rng.uniform(0.35, 0.6, people)
+    idx = rng.integers(0, people, n)
+    jit = rng.normal(0, 0.08, (n, 4)) * np.c_[ww[idx], hh[idx], ww[idx], hh[idx]]
+    x1 = cx[idx] - ww[idx] / 2 + jit[:, 0]; y1 = cy[idx] - hh[idx] / 2 + jit[:, 1]
+    x2 = cx[idx] + ww[idx] / 2 + jit[:, 2]; y2 = cy[idx] + hh[idx] / 2 + jit[:, 3]
+    boxes = np.c_[x1, y1, x2, y2].tolist()
+    scores = rng.uniform(0.15, 0.95, n).tolist()
+    return boxes, scores
+
+def timed(fn, *args, **kw):
+    t0 = time.perf_counter()
+    out = fn(*args, **kw)
+    return out, time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="WBF 벤치마크 (wbf_merge vs wbf_merge_fast)")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000, 20000, 50000])
+    ap.add_argument("--py-max", type=int, default=5000, help="기존 wbf_merge 를 돌릴 최대 박스 수")
+    ap.add_argument("--iou", type=float, default=WBF_IOU)
+    args = ap.parse_args()
+
+    print(f"{'boxes':>7} {'merged':>7} {'wbf_merge(s)':>13} {'fast(s)':>9} {'speedup':>8}  same")
+    for n in args.sizes:
+        boxes, scores = synthetic_crowd(n)
+        fast, t_fast = timed(wbf_merge_fast, boxes, scores, args.iou)
+        if n <= args.py_max:
+            ref, t_ref = timed(wbf_merge, boxes, scores, args.iou)
+            print(f"{n:7d} {len(fast[0]):7d} {t_ref:13.3f} {t_fast:9.3f} {t_ref / t_fast:7.1f}x  {ref == fast}")
+        else:
+            print(f"{n:7d} {len(fast[0]):7d} {'-':>13} {t_fast:9.3f} {'-':>8}  -")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys, time, argparse
+import cv2
+import numpy as np
+
+import people_head_counter as phc
+
+# ====== 적응 격자 확인 (모델 없이, 합성 스티칭) ======
+# 검은 배경에 사람 크기의 흰 사각형을 흩뿌린 큰 이미지를 만들고,
+# 흰 덩어리를 박스로 돌려주는 가짜 모델(1차 추론 검출 한계 COARSE_MIN_PX 를 흉내)로 adaptive_grid 를 돌림
+#   python check_adaptive.py --size 4000 20000 --person 150
+# 축소 1차 추론에서 사람이 보이면 스케일이 줄어 모델 호출이 고정 격자보다 적어야 함
+# ===================================================
+
+class _Box:
+    def __init__(self, xyxy, conf):
+        self.cls = np.array(0)
+        self.conf = np.array(conf)
+        self.xyxy = np.array([xyxy], dtype=np.float64)
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+def blob_model(tiles, imgsz=None, conf=None, verbose=False, **kwargs):
+    """타일마다 밝은 덩어리의 외접 사각형을 person 박스로 (높이 COARSE_MIN_PX 미만은 못 잡음)"""
+    out = []
+    for tile in tiles if isinstance(tiles, list) else [tiles]:
+        gray = cv2.cvtColor(tile, cv2.COLOR_BGR2GRAY)
+        n, _, st, _ = cv2.connectedComponentsWithStats((gray > 64).astype(np.uint8))
+        out.append(_Result([_Box([x, y, x + w, y + h], 0.9) for x, y, w, h, _ in st[1:n]
+                            if h >= phc.COARSE_MIN_PX]))
+    return out
+
+def synthetic_stitch(H, W, person, n, rng):
+    img = np.zeros((H, W, 3), np.uint8)
+    pw = max(1, int(person * 0.4))
+    for _ in range(n):
+        h = int(person * rng.uniform(0.9, 1.1))
+        x, y = int(rng.integers(0, W - pw)), int(rng.integers(0, H - h))
+        img[y:y + h, x:x + pw] = 255
+    return img
+
+def main():
+    ap = argparse.ArgumentParser(description="합성 스티칭으로 적응 격자 스케일/호출 수 확인")
+    ap.add_argument("--size", type=int, nargs=2, default=[4000, 20000], metavar=("H", "W"))
+    ap.add_argument("--person", type=int, default=150, help="사람(사각형) 높이 px")
+    ap.add_argument("--count", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    H, W = args.size
+    img = synthetic_stitch(H, W, args.person, args.count, np.random.default_rng(args.seed))
+    f_whole = min(1.0, phc.COARSE_IMGSZ / max(H, W))
+    print(f"이미지 {W}x{H}, 사람 {args.person}px × {args.count}")
+    print(f"전체를 {phc.COARSE_IMGSZ}px 로 줄이면 사람 {args.person * f_whole:.1f}px "
+          f"(1차 검출 한계 {phc.COARSE_MIN_PX}px, 판정 기준 {2 * phc.COARSE_MIN_PX}px)")
+
+    t0 = time.perf_counter()
+    grid, info = phc.adaptive_grid(img, blob_model)
+    print(f"{phc.format_grid(grid, info)} ({time.perf_counter() - t0:.2f}s)")
+    ok = info["adaptive"] and len(grid["scales"]) < len(phc.MULTI_SCALES) and info["calls"] < info["calls_fixed"]
+    print("확인:", "적응 격자가 스케일/호출을 줄임" if ok else "적응 격자가 줄이지 못함")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import sys, os, argparse
+from glob import glob
+
+import people_head_counter as phc
+
+# ====== 사전 검사(빈 타일 건너뛰기) 평가 ======
+# 라벨 폴더: 이미지와 같은 이름의 YOLO 형식 .txt (class cx cy w h, 0 = person)
+#   python eval_prescreen.py <폴더> --mode edge
+# 사전 검사 없이/있이 각각 돌려 건너뛴 타일 수, 시간, 정답 대비 인원 오차를 비교
+# ============================================
+
+IMG_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+def label_count(txt_path):
+    with open(txt_path, encoding="utf-8") as f:
+        return sum(1 for line in f if line.split() and line.split()[0] == "0")
+
+def main():
+    ap = argparse.ArgumentParser(description="빈 타일 사전 검사 정확도/속도 평가")
+    ap.add_argument("folder", help="이미지 + YOLO 라벨(.txt) 폴더")
+    ap.add_argument("--mode", default="edge", choices=["edge", "model", "both"])
+    ap.add_argument("--conf", type=float, default=phc.DEFAULT_CONF)
+    args = ap.parse_args()
+
+    pairs = []
+    for p in sorted(glob(os.path.join(args.folder, "*"))):
+        txt = os.path.splitext(p)[0] + ".txt"
+        if p.lower().endswith(IMG_EXTS) and os.path.exists(txt):
+            pairs.append((p, label_count(txt)))
+    if not pairs:
+        print("라벨(.txt)이 있는 이미지가 없습니다."); sys.exit(1)
+
+    from ultralytics import YOLO
+    model = YOLO(phc.MODEL_PATH)
+    screen_model = phc.load_screen_model(args.mode)
+
+    rows = []
+    for path, gt in pairs:
+        img = phc.load_image(path)
+        base, screened = {}, {}
+        b0, _ = phc.batched_multi_scale_inference(model, img, args.conf, prescreen=None, stats=base)
+        b1, _ = phc.batched_multi_scale_inference(model, img, args.conf, prescreen=args.mode,
+                                                  screen_model=screen_model, stats=screened)
+        rows.append((os.path.basename(path), gt, len(b0), len(b1), base, screened))
+        print(f"{os.path.basename(path)}: 정답 {gt}, 전체 {len(b0)}, 사전검사 {len(b1)} "
+              f"(타일 {screened['skipped']}/{screened['tiles']} 건너뜀, "
+              f"{base['seconds']:.1f}s → {screened['seconds']:.1f}s)")
+
+    n = len(rows)
+    mae0 = sum(abs(c0 - gt) for _, gt, c0, _, _, _ in rows) / n
+    mae1 = sum(abs(c1 - gt) for _, gt, _, c1, _, _ in rows) / n
+    tiles = sum(r[5]["tiles"] for r in rows)
+    skipped = sum(r[5]["skipped"] for r in rows)
+    t0 = sum(r[4]["seconds"] for r in rows); t1 = sum(r[5]["seconds"] for r in rows)
+    print("\n====== 요약 ======")
+    print(f"이미지 {n}장, 모드={args.mode}, SCREEN_EDGE={phc.SCREEN_EDGE}")
+    print(f"건너뛴 타일: {skipped}/{tiles} ({100.0 * skipped / max(1, tiles):.1f}%)")
+    print(f"인원 MAE: 전체 {mae0:.2f} → 사전검사 {mae1:.2f} (차이 {mae1 - mae0:+.2f})")
+    print(f"시간: {t0:.1f}s → {t1:.1f}s ({t0 / t1 if t1 else 0:.2f}x)")
+
+if __name__ == "__main__":
+    main()
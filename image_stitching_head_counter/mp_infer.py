@@ -0,0 +1,192 @@
+import sys, os, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import people_head_counter as phc
+
+# ====== 멀티프로세스 타일 추론 (GPU 없는 다코어 서버용) ======
+# - 워커 프로세스마다 모델을 한 번만 로드
+# - 원본 이미지는 공유 메모리에 한 번만 올리고, 워커에는 (이름, 모양, 타일 창 목록)만 전달
+#   워커가 공유 메모리에서 직접 타일을 잘라/확대(scaled_tile)하므로 배열 피클링 없음
+# - 결과(박스/점수)만 돌려받아 부모 프로세스에서 WBF
+# ==========================================================
+TASK_TILES = phc.TILE_BATCH    # 작업 1개당 타일 수 (= 워커 안의 배치 크기)
+
+_model = None
+
+
+def _init_worker(model_path, threads):
+    global _model
+    import torch
+    torch.set_num_threads(threads)
+    from ultralytics import YOLO
+    _model = YOLO(model_path)
+
+
+def _ready(barrier=None):
+    if barrier is not None:
+        barrier.wait()  # 모든 워커가 이 작업을 하나씩 잡을 때까지(= 모델 로드가 끝날 때까지) 대기
+    return os.getpid()
+
+
+def _attach(name):
+    """공유 메모리 연결. 워커는 정리 대상으로 등록하지 않아 생성한 부모만 unlink 함"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _run_tiles(shm_name, shape, dtype, entries, conf):
+    """entries: [(plan 번호, (scale, Hs, Ws, 창)), ...] → ([(plan 번호, boxes, scores), ...], 모델 호출 수)"""
+    shm = _attach(shm_name)
+    try:
+        img = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        groups = {}
+        for idx, entry in entries:
+            s, Hs, Ws, win = entry
+            tile = np.ascontiguousarray(phc.scaled_tile(img, s, Hs, Ws, win))
+            groups.setdefault(tile.shape[:2], []).append((idx, entry, tile))
+        del img
+        out = []
+        for key, items in groups.items():
+            res_list = _model(
+                [tile for _, _, tile in items],
+                imgsz=min(phc.IMG_SIZE, max(key)),
+                conf=conf,
+                verbose=False,
+                augment=phc.USE_TTA
+            )
+            for (idx, entry, _), res in zip(items, res_list):
+                gb, gs = phc.map_tile_result(entry, res)
+                out.append((idx, gb, gs))
+        return out, len(groups)
+    finally:
+        shm.close()
+
+
+class ProcessTileRunner:
+    """워커 풀을 한 번 띄워 두고 여러 이미지에 재사용"""
+
+    def __init__(self, workers=None, threads=phc.WORKER_THREADS, model_path=phc.MODEL_PATH):
+        self.workers = workers or phc.PROCESS_WORKERS or os.cpu_count()
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(model_path, threads))
+
+    def warmup(self, timeout=600):
+        """
+        워커를 모두 띄워 모델 로드를 미리 끝냄
+        _ready 작업 N개가 배리어에서 서로를 기다리므로, 먼저 뜬 워커 하나가 여러 개를 가져가지 못하고
+        워커마다 하나씩(= 모든 워커의 initializer 가 끝난 뒤) 끝남
+        """
+        import multiprocessing
+        with multiprocessing.Manager() as manager:  # 작업 인자로 넘길 수 있는 배리어(프록시)
+            barrier = manager.Barrier(self.workers, timeout=timeout)
+            pids = {fut.result() for fut in [self.pool.submit(_ready, barrier) for _ in range(self.workers)]}
+        return len(pids)
+
+    def close(self):
+        self.pool.shutdown()
+
+    def infer(self, img_bgr, conf, prescreen=phc.PRESCREEN, screen_model=None, stats=None, adaptive=phc.ADAPTIVE,
+              prof=None):
+        """
+        batched_multi_scale_inference 와 같은 타일 계획/병합을 워커 프로세스로 분산
+        adaptive 는 단일 프로세스 경로와 같이 screen_model(load_screen_model) 로 1차 추론
+        prof(StageProfiler) 는 부모 쪽 단계만 기록: coarse/plan/prescreen/shm(공유 메모리 복사)/
+        workers(제출~결과 대기, 워커 안의 자르기·추론 전체)/wbf
+        """
+        prof = prof or phc.NULL_PROFILER
+        t0 = time.perf_counter()
+        grid = info = None
+        if adaptive:
+            if screen_model is None:
+                raise ValueError("adaptive 는 1차 추론용 screen_model(load_screen_model) 이 필요합니다")
+            with prof.stage("coarse"):
+                grid, info = phc.adaptive_grid(img_bgr, screen_model, TASK_TILES)
+            prof.note("grid", grid); prof.note("calls_saved_est", info["calls_saved"])
+        with prof.stage("plan"):
+            plan = phc.build_plan(*img_bgr.shape[:2], grid)
+        for s, _, _, _ in plan:
+            prof.count(f"tiles@{s}")
+        with prof.stage("prescreen"):
+            keep = phc.prescreen_tiles(img_bgr, plan, prescreen, screen_model) if prescreen else [True] * len(plan)
+        todo = [(i, plan[i]) for i in range(len(plan)) if keep[i]]
+        prof.count("skipped", len(plan) - len(todo))
+
+        img = np.ascontiguousarray(img_bgr)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, img.nbytes))
+        try:
+            with prof.stage("shm"):
+                np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)[:] = img
+            with prof.stage("workers"):
+                futs = [self.pool.submit(_run_tiles, shm.name, img.shape, img.dtype.str, todo[k:k + TASK_TILES],
+                                         conf) for k in range(0, len(todo), TASK_TILES)]
+                results = [None] * len(plan)
+                calls = 0
+                for fut in futs:
+                    out, n = fut.result()
+                    calls += n
+                    for idx, gb, gs in out:
+                        results[idx] = (gb, gs)
+        finally:
+            shm.close(); shm.unlink()
+        prof.count("tasks", len(futs)); prof.count("model_calls", calls)
+
+        all_boxes, all_scores = [], []
+        for r in results:
+            if r is None: continue
+            all_boxes.extend(r[0]); all_scores.extend(r[1])
+        prof.count("raw_boxes", len(all_boxes))
+        merge = phc.wbf_merge_fast if phc.FAST_WBF else phc.wbf_merge
+        with prof.stage("wbf"):
+            merged_boxes, merged_scores = merge(all_boxes, all_scores, iou_thr=phc.WBF_IOU)
+        prof.count("merged_boxes", len(merged_boxes))
+
+        if stats is not None:
+            dt = time.perf_counter() - t0
+            stats.update(tiles=len(plan), skipped=len(plan) - len(todo), model_calls=calls, tasks=len(futs),
+                         seconds=dt, tiles_per_sec=len(todo) / dt if dt > 0 else 0.0, grid=grid, grid_info=info)
+        return merged_boxes, merged_scores
+
+
+def main():
+    # 워커 수별 속도 곡선: 단일 프로세스(batched_multi_scale_inference) 대비 배속
+    ap = argparse.ArgumentParser(description="멀티프로세스 타일 추론 속도 측정")
+    ap.add_argument("image")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    ap.add_argument("--threads", type=int, default=1, help="워커당 torch 스레드 수")
+    ap.add_argument("--conf", type=float, default=phc.DEFAULT_CONF)
+    args = ap.parse_args()
+
+    img = phc.load_image(args.image)
+    if img is None:
+        print("이미지 로드 실패:", args.image); sys.exit(1)
+
+    import torch
+    from ultralytics import YOLO
+    model = YOLO(phc.MODEL_PATH)
+    screen_model = phc.load_screen_model()
+    base = {}
+    boxes, _ = phc.batched_multi_scale_inference(model, img, args.conf, screen_model=screen_model, stats=base)
+    print(f"단일 프로세스 (torch 스레드 {torch.get_num_threads()}): {base['seconds']:.2f}s, "
+          f"{base['tiles_per_sec']:.2f} tiles/s, {len(boxes)}명")
+
+    for n in args.workers:
+        runner = ProcessTileRunner(n, args.threads)
+        runner.warmup()
+        st = {}
+        mp_boxes, _ = runner.infer(img, args.conf, screen_model=screen_model, stats=st)
+        runner.close()
+        print(f"워커 {n:3d} × 스레드 {args.threads}: {st['seconds']:.2f}s, {st['tiles_per_sec']:.2f} tiles/s, "
+              f"{base['seconds'] / st['seconds']:.2f}x, {len(mp_boxes)}명")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
-import sys, os, cv2, math
-from ultralytics import YOLO
+import sys, os, cv2, math, time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from detection_core import wbf_merge, wbf_merge_fast, tile_to_global  # 공용 WBF/타일 변환
+from detection_core import tile_windows as _tile_windows
+from profiling import StageProfiler, NULL_PROFILER
 
 # ====== 설정(정확도 최우선) ======
 MODEL_PATH    = "yolov8x.pt"   # 최대 성능
@@ -10,44 +15,35 @@ OVERLAP       = 0.40           # 타일 겹침 비율(0.3~0.5 권장)
 USE_TTA       = True           # test-time augmentation(ultralytics 내부 flip/scale)
 MULTI_SCALES  = [1.0, 1.5, 2.0]# 원본, 1.5배, 2배 업샘플 후 추론
 WBF_IOU       = 0.55           # WBF 병합 IoU(0.5~0.6 권장)
+FAST_WBF      = True           # 격자 사전필터 WBF 사용(결과는 wbf_merge 와 동일)
+BATCH_TILES   = True           # 모든 스케일의 타일을 모아 배치로 추론
+TILE_BATCH    = 8              # 모델 호출 1회당 타일 수
+PAD_TILES     = False          # 가장자리 타일도 TILE_SIZE로 패딩해 한 배치에 묶음(결과가 조금 달라질 수 있음)
+LAZY_SCALE    = True           # 전체 업샘플 대신 타일 영역만 원본에서 잘라 확대(메모리 ∝ 타일 크기)
+PRESCREEN     = None           # 빈 타일 건너뛰기: None / "edge"(에지 세기) / "model"(소형 모델 전체 패스) / "both"(둘 중 하나라도 통과)
+SCREEN_MODEL  = "yolov8n.pt"   # "model" 사전 검사 + 적응 격자 1차 추론용 소형 모델(실행 방식과 무관하게 항상 이 모델)
+SCREEN_IMGSZ  = 1280           # 사전 검사 시 전체 이미지 축소 크기
+SCREEN_CONF   = 0.05           # 사전 검사 conf(낮게 잡아 놓치는 타일 최소화)
+SCREEN_EDGE   = 6.0            # 타일 평균 Sobel 세기가 이보다 작으면 빈 타일(하늘/수면/지붕)
+PROCESS_WORKERS = 0            # >0 이면 워커 프로세스로 타일 추론(mp_infer.py, GPU 없는 다코어 서버용)
+WORKER_THREADS  = 1            # 워커당 torch intra-op 스레드 수 (워커 × 스레드 ≈ 코어 수 권장)
+ADAPTIVE      = False          # 1차 축소 추론으로 사람 크기를 재서 타일 크기/겹침/스케일을 이미지마다 고름
+COARSE_IMGSZ  = 1280           # 적응 격자용 1차 추론 타일 크기(축소 이미지를 이 크기 타일로 나눠 추론)
+COARSE_SCALE  = 0.25           # 1차 추론 축소 배율 하한(큰 스티칭도 150px 사람이 ~37px 로 남도록, 이미지 크기와 무관)
+COARSE_OVERLAP = 0.15          # 1차 추론 타일 겹침(크기 추정용이라 적게)
+COARSE_CONF   = 0.25           # 1차 추론 conf(크기 추정용이라 확실한 박스만)
+COARSE_MIN_PX = 12             # 1차 추론(축소 이미지)에서 사람이 잡히는 최소 높이 px
+ADAPT_MIN_BOXES = 10           # 1차 박스가 이보다 적으면 크기 추정을 믿지 않고 고정 격자 사용
+PERSON_PCT    = (10, 90)       # 작은/큰 사람 크기로 쓸 박스 높이 백분위
+MIN_PERSON_PX = 32             # 모델 입력에서 작은 사람 높이가 이 이상이면 재현율 유지로 봄
+TILE_CHOICES  = [640, 1024, 1536, 2048]  # 적응 격자 타일 후보
+OVERLAP_RANGE = (0.15, 0.50)   # 적응 겹침 범위(큰 사람 높이 × 1.2 가 겹침 안에 들어가게)
+PROFILE       = False          # 단계별 시간/카운터 리포트(<이미지>_timing.json) 저장
+PROFILE_TTA   = True           # PROFILE 시 첫 배치를 TTA 없이 한 번 더 돌려 TTA 비중 추정
+CPROFILE      = False          # cProfile 덤프(<이미지>_out.prof) 저장
 DRAW_RADIUS_K = 0.22           # 머리 원 반경 비
 # =================================
 
-def iou_xyxy(a, b):
-    ax1, ay1, ax2, ay2 = a; bx1, by1, bx2, by2 = b
-    ix1, iy1 = max(ax1, bx1), max(ay1, by1)
-    ix2, iy2 = min(ax2, bx2), min(ay2, by2)
-    iw, ih = max(0.0, ix2 - ix1), max(0.0, iy2 - iy1)
-    inter = iw * ih
-    if inter <= 0: return 0.0
-    area_a = max(1e-9, (ax2 - ax1) * (ay2 - ay1))
-    area_b = max(1e-9, (bx2 - bx1) * (by2 - by1))
-    return inter / (area_a + area_b - inter)
-
-def wbf_merge(boxes, scores, iou_thr=WBF_IOU):
-    """간단 WBF: IoU가 임계 이상인 박스들 가중평균(가중치=score)으로 병합"""
-    if not boxes: return [], []
-    idxs = sorted(range(len(boxes)), key=lambda i: scores[i], reverse=True)
-    used = [False]*len(boxes)
-    merged_boxes, merged_scores = [], []
-    for i in idxs:
-        if used[i]: continue
-        group, group_scores = [boxes[i]], [scores[i]]
-        used[i] = True
-        for j in idxs:
-            if used[j]: continue
-            if iou_xyxy(boxes[i], boxes[j]) >= iou_thr:
-                group.append(boxes[j]); group_scores.append(scores[j]); used[j] = True
-        # 가중 평균
-        w = sum(group_scores)
-        xs1 = sum(b[0]*s for b,s in zip(group, group_scores))/w
-        ys1 = sum(b[1]*s for b,s in zip(group, group_scores))/w
-        xs2 = sum(b[2]*s for b,s in zip(group, group_scores))/w
-        ys2 = sum(b[3]*s for b,s in zip(group, group_scores))/w
-        merged_boxes.append([int(xs1), int(ys1), int(xs2), int(ys2)])
-        merged_scores.append(max(group_scores))  # 보수적으로 최대 점수 유지
-    return merged_boxes, merged_scores
-
 def draw_head_circles(img, boxes):
     for (x1, y1, x2, y2) in boxes:
         cx = int((x1 + x2) / 2)
@@ -56,6 +52,15 @@ def draw_head_circles(img, boxes):
         r  = max(6, int(DRAW_RADIUS_K * h))
         cv2.circle(img, (cx, cy), r, (0, 0, 255), 2)
 
+def result_to_boxes(res):
+    boxes, scores = [], []
+    for b in res.boxes:
+        if int(b.cls.item()) == 0:  # person
+            x1, y1, x2, y2 = map(float, b.xyxy[0].tolist())
+            boxes.append([x1, y1, x2, y2])
+            scores.append(float(b.conf.item()))
+    return boxes, scores
+
 def infer_tile(model, tile_bgr, conf):
     res = model(
         tile_bgr,
@@ -64,56 +69,103 @@ def infer_tile(model, tile_bgr, conf):
         verbose=False,
         augment=USE_TTA
     )[0]
-    boxes, scores = [], []
-    for b in res.boxes:
-        if int(b.cls.item()) == 0:  # person
-            x1, y1, x2, y2 = map(float, b.xyxy[0].tolist())
-            boxes.append([x1, y1, x2, y2])
-            scores.append(float(b.conf.item()))
-    return boxes, scores
+    return result_to_boxes(res)
+
+def tile_windows(H, W, tile=None, overlap=None):
+    """(x0, y0, x1, y1) 타일 창 목록: 메인 그리드 + 오른쪽/아래 가장자리"""
+    return _tile_windows(H, W, tile or TILE_SIZE, OVERLAP if overlap is None else overlap)
 
 def tiled_inference_single_scale(model, img_bgr, conf):
     H, W = img_bgr.shape[:2]
-    step = int(TILE_SIZE * (1.0 - OVERLAP))
-    if step <= 0: raise ValueError("OVERLAP이 너무 큽니다.")
     all_boxes, all_scores = [], []
+    for (x0, y0, x1, y1) in tile_windows(H, W):
+        boxes, scores = infer_tile(model, img_bgr[y0:y1, x0:x1], conf)
+        tile_to_global(boxes, scores, (x0, y0, x1, y1), H, W, all_boxes, all_scores)
+    return all_boxes, all_scores
 
-    # 내부 타일 루프
-    def process_window(x0, y0, x1, y1):
-        tile = img_bgr[y0:y1, x0:x1]
-        boxes, scores = infer_tile(model, tile, conf)
-        for (bx1, by1, bx2, by2), sc in zip(boxes, scores):
-            gx1, gy1 = bx1 + x0, by1 + y0
-            gx2, gy2 = bx2 + x0, by2 + y0
-            gx1, gy1 = max(0, gx1), max(0, gy1)
-            gx2, gy2 = min(W - 1, gx2), min(H - 1, gy2)
-            if gx2 > gx1 and gy2 > gy1:
-                all_boxes.append([gx1, gy1, gx2, gy2]); all_scores.append(sc)
-
-    # 메인 그리드
-    for y0 in range(0, max(1, H - TILE_SIZE + 1), step):
-        for x0 in range(0, max(1, W - TILE_SIZE + 1), step):
-            process_window(x0, y0, min(x0 + TILE_SIZE, W), min(y0 + TILE_SIZE, H))
-    # 오른쪽/아래 가장자리 커버
-    if (W - TILE_SIZE) % step != 0:
-        x0 = max(0, W - TILE_SIZE)
-        for y0 in range(0, max(1, H - TILE_SIZE + 1), step):
-            process_window(x0, y0, W, min(y0 + TILE_SIZE, H))
-    if (H - TILE_SIZE) % step != 0:
-        y0 = max(0, H - TILE_SIZE)
-        for x0 in range(0, max(1, W - TILE_SIZE + 1), step):
-            process_window(x0, y0, min(x0 + TILE_SIZE, W), H)
+def scaled_image(img_bgr, s):
+    H, W = img_bgr.shape[:2]
+    if s == 1.0:
+        return img_bgr
+    return cv2.resize(img_bgr, (int(W*s), int(H*s)), interpolation=cv2.INTER_CUBIC)
 
-    return all_boxes, all_scores
+def scaled_tile(img_bgr, s, Hs, Ws, win):
+    """
+    scaled_image(img_bgr, s)[y0:y1, x0:x1] 와 같은 타일을 전체 확대 없이 생성
+    원본에서 필요한 영역(+큐빅 보간용 테두리 2~3px)만 뷰로 잘라 remap 으로 확대
+    """
+    x0, y0, x1, y1 = win
+    if s == 1.0:
+        return img_bgr[y0:y1, x0:x1]
+    H, W = img_bgr.shape[:2]
+    # cv2.resize 와 같은 좌표 대응: src = (dst + 0.5) * (W / Ws) - 0.5
+    mx = (np.arange(x0, x1) + 0.5) * (W / Ws) - 0.5
+    my = (np.arange(y0, y1) + 0.5) * (H / Hs) - 0.5
+    sx0, sx1 = max(0, int(math.floor(mx[0])) - 2), min(W, int(math.ceil(mx[-1])) + 3)
+    sy0, sy1 = max(0, int(math.floor(my[0])) - 2), min(H, int(math.ceil(my[-1])) + 3)
+    src = img_bgr[sy0:sy1, sx0:sx1]  # 복사 없는 뷰 (.npy 를 mmap 으로 열었다면 필요한 부분만 읽힘)
+    map_x, map_y = np.meshgrid((mx - sx0).astype(np.float32), (my - sy0).astype(np.float32))
+    return cv2.remap(src, map_x, map_y, cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
 
-def multi_scale_inference(model, img_bgr, conf):
+def load_image(path):
+    """.npy 는 mmap 으로 열어(거대 스티칭 이미지) 필요한 타일만 메모리에 올림, 그 외는 cv2.imread"""
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return cv2.imread(path)
+
+def load_screen_model(prescreen=PRESCREEN, adaptive=ADAPTIVE):
+    """
+    사전 검사("model"/"both")와 적응 격자 1차 추론이 함께 쓰는 소형 모델(SCREEN_MODEL), 둘 다 안 쓰면 None
+    단일 프로세스/--workers 어느 쪽이든 1차 추론은 이 모델 → 같은 이미지면 같은 격자/인원수
+    """
+    if prescreen in ("model", "both") or adaptive:
+        from ultralytics import YOLO
+        return YOLO(SCREEN_MODEL)
+    return None
+
+def prescreen_tiles(img_bgr, plan, mode, screen_model=None):
+    """
+    plan 의 각 타일이 사람이 있을 만한지 값싸게 판단해 bool 목록 반환
+    edge : 축소 이미지의 Sobel 세기 적분영상으로 타일 영역 평균 세기를 구해 SCREEN_EDGE 이상이면 통과
+    model: 소형 모델로 전체 이미지를 한 번 추론해 박스가 걸치는 타일만 통과
+    """
     H, W = img_bgr.shape[:2]
+    f = min(1.0, SCREEN_IMGSZ / max(H, W))
+    small = cv2.resize(img_bgr, (max(1, int(W*f)), max(1, int(H*f))), interpolation=cv2.INTER_AREA)
+
+    def region(s, Hs, Ws, win):  # 확대 좌표 창 → 축소 이미지 좌표
+        x0, y0, x1, y1 = win
+        return (x0 * W / Ws * f, y0 * H / Hs * f, x1 * W / Ws * f, y1 * H / Hs * f)
+
+    keep_edge = keep_model = None
+    if mode in ("edge", "both"):
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        mag = cv2.magnitude(cv2.Sobel(gray, cv2.CV_32F, 1, 0), cv2.Sobel(gray, cv2.CV_32F, 0, 1))
+        integ = cv2.integral(mag)
+        keep_edge = []
+        for s, Hs, Ws, win in plan:
+            x0, y0, x1, y1 = region(s, Hs, Ws, win)
+            x0, y0 = int(x0), int(y0)
+            x1, y1 = max(x0 + 1, int(math.ceil(x1))), max(y0 + 1, int(math.ceil(y1)))
+            x1, y1 = min(x1, integ.shape[1] - 1), min(y1, integ.shape[0] - 1)
+            area = max(1, (x1 - x0) * (y1 - y0))
+            total = integ[y1, x1] - integ[y0, x1] - integ[y1, x0] + integ[y0, x0]
+            keep_edge.append(total / area >= SCREEN_EDGE)
+    if mode in ("model", "both"):
+        res = screen_model(small, imgsz=SCREEN_IMGSZ, conf=SCREEN_CONF, verbose=False)[0]
+        coarse, _ = result_to_boxes(res)
+        keep_model = []
+        for s, Hs, Ws, win in plan:
+            x0, y0, x1, y1 = region(s, Hs, Ws, win)
+            keep_model.append(any(b[0] < x1 and b[2] > x0 and b[1] < y1 and b[3] > y0 for b in coarse))
+    if keep_edge is None: return keep_model
+    if keep_model is None: return keep_edge
+    return [a or b for a, b in zip(keep_edge, keep_model)]
+
+def multi_scale_inference(model, img_bgr, conf):
     all_boxes, all_scores = [], []
     for s in MULTI_SCALES:
-        if s == 1.0:
-            up = img_bgr
-        else:
-            up = cv2.resize(img_bgr, (int(W*s), int(H*s)), interpolation=cv2.INTER_CUBIC)
+        up = scaled_image(img_bgr, s)
         boxes, scores = tiled_inference_single_scale(model, up, conf)
         # 스케일 원복
         if s != 1.0:
@@ -122,9 +174,263 @@ def multi_scale_inference(model, img_bgr, conf):
                 boxes[i] = [boxes[i][0]*inv, boxes[i][1]*inv, boxes[i][2]*inv, boxes[i][3]*inv]
         all_boxes.extend(boxes); all_scores.extend(scores)
     # WBF로 최종 병합
-    merged_boxes, merged_scores = wbf_merge(all_boxes, all_scores, iou_thr=WBF_IOU)
+    merge = wbf_merge_fast if FAST_WBF else wbf_merge
+    merged_boxes, merged_scores = merge(all_boxes, all_scores, iou_thr=WBF_IOU)
+    return merged_boxes, merged_scores
+
+def build_plan(H, W, grid=None):
+    """
+    모든 스케일의 타일 창 목록 [(scale, 확대 이미지 H, W, 창), ...]
+    grid: dict(tile, overlap, scales) — 없으면 TILE_SIZE / OVERLAP / MULTI_SCALES
+    """
+    grid = grid or {}
+    plan = []
+    for s in grid.get("scales", MULTI_SCALES):
+        Hs, Ws = (H, W) if s == 1.0 else (int(H*s), int(W*s))
+        plan.extend((s, Hs, Ws, win) for win in tile_windows(Hs, Ws, grid.get("tile"), grid.get("overlap")))
+    return plan
+
+def estimate_calls(plan, batch=TILE_BATCH):
+    """batched_multi_scale_inference 의 모델 호출 수(같은 모양 타일끼리 batch 장씩) 추정"""
+    shapes = {}
+    for _, _, _, (x0, y0, x1, y1) in plan:
+        shapes[(y1 - y0, x1 - x0)] = shapes.get((y1 - y0, x1 - x0), 0) + 1
+    return sum(-(-n // batch) for n in shapes.values())
+
+def coarse_pass(img_bgr, coarse_model, batch=TILE_BATCH):
+    """
+    적응 격자용 1차 추론: 이미지를 f 배로 한 번 축소(INTER_AREA)하고 COARSE_IMGSZ 타일로 나눠 같은 모양끼리 배치 추론
+    f = max(COARSE_SCALE, 전체가 타일 하나에 들어가는 배율) — 전체를 COARSE_IMGSZ 로 줄이면
+    20000px 스티칭에서 150px 사람이 ~10px 가 되어 1차 추론에서 안 보이므로 배율 하한을 둠
+    반환: (원본 좌표 박스 목록(겹침 중복은 WBF 로 병합), f, 모델 호출 수)
+    """
+    H, W = img_bgr.shape[:2]
+    f = min(1.0, max(COARSE_SCALE, COARSE_IMGSZ / max(H, W)))
+    small = np.asarray(img_bgr) if f == 1.0 else cv2.resize(
+        np.asarray(img_bgr), (max(1, int(W*f)), max(1, int(H*f))), interpolation=cv2.INTER_AREA)
+    plan = list(dict.fromkeys(build_plan(*small.shape[:2], dict(tile=COARSE_IMGSZ, overlap=COARSE_OVERLAP,
+                                                               scales=[1.0]))))
+    groups = {}
+    for entry in plan:
+        x0, y0, x1, y1 = entry[3]
+        groups.setdefault((y1 - y0, x1 - x0), []).append(entry)
+    boxes, scores, calls = [], [], 0
+    for items in groups.values():
+        for k in range(0, len(items), batch):
+            chunk = items[k:k + batch]
+            res_list = coarse_model([small[y0:y1, x0:x1] for _, _, _, (x0, y0, x1, y1) in chunk],
+                                    imgsz=COARSE_IMGSZ, conf=COARSE_CONF, verbose=False)
+            calls += 1
+            for entry, res in zip(chunk, res_list):
+                gb, gs = map_tile_result(entry, res)
+                boxes.extend([b[0] / f, b[1] / f, b[2] / f, b[3] / f] for b in gb); scores.extend(gs)
+    if len(plan) > 1:
+        boxes, scores = wbf_merge_fast(boxes, scores, iou_thr=WBF_IOU)
+    return boxes, f, calls
+
+def adaptive_grid(img_bgr, coarse_model, batch=TILE_BATCH):
+    """
+    축소 이미지 1차 추론(coarse_pass)으로 사람 높이 분포를 재서 (grid, info) 반환
+    - 스케일: MULTI_SCALES 의 앞부분 중, 작은 사람(PERSON_PCT[0])이 모델 입력에서 MIN_PERSON_PX 이상 되는 가장 짧은 목록
+    - 타일: 그 조건을 지키는 후보 중 모델 호출이 가장 적은 크기 (IMG_SIZE 보다 큰 타일은 축소되어 들어감)
+    - 겹침: 가장 큰 스케일에서 큰 사람(PERSON_PCT[1]) 높이 × 1.2 가 겹침 안에 들어가게
+    1차 박스가 적거나, 작은 사람이 1차 추론에서 겨우 잡히는 크기라면(더 작은 사람을 놓쳤을 수 있음) 고정 격자 유지
+    """
+    H, W = img_bgr.shape[:2]
+    fixed = dict(tile=TILE_SIZE, overlap=OVERLAP, scales=list(MULTI_SCALES))
+    calls_fixed = estimate_calls(build_plan(H, W, fixed), batch)
+    info = dict(calls_fixed=calls_fixed, calls=calls_fixed, calls_saved=0, coarse_boxes=0, person_px=None,
+                adaptive=False, reason="")
+
+    coarse, f, coarse_calls = coarse_pass(img_bgr, coarse_model, batch)
+    info.update(coarse_boxes=len(coarse), coarse_scale=round(f, 4), coarse_calls=coarse_calls)
+    if len(coarse) < ADAPT_MIN_BOXES:
+        info["reason"] = f"1차 박스 {len(coarse)}개 < {ADAPT_MIN_BOXES}"
+        return fixed, info
+
+    heights = np.array([b[3] - b[1] for b in coarse], dtype=np.float64)  # 원본 px
+    h_small, h_large = np.percentile(heights, PERSON_PCT)
+    info["person_px"] = [round(float(h_small), 1), round(float(h_large), 1)]
+    if f < 1.0 and h_small * f < 2 * COARSE_MIN_PX:
+        # 작은 쪽이 1차 추론의 검출 한계 근처 → 더 작은 사람을 못 봤을 수 있으므로 고정 격자
+        info["reason"] = f"작은 사람 {h_small:.0f}px 가 1차 검출 한계 근처"
+        return fixed, info
+
+    best = None
+    scales_all = sorted(MULTI_SCALES)
+    for k in range(1, len(scales_all) + 1):
+        scales = scales_all[:k]
+        for tile in TILE_CHOICES:
+            shrink = min(1.0, IMG_SIZE / tile)  # 타일이 IMG_SIZE 보다 크면 모델 입력에서 축소됨
+            if h_small * scales[-1] * shrink < MIN_PERSON_PX:
+                continue
+            overlap = min(OVERLAP_RANGE[1], max(OVERLAP_RANGE[0], 1.2 * h_large * scales[-1] / tile))
+            grid = dict(tile=tile, overlap=round(overlap, 3), scales=scales)
+            calls = estimate_calls(build_plan(H, W, grid), batch)
+            if best is None or calls < best[0]:
+                best = (calls, grid)
+        if best is not None:
+            break  # 가장 적은 스케일 수에서 조건을 만족하는 격자가 있으면 더 늘리지 않음
+    if best is None:
+        info["reason"] = f"작은 사람 {h_small:.0f}px: 최대 스케일로도 {MIN_PERSON_PX}px 미만"
+        return fixed, info
+    calls, grid = best
+    if calls > calls_fixed:
+        info["reason"] = "적응 격자가 고정 격자보다 호출이 많음"
+        return fixed, info
+    info.update(adaptive=True, calls=calls, calls_saved=calls_fixed - calls)
+    return grid, info
+
+def format_grid(grid, info):
+    """격자 계획 로그 한 줄"""
+    text = (f"격자: tile={grid['tile']}, overlap={grid['overlap']}, scales={grid['scales']}, "
+            f"모델 호출 약 {info['calls']}회 (고정 격자 {info['calls_fixed']}회, 절약 {info['calls_saved']}회)")
+    if info.get("person_px"):
+        text += f", 사람 높이 p{PERSON_PCT[0]}/p{PERSON_PCT[1]}={info['person_px'][0]}/{info['person_px'][1]}px"
+    if info.get("coarse_calls"):
+        text += f", 1차 추론 {info['coarse_scale']}배 {info['coarse_calls']}회"
+    if info.get("reason"):
+        text += f" [고정: {info['reason']}]"
+    return text
+
+def map_tile_result(entry, res, pad=False):
+    """타일 1장의 추론 결과를 원본 이미지 좌표 (boxes, scores) 로 변환"""
+    s, Hs, Ws, win = entry
+    boxes, scores = result_to_boxes(res)
+    if pad:  # 패딩 영역 박스는 실제 타일 범위로 자름
+        tw, th = win[2] - win[0], win[3] - win[1]
+        boxes = [[min(b[0], tw), min(b[1], th), min(b[2], tw), min(b[3], th)] for b in boxes]
+    gb, gs = [], []
+    tile_to_global(boxes, scores, win, Hs, Ws, gb, gs)
+    if s != 1.0:
+        inv = 1.0 / s
+        gb = [[b[0]*inv, b[1]*inv, b[2]*inv, b[3]*inv] for b in gb]
+    return gb, gs
+
+def batched_multi_scale_inference(model, img_bgr, conf, batch=TILE_BATCH, pad=PAD_TILES,
+                                  lazy=LAZY_SCALE, prescreen=PRESCREEN, screen_model=None, stats=None,
+                                  prof=None, adaptive=ADAPTIVE, grid=None):
+    """
+    multi_scale_inference 와 같은 결과를 타일 배치로 계산
+    모든 스케일의 타일 창을 먼저 나열하고, 같은 크기의 타일끼리 batch 장씩 묶어 모델 1회로 추론
+    lazy=True 면 확대 이미지를 만들지 않고 타일마다 원본 영역만 확대
+    prescreen 을 주면 사전 검사에서 떨어진 타일은 추론하지 않음
+    prof(StageProfiler) 를 주면 단계별 시간과 카운터를 기록
+    adaptive=True 면 1차 축소 추론(screen_model = load_screen_model())으로 격자를 고름. grid 를 주면 그 격자 사용
+    """
+    prof = prof or NULL_PROFILER
+    t0 = time.perf_counter()
+    # 1) 스케일 × 타일 창 목록
+    info = None
+    if grid is None and adaptive:
+        if screen_model is None:
+            raise ValueError("adaptive 는 1차 추론용 screen_model(load_screen_model) 이 필요합니다")
+        with prof.stage("coarse"):
+            grid, info = adaptive_grid(img_bgr, screen_model, batch)
+        prof.note("grid", grid); prof.note("calls_saved_est", info["calls_saved"])
+    grid = grid or dict(tile=TILE_SIZE, overlap=OVERLAP, scales=list(MULTI_SCALES))
+    tile_size = grid["tile"]
+    with prof.stage("plan"):
+        plan = build_plan(*img_bgr.shape[:2], grid)
+    for s, _, _, _ in plan:
+        prof.count(f"tiles@{s}")
+
+    with prof.stage("prescreen"):
+        keep = prescreen_tiles(img_bgr, plan, prescreen, screen_model) if prescreen else [True] * len(plan)
+    prof.count("skipped", len(plan) - sum(keep))
+
+    results = [None] * len(plan)  # 타일 순서대로 결과를 모아 기존 경로와 같은 순서로 병합
+    groups = {}                   # 타일 모양 → [(plan 번호, 타일), ...]
+    calls = 0
+
+    def run(key):
+        nonlocal calls
+        items = groups.pop(key)
+        tiles = [tile for _, tile in items]
+        with prof.stage("model"):
+            res_list = model(
+                tiles,
+                imgsz=min(IMG_SIZE, max(key)),
+                conf=conf,
+                verbose=False,
+                augment=USE_TTA
+            )
+        if calls == 0 and USE_TTA and PROFILE_TTA and prof is not NULL_PROFILER:
+            # 같은 배치를 TTA 없이 한 번 더 돌려 모델 시간 중 TTA 비중을 추정
+            t_tta = prof.times["model"]
+            with prof.stage("tta_probe"):
+                model(tiles, imgsz=min(IMG_SIZE, max(key)), conf=conf, verbose=False, augment=False)
+            prof.note("tta_share_est", round(max(0.0, 1 - prof.times["tta_probe"] / t_tta), 3) if t_tta else None)
+        calls += 1
+        prof.count("model_calls")
+        with prof.stage("remap"):
+            for (idx, tile), res in zip(items, res_list):
+                results[idx] = map_tile_result(plan[idx], res, pad)
+                prof.count("raw_boxes", len(results[idx][0]))
+
+    # 2) 스케일별로 확대 이미지에서 타일을 잘라 같은 모양끼리 배치로 묶음
+    idx = 0
+    for s in grid["scales"]:
+        with prof.stage("resize"):
+            up = None if lazy else scaled_image(img_bgr, s)
+        while idx < len(plan) and plan[idx][0] == s:
+            _, Hs, Ws, (x0, y0, x1, y1) = plan[idx]
+            if not keep[idx]:
+                idx += 1; continue
+            if lazy:
+                with prof.stage("resize"):
+                    tile = scaled_tile(img_bgr, s, Hs, Ws, (x0, y0, x1, y1))
+            else:
+                tile = up[y0:y1, x0:x1]
+            with prof.stage("slice"):
+                if pad and tile.shape[:2] != (tile_size, tile_size):
+                    tile = cv2.copyMakeBorder(tile, 0, max(0, tile_size - tile.shape[0]), 0,
+                                              max(0, tile_size - tile.shape[1]), cv2.BORDER_CONSTANT)
+                elif tile.base is not None:
+                    tile = tile.copy()  # 뷰는 복사해 두어야 확대 이미지를 스케일이 끝나면 바로 해제 가능
+            key = tile.shape[:2]
+            groups.setdefault(key, []).append((idx, tile))
+            if len(groups[key]) >= batch:
+                run(key)
+            idx += 1
+        del up
+    for key in list(groups):
+        run(key)
+
+    all_boxes, all_scores = [], []
+    for r in results:
+        if r is None: continue  # 사전 검사에서 건너뛴 타일
+        all_boxes.extend(r[0]); all_scores.extend(r[1])
+    merge = wbf_merge_fast if FAST_WBF else wbf_merge
+    with prof.stage("wbf"):
+        merged_boxes, merged_scores = merge(all_boxes, all_scores, iou_thr=WBF_IOU)
+    prof.count("merged_boxes", len(merged_boxes))
+
+    if stats is not None:
+        dt = time.perf_counter() - t0
+        done = sum(keep)
+        stats.update(tiles=len(plan), skipped=len(plan) - done, model_calls=calls, seconds=dt,
+                     tiles_per_sec=done / dt if dt > 0 else 0.0, grid=grid, grid_info=info)
     return merged_boxes, merged_scores
 
+def annotate(img, boxes):
+    out = np.array(img)  # mmap(.npy) 입력이어도 메모리 복사본에 그림
+    draw_head_circles(out, boxes)
+    cv2.putText(out, f"People: {len(boxes)}", (20, 40),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.1, (0, 0, 255), 3, cv2.LINE_AA)
+    return out
+
+def output_path(img_path):
+    root, ext = os.path.splitext(img_path)
+    save_ext = ext if ext.lower() in [".jpg",".jpeg",".png",".bmp"] else ".jpg"
+    return f"{root}_out{save_ext}"
+
+def config_dict(conf):
+    """결과 재현에 필요한 설정값 (ADAPTIVE 면 이미지별 격자는 결과 쪽 grid 에 기록)"""
+    return dict(conf=conf, model=MODEL_PATH, IMG_SIZE=IMG_SIZE, TILE_SIZE=TILE_SIZE, OVERLAP=OVERLAP,
+                USE_TTA=USE_TTA, MULTI_SCALES=MULTI_SCALES, WBF_IOU=WBF_IOU, PRESCREEN=PRESCREEN,
+                ADAPTIVE=ADAPTIVE, SCREEN_MODEL=SCREEN_MODEL, MIN_PERSON_PX=MIN_PERSON_PX)
+
 def main():
     if len(sys.argv) < 2:
         print(f"사용법: python {os.path.basename(__file__)} <이미지경로> [conf(기본={DEFAULT_CONF})]")
@@ -133,27 +439,53 @@ def main():
     img_path = sys.argv[1]
     conf = float(sys.argv[2]) if len(sys.argv) >= 3 else DEFAULT_CONF
 
-    img = cv2.imread(img_path)
+    img = load_image(img_path)
     if img is None:
         print("이미지 로드 실패:", img_path); sys.exit(1)
 
-    model = YOLO(MODEL_PATH)
-    boxes, scores = multi_scale_inference(model, img, conf)
+    prof = StageProfiler() if PROFILE else None
+    if CPROFILE:
+        import cProfile
+        cprof = cProfile.Profile(); cprof.enable()
 
-    out = img.copy()
-    draw_head_circles(out, boxes)
-    count = len(boxes)
-    cv2.putText(out, f"People: {count}", (20, 40),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.1, (0, 0, 255), 3, cv2.LINE_AA)
+    from ultralytics import YOLO
+    with (prof or NULL_PROFILER).stage("model_load"):
+        model = YOLO(MODEL_PATH) if PROCESS_WORKERS <= 0 else None
+    stats = {}
+    if PROCESS_WORKERS > 0:
+        from mp_infer import ProcessTileRunner
+        runner = ProcessTileRunner(PROCESS_WORKERS, WORKER_THREADS)
+        screen_model = load_screen_model()
+        boxes, scores = runner.infer(img, conf, screen_model=screen_model, stats=stats, prof=prof)
+        runner.close()
+    elif BATCH_TILES:
+        screen_model = load_screen_model()
+        boxes, scores = batched_multi_scale_inference(model, img, conf, screen_model=screen_model, stats=stats,
+                                                      prof=prof)
+    else:
+        boxes, scores = multi_scale_inference(model, img, conf)
 
-    root, ext = os.path.splitext(img_path)
-    save_ext = ext if ext.lower() in [".jpg",".jpeg",".png",".bmp"] else ".jpg"
-    out_path = f"{root}_out{save_ext}"
-    cv2.imwrite(out_path, out)
+    count = len(boxes)
+    out_path = output_path(img_path)
+    with (prof or NULL_PROFILER).stage("save"):
+        cv2.imwrite(out_path, annotate(img, boxes))
 
     print("사람 수:", count)
     print("저장:", out_path)
+    if stats:
+        print(f"타일 {stats['tiles']}개 (건너뜀 {stats['skipped']}개), 모델 호출 {stats['model_calls']}회, "
+              f"{stats['tiles_per_sec']:.2f} tiles/s")
+        if stats.get("grid_info"):
+            print(format_grid(stats["grid"], stats["grid_info"]))
     print(f"conf={conf}, model={MODEL_PATH}, imgsz={IMG_SIZE}, tile={TILE_SIZE}, overlap={OVERLAP}, TTA={USE_TTA}, scales={MULTI_SCALES}, WBF_IOU={WBF_IOU}")
 
+    root = os.path.splitext(img_path)[0]
+    if prof is not None:
+        prof.print_report()
+        print("시간 리포트:", prof.write(f"{root}_timing.json", config=config_dict(conf), image=img_path))
+    if CPROFILE:
+        cprof.disable(); cprof.dump_stats(f"{root}_out.prof")
+        print("cProfile:", f"{root}_out.prof")
+
 if __name__ == "__main__":
     main()
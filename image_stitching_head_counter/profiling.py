@@ -0,0 +1,95 @@
+import os, sys, json, time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# ====== 단계별 시간/카운터 계측 ======
+# prof.stage("model") 으로 감싼 구간의 누적 시간, prof.count("raw_boxes", n) 카운터,
+# 최대 RSS 를 모아 JSON 리포트로 저장 (TILE_SIZE/OVERLAP/MULTI_SCALES 조정용)
+# ====================================
+
+
+def peak_rss_mb():
+    """프로세스 최대 상주 메모리(MB). 측정할 수 없으면 None"""
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PMC(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        pmc = PMC(); pmc.cb = ctypes.sizeof(PMC)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(pmc), pmc.cb):
+            return None
+        return pmc.PeakWorkingSetSize / 2**20
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10  # macOS 는 바이트, 리눅스는 KB
+
+
+class StageProfiler:
+    def __init__(self):
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.notes = {}
+        self.t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - t
+            self.calls[name] += 1
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def note(self, name, value):
+        self.notes[name] = value
+
+    def report(self):
+        wall = time.perf_counter() - self.t0
+        stages = {k: dict(seconds=round(v, 4), calls=self.calls[k], share=round(v / wall, 4) if wall else 0.0)
+                  for k, v in sorted(self.times.items(), key=lambda kv: -kv[1])}
+        rss = peak_rss_mb()
+        return dict(wall_s=round(wall, 4), stages=stages, counters=dict(self.counters), notes=self.notes,
+                    peak_rss_mb=None if rss is None else round(rss, 1))
+
+    def print_report(self):
+        rep = self.report()
+        print(f"------ 단계별 시간 (전체 {rep['wall_s']:.2f}s, 최대 RSS {rep['peak_rss_mb']} MB) ------")
+        for name, st in rep["stages"].items():
+            print(f"{name:>10}: {st['seconds']:8.3f}s  {100 * st['share']:5.1f}%  ({st['calls']}회)")
+        for name, n in list(rep["counters"].items()) + list(rep["notes"].items()):
+            print(f"{name:>10}: {n}")
+
+    def write(self, path, **extra):
+        rep = self.report(); rep.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rep, f, ensure_ascii=False, indent=1)
+        return path
+
+
+class NullProfiler:
+    """계측을 끈 경우: 호출부에서 if 없이 쓰도록 아무것도 하지 않음"""
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def count(self, name, n=1):
+        pass
+
+    def note(self, name, value):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,66 @@
+import time
+import random
+import argparse
+
+from latexhwpconverter import convert_latex_to_hwp, convert_latex_to_hwp_regex
+
+# -------------------------
+# 변환 벤치마크: 기존 정규식 치환 vs 토크나이저/파서
+#   python bench_convert.py --terms 100 1000 5000 --depths 5 20 100
+# -------------------------
+TERMS = [
+    r"\frac{a_{i}}{b^{2}}", r"\sqrt{x^{2}+1}", r"\alpha x^2", r"\int_{0}^{1} f(x)\,dx",
+    r"\sum_{k=1}^{n} k", r"\vec{v}", r"\left( \frac{M}{2\pi R\,T} \right)^{3/2}", r"\sqrt[3]{y}",
+]
+
+
+def long_formula(n, seed=0):
+    """짧은 항 n개를 + 로 이은 긴 수식"""
+    rng = random.Random(seed)
+    return " + ".join(rng.choice(TERMS) for _ in range(n))
+
+
+def nested_formula(depth, seed=0):
+    """\\frac / \\sqrt / { } 가 depth 단계 중첩된 수식"""
+    rng = random.Random(seed)
+    expr = "x"
+    for i in range(depth):
+        kind = rng.randrange(3)
+        if kind == 0:
+            expr = rf"\frac{{{expr}}}{{y_{{{i}}}}}"
+        elif kind == 1:
+            expr = rf"\frac{{a}}{{{expr} + 1}}"
+        else:
+            expr = rf"\sqrt{{{expr}}}"
+    return expr
+
+
+def timed(fn, arg, repeat=3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    ap = argparse.ArgumentParser(description="LaTeX → HWP 변환 벤치마크 (정규식 vs 파서)")
+    ap.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--depths", type=int, nargs="+", default=[5, 20, 50, 150])
+    ap.add_argument("--regex-max", type=int, default=5000, help="정규식 방식을 돌릴 최대 항 수")
+    args = ap.parse_args()
+
+    print(f"{'input':>14} {'chars':>8} {'regex(s)':>10} {'parser(s)':>10} {'speedup':>8}  same")
+    cases = [(f"long {n}", long_formula(n), n <= args.regex_max) for n in args.terms]
+    cases += [(f"nested {d}", nested_formula(d), True) for d in args.depths]
+    for name, src, run_regex in cases:
+        new, t_new = timed(convert_latex_to_hwp, src)
+        if run_regex:
+            old, t_old = timed(convert_latex_to_hwp_regex, src, repeat=1)
+            print(f"{name:>14} {len(src):8d} {t_old:10.4f} {t_new:10.4f} {t_old / t_new:7.1f}x  {old == new}")
+        else:
+            print(f"{name:>14} {len(src):8d} {'-':>10} {t_new:10.4f} {'-':>8}  -")
+
+if __name__ == "__main__":
+    main()
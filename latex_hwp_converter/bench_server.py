@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import statistics
+import subprocess
+
+from bench_convert import TERMS
+from latex_server import Client, make_server, warm_up
+
+# -------------------------
+# 지연 시간 벤치마크: 수식마다 새 파이썬 프로세스 (cold) vs 떠 있는 변환 서버 (warm)
+#   python bench_server.py --cold 20 --warm 2000 --batch 1 100 --clients 1 8
+# -------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+COLD_CMD = ("import sys; from latexhwpconverter import convert_latex_to_hwp; "
+            "print(convert_latex_to_hwp(sys.argv[1]))")
+
+
+def formulas(n, seed=0):
+    rng = random.Random(seed)
+    return [" + ".join(rng.choice(TERMS) for _ in range(rng.randint(1, 4))) for _ in range(n)]
+
+
+def summary(lat_s):
+    ms = sorted(x * 1000 for x in lat_s)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    return f"median {statistics.median(ms):8.3f} ms  p95 {p95:8.3f} ms"
+
+
+def bench_cold(exprs):
+    """수식마다 python 을 새로 띄워 변환 (편집기가 지금 하는 방식)"""
+    lat = []
+    for e in exprs:
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", COLD_CMD, e], cwd=HERE, check=True, capture_output=True)
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+
+def bench_warm(exprs, port, batch, clients):
+    """clients 개 스레드가 각자 연결 하나로 batch 개씩 요청. 요청 1번당 지연 목록과 전체 시간"""
+    lat, lock = [], threading.Lock()
+    chunks = [exprs[i:i + batch] for i in range(0, len(exprs), batch)]
+
+    def worker(part):
+        c = Client(port=port)
+        mine = []
+        for chunk in part:
+            t0 = time.perf_counter()
+            c.convert(chunk)
+            mine.append(time.perf_counter() - t0)
+        c.close()
+        with lock:
+            lat.extend(mine)
+
+    threads = [threading.Thread(target=worker, args=(chunks[k::clients],)) for k in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return lat, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="cold(프로세스 새로 실행) vs warm(변환 서버) 지연 시간")
+    ap.add_argument("--cold", type=int, default=20, help="cold 실행 횟수")
+    ap.add_argument("--warm", type=int, default=2000, help="warm 서버로 보낼 수식 수")
+    ap.add_argument("--batch", type=int, nargs="+", default=[1, 100])
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 8])
+    args = ap.parse_args()
+
+    exprs = formulas(args.warm)
+    cold = bench_cold(exprs[:args.cold])
+    print(f"{'cold (1 수식/프로세스)':<28} {summary(cold)}")
+
+    warm_up()
+    server = make_server(port=0)  # 빈 포트
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    first = None
+    try:
+        for batch in args.batch:
+            for clients in args.clients:
+                lat, total = bench_warm(exprs, port, batch, clients)
+                first = first or lat
+                name = f"warm batch {batch} x{clients}"
+                print(f"{name:<28} {summary(lat)}  ({len(exprs) / total:9.0f} 수식/초)")
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(f"요청 1번 지연: cold 가 warm(batch {args.batch[0]}) 보다 "
+          f"{statistics.median(cold) / statistics.median(first):.0f}배 느림")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import os
+import re
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from latexhwpconverter import convert_cached
+from latex_rules import load_rules
+
+# -------------------------
+# 문서 일괄 변환 (.tex / .md)
+#   $...$, $$...$$, \[...\], \(...\) 안의 수식만 HWP 수식으로 바꾸고 나머지는 그대로 복사
+#   파일을 CHUNK 글자씩 읽고 바로 써서 메모리 사용량이 파일 크기와 무관 (RAM 보다 큰 파일 가능)
+#   같은 수식은 LRU 캐시(convert_cached)에서 꺼냄, --workers N 이면 프로세스 N개로 변환
+#
+#   python latex_document.py 문제집.tex                 → 문제집_hwp.tex
+#   python latex_document.py notes.md -o out.md --workers 4
+#   python latex_document.py 문제집.tex --rules 내규칙.json   (기호/악센트 규칙 추가)
+# -------------------------
+CHUNK = 1 << 20          # 한 번에 읽는 글자 수
+MAX_SPAN = 1 << 16       # 수식 하나의 최대 길이 (닫는 기호가 이보다 멀면 여는 기호를 글자로 봄)
+BATCH = 2000             # 멀티프로세스 작업 1개당 수식 수
+MAX_IN_FLIGHT = 4        # 워커당 동시에 걸어 두는 작업 수 (메모리 제한)
+OUTPUT_SUFFIX = "_hwp"
+
+# 여는 기호: 앞쪽 대안이 우선 (\\, \$ 같은 이스케이프는 글자로 넘김)
+_OPEN = {
+    "tex": re.compile(r"\\\\|\\[$%]|%|\$\$|\$|\\\[|\\\("),
+    "md":  re.compile(r"\\\\|\\\$|```|`|\$\$|\$|\\\[|\\\("),
+}
+_CLOSE = {
+    "$$": re.compile(r"(?<!\\)\$\$"),
+    "$": re.compile(r"(?<!\\)\$"),
+    "\\[": re.compile(r"\\\]"),
+    "\\(": re.compile(r"\\\)"),
+    "%": re.compile(r"\n"),        # .tex 주석: 줄 끝까지 그대로
+    "```": re.compile(r"```"),     # .md 코드 블록/코드: 그대로
+    "`": re.compile(r"`"),
+}
+_ESCAPES = {"\\\\", "\\$", "\\%"}
+_MATH = {"$$": "$$", "$": "$", "\\[": "\\]", "\\(": "\\)"}
+_INLINE = {"$", "\\("}   # 인라인 수식은 빈 줄(문단)을 넘지 않음
+
+
+def doc_mode(path):
+    return "md" if path.lower().endswith((".md", ".markdown")) else "tex"
+
+
+def iter_segments(f, mode="tex", chunk=CHUNK, max_span=MAX_SPAN):
+    """
+    텍스트 스트림 f 를 ("text", 문자열) / ("math", 여는 기호, 수식, 닫는 기호) 로 차례로 나눔
+    버퍼에는 CHUNK + MAX_SPAN 글자 정도만 남김
+    """
+    opener = _OPEN[mode]
+    buf, pos, eof = "", 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        data = f.read(chunk)
+        if not data:
+            eof = True
+        buf = buf[pos:] + data
+        pos = 0
+
+    more()
+    while True:
+        m = opener.search(buf, pos)
+        # 버퍼 끝에 걸친 기호("$" 다음이 "$" 인지 등)는 더 읽고 다시 판단
+        if not eof and (m is None or m.end() >= len(buf) - 2):
+            cut = len(buf) - 2 if m is None else m.start()
+            while m is None and cut > pos and buf[cut - 1] == "\\":  # \\ 쌍을 가르지 않게
+                cut -= 1
+            if cut > pos:
+                yield ("text", buf[pos:cut]); pos = cut
+            more(); continue
+        if m is None:
+            if pos < len(buf):
+                yield ("text", buf[pos:])
+            return
+        tok = m.group()
+        if tok in _ESCAPES:
+            if m.end() > pos:
+                yield ("text", buf[pos:m.end()])
+            pos = m.end(); continue
+        c = _CLOSE[tok].search(buf, m.end())
+        if c is None and not eof and len(buf) - m.start() < max_span:
+            if m.start() > pos:
+                yield ("text", buf[pos:m.start()]); pos = m.start()
+            more(); continue
+        body = buf[m.end():c.start()] if c else None
+        if c is None or len(body) > max_span or (tok in _INLINE and "\n\n" in body):
+            # 닫히지 않은 기호는 글자로 두고 그 다음부터 계속
+            yield ("text", buf[pos:m.end()]); pos = m.end(); continue
+        if m.start() > pos:
+            yield ("text", buf[pos:m.start()])
+        if tok in _MATH:
+            yield ("math", tok, body, c.group())
+        else:
+            yield ("text", buf[m.start():c.end()])  # 주석/코드는 그대로
+        pos = c.end()
+
+
+def convert_one(expr):
+    """변환 실패(중첩 한도 초과 등) 시 None"""
+    try:
+        return convert_cached(expr)
+    except (ValueError, RecursionError):
+        return None
+
+
+def use_rules(paths):
+    """추가 규칙 파일 적용 (워커 프로세스 initializer 로도 사용), 이전 변환 캐시는 load_rules 가 비움"""
+    for path in paths or ():
+        load_rules(path)
+
+
+def _convert_batch(exprs):
+    return [convert_one(e) for e in exprs]
+
+
+def _math_out(seg, hwp, keep_delims):
+    _, open_, body, close = seg
+    if hwp is None:
+        return open_ + body + close  # 변환 실패 시 원문 유지
+    return open_ + hwp + close if keep_delims else hwp
+
+
+def convert_stream(fin, fout, mode="tex", workers=0, keep_delims=True, batch=BATCH, rules=None):
+    """fin 의 수식을 변환해 fout 에 바로 씀. 통계 dict 반환 (rules: 워커에서도 읽을 추가 규칙 파일들)"""
+    stats = dict(formulas=0, errors=0, chars=0)
+    t0 = time.perf_counter()
+    before = convert_cached.cache_info()
+
+    def write(segs, outs):
+        k = 0
+        for seg in segs:
+            if seg[0] == "text":
+                fout.write(seg[1])
+            else:
+                hwp = outs[k]; k += 1
+                stats["formulas"] += 1
+                stats["errors"] += hwp is None
+                fout.write(_math_out(seg, hwp, keep_delims))
+
+    if workers <= 0:
+        for seg in iter_segments(fin, mode):
+            stats["chars"] += len(seg[1]) if seg[0] == "text" else len(seg[2])
+            write([seg], [] if seg[0] == "text" else [convert_one(seg[2])])
+    else:
+        # 구간을 batch 개 수식 단위로 묶어 워커에 보내고, 보낸 순서대로 씀
+        pending = deque()
+        with ProcessPoolExecutor(workers, initializer=use_rules, initargs=(rules,)) as pool:
+            segs, exprs, held = [], [], 0
+            for seg in iter_segments(fin, mode):
+                n = len(seg[1]) if seg[0] == "text" else len(seg[2])
+                stats["chars"] += n; held += n
+                segs.append(seg)
+                if seg[0] == "math":
+                    exprs.append(seg[2])
+                # 수식이 드문 긴 본문도 CHUNK 글자마다 내보내 메모리를 묶어 둠
+                if len(exprs) >= batch or held >= CHUNK:
+                    pending.append((segs, pool.submit(_convert_batch, exprs)))
+                    segs, exprs, held = [], [], 0
+                    while len(pending) >= workers * MAX_IN_FLIGHT:
+                        s, fut = pending.popleft(); write(s, fut.result())
+            pending.append((segs, pool.submit(_convert_batch, exprs)))
+            while pending:
+                s, fut = pending.popleft(); write(s, fut.result())
+
+    dt = time.perf_counter() - t0
+    after = convert_cached.cache_info()
+    stats.update(seconds=dt, formulas_per_sec=stats["formulas"] / dt if dt > 0 else 0.0)
+    if workers <= 0:  # 워커 캐시는 프로세스마다 따로라 부모에서는 셀 수 없음
+        stats.update(cache_hits=after.hits - before.hits, cache_misses=after.misses - before.misses)
+    return stats
+
+
+def output_path(path):
+    root, ext = os.path.splitext(path)
+    return root + OUTPUT_SUFFIX + ext
+
+
+def convert_file(in_path, out_path=None, workers=0, keep_delims=True, mode=None, rules=None):
+    out_path = out_path or output_path(in_path)
+    with open(in_path, encoding="utf-8", newline="") as fin, \
+         open(out_path, "w", encoding="utf-8", newline="") as fout:
+        stats = convert_stream(fin, fout, mode or doc_mode(in_path), workers, keep_delims, rules=rules)
+    stats["output"] = out_path
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description=".tex / .md 문서의 수식을 HWP 수식으로 일괄 변환")
+    ap.add_argument("inputs", nargs="+", help="입력 파일 (.tex / .md)")
+    ap.add_argument("-o", "--output", default=None, help="출력 파일 (입력이 1개일 때만, 기본: 이름_hwp.확장자)")
+    ap.add_argument("--workers", type=int, default=0, help=">0 이면 프로세스 N개로 변환")
+    ap.add_argument("--strip-delims", action="store_true", help="$ \\[ 같은 수식 기호를 빼고 HWP 수식만 남김")
+    ap.add_argument("--mode", choices=["tex", "md"], default=None, help="기본: 확장자로 판단")
+    ap.add_argument("--rules", nargs="+", default=None, help="추가 규칙 JSON 파일 (latex_rules.py 참고)")
+    args = ap.parse_args()
+    if args.output and len(args.inputs) > 1:
+        print("-o 는 입력 파일이 1개일 때만 쓸 수 있습니다."); sys.exit(1)
+    use_rules(args.rules)
+
+    total = dict(formulas=0, seconds=0.0)
+    for path in args.inputs:
+        st = convert_file(path, args.output, args.workers, not args.strip_delims, args.mode, args.rules)
+        total["formulas"] += st["formulas"]; total["seconds"] += st["seconds"]
+        cache = f", 캐시 적중 {st['cache_hits']}회" if "cache_hits" in st else ""
+        print(f"{path} → {st['output']}: 수식 {st['formulas']}개 (실패 {st['errors']}개{cache}), "
+              f"{st['seconds']:.2f}s, {st['formulas_per_sec']:.0f} 수식/초")
+    if len(args.inputs) > 1 and total["seconds"] > 0:
+        print(f"합계: 수식 {total['formulas']}개, {total['formulas'] / total['seconds']:.0f} 수식/초")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import re
+
+from latex_rules import RULES  # 기호/악센트/띄어쓰기/환경 규칙표 (JSON 으로 추가 가능)
+
+# -------------------------
+# LaTeX 수식 → 토큰 → AST → HWP 수식 스크립트
+#   정규식 치환을 여러 번 거치지 않고 한 번 훑어서 변환 (중첩 { } 도 정확히 처리)
+#
+#   AST 노드 (튜플)
+#     ("text", s) / ("space", s) / ("cmd", 이름)
+#     ("group", [노드...])                 { ... }
+#     ("frac", 분자, 분모)                  \frac{a}{b}
+#     ("sqrt", 지수 또는 None, 본문)        \sqrt[n]{x}
+#     ("accent", 이름, 본문)                \vec{v}
+#     ("sup", 노드) / ("sub", 노드)         ^x, _x (앞 노드에 붙음)
+#     ("env", 이름, [[셀 노드 목록, ...], ...])   \begin{pmatrix} ... \end{pmatrix}
+# -------------------------
+MAX_DEPTH = 200   # { } / 인자 중첩 한도 (넘으면 ValueError), 기본 재귀 한도(1000) 안에서 처리되는 깊이
+
+_TOKEN = re.compile(r"""
+    \\begin\s*\{(?P<begin>[A-Za-z]+\*?)\}
+  | \\end\s*\{(?P<end>[A-Za-z]+\*?)\}
+  | \\(?P<cmd>[A-Za-z]+|.)
+  | (?P<space>\s+)
+  | (?P<sym>[{}^_&\[\]])
+  | (?P<text>[^\\{}^_&\[\]\s]+)
+""", re.X | re.S)
+
+
+def tokenize(src):
+    """[(종류, 값), ...] 종류: begin / end / cmd / space / sym / text"""
+    tokens = []
+    for m in _TOKEN.finditer(src):
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+    return tokens
+
+
+class Parser:
+    """재귀 하강 파서: 토큰 목록을 한 번 훑어 AST(노드 목록) 생성"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def skip_space(self):
+        while self.pos < len(self.tokens) and self.tokens[self.pos][0] == "space":
+            self.pos += 1
+
+    def parse(self):
+        nodes = self.parse_seq(stop=None)
+        while self.pos < len(self.tokens):  # 짝 없는 } 는 글자로 두고 계속
+            self.pos += 1
+            nodes.append(("text", "}"))
+            nodes.extend(self.parse_seq(stop=None))
+        return nodes
+
+    def parse_seq(self, stop, env=None):
+        """
+        stop 기호("}" / "]") 또는 \\end{env} 직전까지 노드 목록
+        env 안에서는 & 와 \\\\ 를 ("sep", "&") / ("sep", "row") 로 남김
+        """
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ValueError(f"수식 중첩이 너무 깊습니다 (MAX_DEPTH={MAX_DEPTH}).")
+        nodes = []
+        while self.pos < len(self.tokens):
+            kind, val = self.tokens[self.pos]
+            if kind == "sym" and val == stop:
+                break
+            if kind == "sym" and val == "}" and stop is None:
+                break
+            if kind == "end":
+                if env is not None:
+                    break
+                self.pos += 1; continue  # 짝 없는 \end{...} 는 버림
+            if env is not None and kind == "sym" and val == "&":
+                self.pos += 1; nodes.append(("sep", "&")); continue
+            if env is not None and kind == "cmd" and val == "\\":
+                self.pos += 1; nodes.append(("sep", "row")); continue
+            if kind == "sym" and val in "^_":
+                self.pos += 1
+                nodes.append(("sup" if val == "^" else "sub", self.parse_arg()))
+                continue
+            nodes.extend(self.parse_atom())
+        self.depth -= 1
+        return nodes
+
+    def parse_group(self, close):
+        """여는 기호는 이미 소비됨. close 까지 읽고 닫는 기호 소비 (없으면 끝에서 닫음)"""
+        nodes = self.parse_seq(stop=close)
+        if self.pos < len(self.tokens):
+            self.pos += 1
+        return nodes
+
+    def parse_arg(self):
+        """명령 인자 1개: { } 묶음 또는 토큰 1개 (글자 묶음이면 첫 글자만)"""
+        self.skip_space()
+        kind, val = self.peek()
+        if kind is None:
+            return ("group", [])
+        if kind == "sym" and val == "{":
+            self.pos += 1
+            return ("group", self.parse_group("}"))
+        if kind == "text" and len(val) > 1:
+            self.tokens[self.pos] = ("text", val[1:])
+            return ("text", val[0])
+        atom = self.parse_atom()
+        return atom[0] if len(atom) == 1 else ("group", atom)
+
+    def parse_atom(self):
+        """토큰 1개(와 필요한 인자)를 노드 목록으로"""
+        kind, val = self.tokens[self.pos]
+        self.pos += 1
+        if kind == "sym" and val == "{":
+            return [("group", self.parse_group("}"))]
+        if kind == "begin":
+            return [self.parse_env(val)]
+        if kind == "cmd":
+            if val == "frac":
+                return [("frac", self.parse_arg(), self.parse_arg())]
+            if val == "sqrt":
+                self.skip_space()
+                index = None
+                if self.peek() == ("sym", "["):
+                    self.pos += 1
+                    index = ("group", self.parse_group("]"))
+                return [("sqrt", index, self.parse_arg())]
+            if val in RULES.accents:
+                return [("accent", val, self.parse_arg())]
+            if val in RULES.drop:
+                if self.peek() == ("text", "."):  # \left. 은 보이지 않는 괄호
+                    self.pos += 1
+                elif self.peek()[0] == "text" and len(self.peek()[1]) > 1 and self.peek()[1][0] == ".":
+                    self.tokens[self.pos] = ("text", self.peek()[1][1:])
+                return []
+            return [("cmd", val)]
+        return [(kind if kind in ("space", "text") else "text", val)]
+
+    def parse_env(self, name):
+        """\\begin{name} 다음부터 \\end{...} 까지 → ("env", name, rows)"""
+        nodes = self.parse_seq(stop=None, env=name)
+        if self.peek()[0] == "end":
+            self.pos += 1
+        rows, row, cell = [], [], []
+        for node in nodes:
+            if node[0] == "sep":
+                row.append(cell); cell = []
+                if node[1] == "row":
+                    rows.append(row); row = []
+            else:
+                cell.append(node)
+        if row or any(n[0] != "space" for n in cell):  # 마지막 \\ 뒤 빈 줄은 버림
+            row.append(cell); rows.append(row)
+        return ("env", name, rows)
+
+
+def parse(src):
+    return Parser(tokenize(src)).parse()
+
+
+# -------------------------
+# AST → HWP 수식 스크립트
+# -------------------------
+class Emitter:
+    """출력 조각을 리스트 하나에 모아 마지막에 한 번만 join (중첩이 깊어도 선형)"""
+
+    def __init__(self):
+        self.out = []
+
+    def put(self, s):
+        if not s:
+            return
+        # 명령어가 글자와 붙으면 (alphabeta) HWP 가 한 단어로 읽으므로 띄움
+        if self.out and self.out[-1][-1:].isalpha() and s[0].isalpha():
+            self.out.append(" ")
+        self.out.append(s)
+
+    def braced(self, node, open_="{", close="}"):
+        """{ 내용 } — 내용 양끝 공백은 제거"""
+        out = self.out
+        out.append(open_)
+        start = len(out)
+        self.nodes(node[1] if node[0] == "group" else [node])
+        while len(out) > start and not out[-1].strip():
+            out.pop()
+        if len(out) > start:
+            out[-1] = out[-1].rstrip()
+            k = start
+            while not out[k].strip():
+                k += 1
+            out[k] = out[k].lstrip()
+            del out[start:k]
+        out.append(close)
+
+    def nodes(self, nodes):
+        for node in nodes:
+            self.node(node)
+
+    def node(self, node):
+        kind = node[0]
+        if kind in ("text", "space"):
+            self.put(node[1])
+        elif kind == "cmd":
+            name = node[1]
+            word = RULES.symbols.get(name)
+            if word is not None:
+                self.put(word)
+            elif name in RULES.spaces:
+                self.out.append(RULES.spaces[name])
+            elif name == "\\":
+                self.out.append("#")
+            else:
+                self.put("\\" + name)  # 모르는 명령은 그대로
+        elif kind == "group":
+            self.braced(node)
+        elif kind == "frac":
+            self.braced(node[1])
+            self.out.append(" over ")
+            self.braced(node[2])
+        elif kind == "sqrt":
+            self.put("sqrt")
+            if node[1] is not None:
+                self.braced(node[1], "[", "]")
+            self.out.append(" ")
+            self.braced(node[2])
+        elif kind == "accent":
+            self.put(RULES.accents[node[1]])
+            self.out.append(" ")
+            self.braced(node[2])
+        elif kind in ("sup", "sub"):
+            self.out.append("^" if kind == "sup" else "_")
+            self.braced(node[1])
+        elif kind == "env":
+            self.put(RULES.envs.get(node[1], node[1]))
+            self.out.append("{")
+            for r, row in enumerate(node[2]):
+                if r: self.out.append("#")
+                for c, cell in enumerate(row):
+                    if c: self.out.append("&")
+                    self.braced(("group", cell))
+            self.out.append("}")
+
+
+def emit(nodes):
+    e = Emitter()
+    e.nodes(nodes)
+    return "".join(e.out)
+
+
+def latex_to_hwp(src):
+    """LaTeX 수식 문자열 → HWP 수식 스크립트 (한 번 훑는 파서)"""
+    return emit(parse(src.strip())).strip()
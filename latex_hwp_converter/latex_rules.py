@@ -0,0 +1,143 @@
+import os
+import re
+import json
+
+# -------------------------
+# LaTeX 명령 → HWP 수식 단어 규칙표
+#   symbols: 인자 없는 명령 (\alpha → alpha, \leq → <=)
+#   accents: 인자 1개를 받아 "단어 {인자}" 로 쓰는 명령 (\vec{v} → vec {v})
+#   spaces : 띄어쓰기 명령 (\, → `)
+#   envs   : \begin{이름} 환경 → HWP 행렬 이름 (표에 없으면 이름 그대로)
+#
+#   규칙 추가는 코드 수정 없이 JSON 파일로:
+#     {"symbols": {"degree": "DEG"}, "accents": {"overbrace": "overbrace"}}
+#   모듈 옆 hwp_rules.json 이 있으면 자동으로 읽고, load_rules(경로) 로 더 읽을 수 있음
+# -------------------------
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hwp_rules.json")
+
+_GREEK = ("alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu nu xi omicron pi rho "
+          "sigma tau upsilon phi chi psi omega").split()
+
+SYMBOLS = {g: g for g in _GREEK}
+SYMBOLS.update({g.capitalize(): g.upper() for g in _GREEK})   # \Gamma → GAMMA
+SYMBOLS.update({
+    "varepsilon": "epsilon", "vartheta": "vartheta", "varpi": "varpi", "varrho": "rho",
+    "varsigma": "varsigma", "varphi": "varphi",
+    # 큰 연산자 / 함수
+    "sum": "sum", "prod": "prod", "coprod": "coprod", "int": "int", "iint": "dint", "iiint": "tint",
+    "oint": "oint", "bigcup": "bigcup", "bigcap": "bigcap", "lim": "lim", "limsup": "limsup",
+    "liminf": "liminf", "max": "max", "min": "min", "sup": "sup", "det": "det",
+    "log": "log", "ln": "ln", "lg": "lg", "exp": "exp", "sin": "sin", "cos": "cos", "tan": "tan",
+    "cot": "cot", "sec": "sec", "csc": "csc", "arcsin": "arcsin", "arccos": "arccos", "arctan": "arctan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh", "gcd": "gcd", "mod": "mod", "bmod": "mod",
+    # 화살표
+    "to": "rarrow", "rightarrow": "rarrow", "leftarrow": "larrow", "gets": "larrow",
+    "leftrightarrow": "lrarrow", "Rightarrow": "RARROW", "Leftarrow": "LARROW",
+    "Leftrightarrow": "LRARROW", "implies": "RARROW", "impliedby": "LARROW", "iff": "LRARROW",
+    "uparrow": "uparrow", "downarrow": "downarrow", "updownarrow": "udarrow", "Uparrow": "UPARROW",
+    "Downarrow": "DOWNARROW", "Updownarrow": "UDARROW", "nearrow": "nearrow", "searrow": "searrow",
+    "nwarrow": "nwarrow", "swarrow": "swarrow", "mapsto": "mapsto", "longrightarrow": "rarrow",
+    "longleftarrow": "larrow", "Longrightarrow": "RARROW", "Longleftarrow": "LARROW",
+    # 관계
+    "leq": "<=", "le": "<=", "geq": ">=", "ge": ">=", "neq": "!=", "ne": "!=", "ll": "<<", "gg": ">>",
+    "approx": "approx", "equiv": "equiv", "sim": "sim", "simeq": "simeq", "cong": "cong",
+    "propto": "propto", "in": "in", "ni": "owns", "notin": "notin", "subset": "subset",
+    "supset": "supset", "subseteq": "subseteq", "supseteq": "supseteq", "perp": "bot",
+    "parallel": "parallel", "models": "models", "prec": "prec", "succ": "succ",
+    # 이항 연산 / 기타 기호
+    "times": "times", "div": "div", "pm": "+-", "mp": "-+", "cdot": "cdot", "cdots": "cdots",
+    "ldots": "ldots", "dots": "ldots", "vdots": "vdots", "ddots": "ddots", "circ": "circ", "ast": "ast",
+    "star": "star", "bullet": "bullet", "cup": "cup", "cap": "cap", "setminus": "setminus",
+    "vee": "vee", "wedge": "wedge", "oplus": "oplus", "otimes": "otimes", "neg": "neg", "lnot": "neg",
+    "infty": "inf", "partial": "partial", "nabla": "nabla", "forall": "forall", "exists": "exist",
+    "emptyset": "emptyset", "varnothing": "emptyset", "angle": "angle", "triangle": "triangle",
+    "therefore": "therefore", "because": "because", "prime": "prime", "hbar": "hbar", "ell": "ell",
+    "deg": "deg", "aleph": "aleph", "Re": "Re", "Im": "Im", "wp": "wp", "dagger": "dagger",
+    "lbrace": "lbrace", "rbrace": "rbrace", "{": "lbrace", "}": "rbrace", "langle": "langle",
+    "rangle": "rangle", "lfloor": "lfloor", "rfloor": "rfloor", "lceil": "lceil", "rceil": "rceil",
+    "|": "||", "%": "%",
+})
+
+ACCENTS = {
+    "dot": "dot", "ddot": "ddot", "bar": "bar", "hat": "hat", "vec": "vec", "tilde": "tilde",
+    "acute": "acute", "grave": "grave", "check": "check", "breve": "breve",
+    "overline": "overline", "underline": "under", "widehat": "hat", "widetilde": "tilde",
+    "overrightarrow": "vec", "overleftrightarrow": "dyad",
+    "mathrm": "rm", "mathbf": "bold", "mathit": "it", "operatorname": "rm",
+}
+SPACES = {",": "`", ";": "~", ":": "~", " ": "~", "!": "", "quad": "~~", "qquad": "~~~~"}
+ENVS = {"vmatrix": "dmatrix", "Vmatrix": "dmatrix", "cases": "cases", "array": "matrix"}
+DROP = {"left", "right", "displaystyle", "textstyle", "limits", "nolimits", "big", "Big", "bigg", "Bigg"}
+
+KINDS = ("symbols", "accents", "spaces", "envs")
+
+
+class RuleRegistry:
+    """규칙표 묶음. 파서는 dict 조회(O(1)), 정규식 방식은 표 전체를 대안 1개로 묶은 패턴 사용"""
+
+    def __init__(self):
+        self.symbols = dict(SYMBOLS)
+        self.accents = dict(ACCENTS)
+        self.spaces = dict(SPACES)
+        self.envs = dict(ENVS)
+        self.drop = set(DROP)
+        self._symbol_re = self._accent_re = None
+        self._on_change = []      # 규칙이 바뀌면 부를 함수 (변환 결과 캐시 비우기 등)
+
+    def on_change(self, fn):
+        """규칙이 바뀔 때마다 fn() 호출 (규칙표로 만든 결과를 캐시하는 쪽에서 등록)"""
+        self._on_change.append(fn)
+        return fn
+
+    def add(self, kind, mapping):
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 규칙 종류: {kind} (가능: {', '.join(KINDS)})")
+        getattr(self, kind).update(mapping)
+        self._symbol_re = self._accent_re = None  # 다음 사용 때 다시 컴파일
+        for fn in self._on_change:
+            fn()
+
+    def load(self, path):
+        """JSON 규칙 파일 {"symbols": {...}, "accents": {...}, ...} 을 기존 표에 덧붙임"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for kind, mapping in data.items():
+            self.add(kind, {k.lstrip("\\"): v for k, v in mapping.items()})
+        return self
+
+    def _alternation(self, names):
+        # 긴 이름 먼저 (\leftarrow 가 \le 보다 먼저), 글자 명령 뒤에 글자가 이어지면 다른 명령
+        words = sorted((n for n in names if n.isalpha()), key=len, reverse=True)
+        others = [re.escape(n) for n in names if not n.isalpha()]
+        alts = []
+        if words:
+            alts.append("(?:" + "|".join(words) + ")(?![A-Za-z])")
+        alts.extend(others)
+        return "|".join(alts)
+
+    @property
+    def symbol_re(self):
+        """\\(이름) 한 번에 찾는 패턴 (정규식 방식 convert_greek 용)"""
+        if self._symbol_re is None:
+            self._symbol_re = re.compile(r"\\(" + self._alternation(self.symbols) + ")")
+        return self._symbol_re
+
+    @property
+    def accent_re(self):
+        """\\이름{내용} (중첩 없는 내용) 패턴 (정규식 방식 convert_accents 용)"""
+        if self._accent_re is None:
+            self._accent_re = re.compile(r"\\(" + self._alternation(self.accents) + r")\s*{(.+?)}")
+        return self._accent_re
+
+    def sub_symbols(self, expr):
+        return self.symbol_re.sub(lambda m: self.symbols[m.group(1)], expr)
+
+
+RULES = RuleRegistry()
+if os.path.exists(RULES_FILE):
+    RULES.load(RULES_FILE)
+
+
+def load_rules(path):
+    """추가 규칙 파일을 전역 규칙표(RULES)에 덧붙임 (등록된 변환 캐시는 비워짐)"""
+    return RULES.load(path)
@@ -0,0 +1,253 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from latexhwpconverter import convert_cached
+from latex_document import convert_one, use_rules
+
+# -------------------------
+# 로컬 변환 서버: 프로세스 하나를 계속 띄워 두고 규칙/정규식/변환 캐시를 재사용
+#   수식마다 python latexhwpconverter.py 를 새로 돌리면 인터프리터 시작 + 컴파일 비용을 매번 냄
+#
+#   python latex_server.py serve                       → http://127.0.0.1:8765
+#   python latex_server.py serve --unix /tmp/hwp.sock  (리눅스/맥)
+#   python latex_server.py convert 수식.txt             → 한 줄에 수식 하나, 결과도 한 줄씩
+#   echo "\frac{a}{b}" | python latex_server.py convert
+#
+#   POST /convert  {"formulas": ["\\alpha", ...]}  →  {"results": ["alpha", ...]}  (실패는 null)
+#   GET  /health                                      →  요청 수, 캐시 적중 등
+# -------------------------
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BATCH = 10000          # 요청 하나에 받는 최대 수식 수
+MAX_BODY = 64 << 20        # 요청 본문 최대 바이트
+CLIENT_BATCH = 500         # 클라이언트가 한 번에 보내는 수식 수
+WARMUP = [r"\frac{a}{b}", r"\sqrt[3]{x^{2}}", r"\alpha_{i} \leq \vec{v}", r"\sum_{k=1}^{n} k",
+          r"\begin{pmatrix} 1 & 0 \\ 0 & 1 \end{pmatrix}"]
+
+
+def warm_up():
+    """규칙 패턴 컴파일, 파서 경로를 한 번씩 미리 돌려 둠 (캐시에는 남기지 않음)"""
+    from latexhwpconverter import convert_latex_to_hwp, convert_latex_to_hwp_regex
+    for expr in WARMUP:
+        convert_latex_to_hwp(expr)
+        convert_latex_to_hwp_regex(expr)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive: 클라이언트가 연결 하나로 계속 보냄
+
+    def setup(self):
+        # TCP 면 Nagle 끔: 헤더/본문을 따로 쓸 때 생기는 ~40ms 지연(Nagle + delayed ACK) 제거
+        self.disable_nagle_algorithm = self.request.family in (socket.AF_INET, socket.AF_INET6)
+        super().setup()
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def send_json(self, code, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self.send_json(404, {"error": "not found"})
+        info = convert_cached.cache_info()
+        with self.server.lock:
+            stats = dict(self.server.stats)
+        stats.update(uptime_s=round(time.time() - self.server.started, 1), cache_hits=info.hits,
+                     cache_misses=info.misses, cache_size=info.currsize)
+        self.send_json(200, stats)
+
+    def do_POST(self):
+        if self.path != "/convert":
+            return self.send_json(404, {"error": "not found"})
+        n = int(self.headers.get("Content-Length") or 0)
+        if n > MAX_BODY:
+            self.close_connection = True
+            return self.send_json(413, {"error": f"본문이 너무 큽니다 (최대 {MAX_BODY} 바이트)"})
+        try:
+            formulas = json.loads(self.rfile.read(n) or b"{}")["formulas"]
+            if not isinstance(formulas, list) or not all(isinstance(f, str) for f in formulas):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return self.send_json(400, {"error": '{"formulas": [문자열, ...]} 형식이어야 합니다'})
+        if len(formulas) > MAX_BATCH:
+            return self.send_json(413, {"error": f"한 번에 최대 {MAX_BATCH}개"})
+        t0 = time.perf_counter()
+        results = [convert_one(f) for f in formulas]
+        dt = time.perf_counter() - t0
+        with self.server.lock:
+            st = self.server.stats
+            st["requests"] += 1
+            st["formulas"] += len(formulas)
+            st["errors"] += sum(r is None for r in results)
+            st["busy_s"] += dt
+        self.send_json(200, {"results": results, "seconds": dt})
+
+
+class _Server:
+    """TCP / 유닉스 소켓 서버 공통 상태"""
+    daemon_threads = True
+    request_queue_size = 128   # 동시에 몰리는 연결 (기본 5 면 편집기 여러 개에서 끊김)
+
+    def setup_state(self, verbose):
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.stats = dict(requests=0, formulas=0, errors=0, busy_s=0.0)
+
+
+class TCPServer(_Server, ThreadingHTTPServer):
+    pass
+
+
+if hasattr(socket, "AF_UNIX"):
+    class UnixServer(_Server, socketserver.ThreadingUnixStreamServer):
+        def server_bind(self):
+            if os.path.exists(self.server_address):
+                os.unlink(self.server_address)  # 이전 실행이 남긴 소켓 파일
+            super().server_bind()
+
+
+def make_server(host=HOST, port=PORT, unix=None, verbose=False):
+    """unix 경로를 주면 유닉스 소켓, 아니면 host:port (port=0 이면 빈 포트 자동)"""
+    if unix:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("이 OS 는 유닉스 소켓을 지원하지 않습니다. --port 를 쓰세요.")
+        server = UnixServer(unix, Handler)
+    else:
+        server = TCPServer((host, port), Handler)
+    server.setup_state(verbose)
+    return server
+
+
+def serve(host=HOST, port=PORT, unix=None, rules=None, verbose=False):
+    use_rules(rules)
+    warm_up()
+    server = make_server(host, port, unix, verbose)
+    where = unix or "http://%s:%d" % server.server_address[:2]
+    print(f"LaTeX → HWP 변환 서버: {where} (Ctrl+C 로 종료)", flush=True)
+
+    def stop(*_):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, stop)  # kill 로 끝내도 소켓 파일 정리
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix and os.path.exists(unix):
+            os.unlink(unix)
+
+
+# -------------------------
+# 클라이언트
+# -------------------------
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class Client:
+    """연결 하나를 유지하며 수식 묶음을 보내는 클라이언트 (스레드마다 하나씩 사용)"""
+
+    def __init__(self, host=HOST, port=PORT, unix=None, timeout=30):
+        self.conn = _UnixConnection(unix, timeout) if unix else http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.conn.request(method, path, body=body, headers=headers)
+        resp = self.conn.getresponse()
+        data = json.loads(resp.read())
+        if resp.status != 200:
+            raise RuntimeError(f"서버 오류 {resp.status}: {data.get('error')}")
+        return data
+
+    def convert(self, formulas):
+        """수식 리스트 → 결과 리스트 (실패는 None)"""
+        body = json.dumps({"formulas": list(formulas)}, ensure_ascii=False).encode("utf-8")
+        return self._request("POST", "/convert", body)["results"]
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def close(self):
+        self.conn.close()
+
+
+def stream_convert(client, lines, batch=CLIENT_BATCH):
+    """수식 줄을 batch 개씩 보내며 결과를 차례로 yield (입력 전체를 메모리에 올리지 않음)"""
+    buf = []
+    for line in lines:
+        buf.append(line.rstrip("\r\n"))
+        if len(buf) >= batch:
+            yield from client.convert(buf)
+            buf = []
+    if buf:
+        yield from client.convert(buf)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="LaTeX → HWP 로컬 변환 서버 / 클라이언트")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("serve", "convert", "health"):
+        p = sub.add_parser(name)
+        p.add_argument("--host", default=HOST)
+        p.add_argument("--port", type=int, default=PORT)
+        p.add_argument("--unix", default=None, help="유닉스 소켓 경로 (주면 host/port 대신 사용)")
+    sp = sub.choices["serve"]
+    sp.add_argument("--rules", nargs="+", default=None, help="추가 규칙 JSON 파일")
+    sp.add_argument("--verbose", action="store_true", help="요청마다 로그 출력")
+    cp = sub.choices["convert"]
+    cp.add_argument("inputs", nargs="*", help="한 줄에 수식 하나인 파일 (없으면 표준입력)")
+    cp.add_argument("--batch", type=int, default=CLIENT_BATCH)
+    args = ap.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.host, args.port, args.unix, args.rules, args.verbose)
+        return
+    client = Client(args.host, args.port, args.unix)
+    try:
+        if args.cmd == "health":
+            print(json.dumps(client.health(), ensure_ascii=False, indent=2))
+            return
+        if not args.inputs:
+            batch = 1 if sys.stdin.isatty() else args.batch  # 직접 입력하면 줄마다 바로 변환
+            for out in stream_convert(client, sys.stdin, batch):
+                print("" if out is None else out, flush=True)
+        for path in args.inputs:
+            with open(path, encoding="utf-8") as f:
+                for out in stream_convert(client, f, args.batch):
+                    print("" if out is None else out)
+    except (ConnectionRefusedError, FileNotFoundError, socket.timeout) as e:
+        print(f"서버에 연결할 수 없습니다 ({e}). 먼저 python latex_server.py serve 를 실행하세요.")
+        sys.exit(1)
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    main()
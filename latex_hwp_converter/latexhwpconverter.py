@@ -1,4 +1,8 @@
 import re
+from functools import lru_cache
+
+from latex_parser import latex_to_hwp  # 토크나이저 + 재귀 하강 파서
+from latex_rules import RULES
 
 # -------------------------
 # 공통: { } 감싸기
@@ -40,32 +44,25 @@ def convert_sqrt(expr):
     return expr
 
 # -------------------------
-# dot, ddot, bar, hat, vec
+# dot, ddot, bar, hat, vec ... (latex_rules.ACCENTS, 패턴 1개로 한 번에)
 # -------------------------
 def convert_accents(expr):
-    table = {
-        r'\\dot{(.+?)}': "dot",
-        r'\\ddot{(.+?)}': "ddot",
-        r'\\bar{(.+?)}': "bar",
-        r'\\hat{(.+?)}': "hat",
-        r'\\vec{(.+?)}': "vec",
-    }
-    for p, word in table.items():
-        expr = re.sub(p, lambda m: f"{word} {wrap(m.group(1))}", expr)
-    return expr
+    return RULES.accent_re.sub(lambda m: f"{RULES.accents[m.group(1)]} {wrap(m.group(2))}", expr)
 
 # -------------------------
 # integral, sum
 # -------------------------
+@lru_cache(maxsize=None)
+def _op_patterns(op):
+    # 연산자별 패턴은 처음 한 번만 컴파일
+    return re.compile(rf'\\{op}_{{(.+?)}}\\^{{(.+?)}}'), re.compile(rf'\\{op}')
+
 def convert_op(op, expr):
+    limits, bare = _op_patterns(op)
     # \op_{a}^{b}
-    expr = re.sub(
-        rf'\\{op}_{{(.+?)}}\\^{{(.+?)}}',
-        lambda m: f"{op} _{wrap(m.group(1))} ^{wrap(m.group(2))}",
-        expr,
-    )
+    expr = limits.sub(lambda m: f"{op} _{wrap(m.group(1))} ^{wrap(m.group(2))}", expr)
     # 단독 \op
-    expr = re.sub(rf'\\{op}', op, expr)
+    expr = bare.sub(op, expr)
     return expr
 
 # -------------------------
@@ -104,28 +101,11 @@ def clean(expr):
     return expr
 
 # -------------------------
-# 그리스 문자 변경(수동으로 추가 가능)
+# 그리스 문자, 연산자, 화살표, 관계 기호 (latex_rules.SYMBOLS, 패턴 1개로 한 번에)
+# 추가는 hwp_rules.json 또는 latex_rules.load_rules(경로)
 # -------------------------
 def convert_greek(expr):
-    greek_table = {
-        r'\alpha': 'alpha',
-        r'\beta': 'beta',
-        r'\gamma': 'gamma',
-        r'\delta': 'delta',
-        r'\epsilon': 'epsilon',
-        r'\theta': 'theta',
-        r'\lambda': 'lambda',
-        r'\mu': 'mu',
-        r'\nu': 'nu',
-        r'\pi': 'pi',
-        r'\rho': 'rho',
-        r'\sigma': 'sigma',
-        r'\phi': 'phi',
-        r'\omega': 'omega',
-    }
-    for k, v in greek_table.items():
-        expr = expr.replace(k, v)
-    return expr
+    return RULES.sub_symbols(expr)
 
 def convert_spaces(expr):
     return expr.replace(r'\,', '`') # latex에서 \,을 hwp에서 `으로 변경(반칸 띄기)
@@ -134,6 +114,20 @@ def convert_spaces(expr):
 # 메인
 # -------------------------
 def convert_latex_to_hwp(expr):
+    """LaTeX 수식 → HWP 수식 스크립트 (한 번 훑는 파서, 중첩 { } 처리)"""
+    return latex_to_hwp(expr)
+
+# 시험지처럼 같은 수식이 반복되는 문서/서버용: 변환 결과를 최근 CACHE_SIZE 개까지 보관
+CACHE_SIZE = 8192
+
+@lru_cache(maxsize=CACHE_SIZE)
+def convert_cached(expr):
+    return convert_latex_to_hwp(expr)
+
+RULES.on_change(convert_cached.cache_clear)  # load_rules 등으로 규칙이 바뀌면 이전 결과는 버림
+
+def convert_latex_to_hwp_regex(expr):
+    """기존 정규식 치환 방식 (비교/벤치마크용)"""
     expr = expr.strip()
     expr = clean(expr)
     expr = convert_matrix(expr)
@@ -162,4 +156,4 @@ P(v) = 4\pi \left( \frac{M}{2\pi R\,T} \right)^{3/2} v^2 e^{-Mv^2 / 2R\,T}
 
 
 """
-print(convert_latex_to_hwp(latex))
\ No newline at end of file
+    print(convert_latex_to_hwp(latex))
\ No newline at end of file
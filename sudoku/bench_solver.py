@@ -0,0 +1,85 @@
+import time
+import argparse
+import statistics
+import multiprocessing as mp
+
+from sudoku import solve
+from sudoku_solver import solve_fast, count_solutions, to_cells, to_grid
+
+# -------------------------
+# 솔버 벤치마크: 기존 solve() (무작위 백트래킹) vs solve_fast() (비트마스크 + 전파 + MRV)
+#   python bench_solver.py                        기본 17힌트 문제들
+#   python bench_solver.py --file 17clue.txt -n 1000 --old-timeout 5
+#   파일은 한 줄에 81글자 ('0' / '.' 빈칸)
+# -------------------------
+PUZZLES_17 = [
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+    "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+    "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    "000000000000003085001020000000507000004000100090000000500000073002010000000040009",
+]
+HARD = ["800000000003600000070090200050007000000045700000100030001000068008500010090000400"]  # 21힌트, 탐색이 깊음
+
+
+def load(path, n):
+    with open(path) as f:
+        lines = [ln.strip() for ln in f if len(ln.strip()) >= 81]
+    return lines[:n]
+
+
+def _old_worker(puzzle, q):
+    board = to_grid(to_cells(puzzle))
+    t0 = time.perf_counter()
+    ok = solve(board)
+    q.put((time.perf_counter() - t0, ok))
+
+
+# 기존 solve() 는 수십 초 이상 걸리는 문제가 있어 별도 프로세스에서 timeout 초까지만
+def time_old(puzzle, timeout):
+    q = mp.Queue()
+    p = mp.Process(target=_old_worker, args=(puzzle, q))
+    p.start()
+    p.join(timeout)
+    if p.is_alive():
+        p.terminate(); p.join()
+        return None
+    return q.get()[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="스도쿠 솔버 벤치마크 (기존 solve vs solve_fast)")
+    ap.add_argument("--file", default=None, help="문제 파일 (한 줄에 81글자)")
+    ap.add_argument("-n", type=int, default=1000, help="파일에서 읽을 최대 문제 수")
+    ap.add_argument("--old-timeout", type=float, default=10.0, help="기존 solve 문제당 제한 시간(초), 0 이면 생략")
+    args = ap.parse_args()
+    puzzles = load(args.file, args.n) if args.file else PUZZLES_17 + HARD
+
+    new_t, old_t, timeouts = [], [], 0
+    print(f"{'#':>4} {'clues':>5} {'fast(ms)':>10} {'old(ms)':>10}  unique")
+    for k, p in enumerate(puzzles):
+        t0 = time.perf_counter()
+        sol = solve_fast(p)
+        new_t.append(time.perf_counter() - t0)
+        unique = count_solutions(p, 2) == 1
+        assert sol is not None and all(a == b for a, b in zip(p, sol) if a not in "0."), "잘못된 해"
+        old = time_old(p, args.old_timeout) if args.old_timeout > 0 else None
+        if old is None and args.old_timeout > 0:
+            timeouts += 1
+        elif old is not None:
+            old_t.append(old)
+        if len(puzzles) <= 50:
+            old_s = f"{old * 1000:10.1f}" if old is not None else f"{'>' + str(args.old_timeout) + 's':>10}"
+            print(f"{k:4d} {sum(c not in '0.' for c in p):5d} {new_t[-1] * 1000:10.2f} {old_s}  {unique}")
+
+    print(f"\nsolve_fast: {len(new_t)}문제, 평균 {statistics.mean(new_t) * 1000:.2f} ms, "
+          f"최대 {max(new_t) * 1000:.2f} ms, {len(new_t) / sum(new_t):.0f} 문제/초")
+    if args.old_timeout > 0:
+        mean_old = f"평균 {statistics.mean(old_t) * 1000:.1f} ms" if old_t else "-"
+        print(f"기존 solve: 제한 시간 안에 {len(old_t)}문제 ({mean_old}), 시간 초과 {timeouts}문제")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 import tkinter as tk
+from tkinter import ttk
 import random
 from copy import deepcopy
 
+from sudoku_solver import random_full_board
+from sudoku_generator import LEVELS, LEVEL_NAMES
+from sudoku_worker import PuzzleWorker
+
+POLL_MS = 50  # 백그라운드 생성 결과 확인 간격 (root.after)
+
 # 보드에 숫자 넣기 전 유효성 검사
 def is_valid(board, row, col, num):
     for i in range(9):
@@ -30,13 +37,11 @@ def solve(board):
                 return False
     return True
 
-# 완성된 스도쿠 보드 생성
+# 완성된 스도쿠 보드 생성 (비트마스크 솔버 사용)
 def generate_full_board():
-    board = [[0] * 9 for _ in range(9)]
-    solve(board)
-    return board
+    return random_full_board()
 
-# 숫자를 제거해서 문제 보드 생성
+# 숫자를 제거해서 문제 보드 생성 (유일해 검사 없음, 기존 방식 - 새 문제는 sudoku_generator.generate)
 def remove_numbers(board, count):
     board = deepcopy(board)
     removed = 0
@@ -71,9 +76,19 @@ class SudokuApp:
         self.entry.insert(0, "36")
         self.entry.pack(side="left", ipady=4) #위아래 여백 추가
 
+        # 난이도 선택 (자동이면 노출 숫자만 맞춤)
+        self.level_names = ["자동"] + [LEVEL_NAMES[lv] for lv in LEVELS]
+        self.level = tk.StringVar(value="자동")
+        tk.OptionMenu(top_frame, self.level, *self.level_names).pack(side="left")
+
         # 생성 버튼 추가
         tk.Button(top_frame, text="생성", width=6, height=2, command=self.generate).pack(side="left", padx=5)
 
+        # 취소 버튼 (생성 중에만 활성)
+        self.cancel_button = tk.Button(top_frame, text="취소", width=6, height=2, command=self.cancel,
+                                       state="disabled")
+        self.cancel_button.pack(side="left")
+
         self.problem_text = tk.Text(root, height=9, width=30)
         self.problem_text.pack()
         self.problem_text.configure(tabs=('25'))  # 탭 간격을 픽셀 단위로 지정(보통 80~100)
@@ -88,21 +103,83 @@ class SudokuApp:
         self.answer_text.tag_configure("center", justify="center") # 세로 가운데 정렬
         self.answer_text.tag_add("center", "1.0", "end")
 
-    def generate(self):
+        # 생성된 문제 정보 (실제 노출 숫자, 난이도) 와 진행 표시
+        self.info_label = tk.Label(root, text="")
+        self.info_label.pack(pady=(5, 0))
+        self.progress = ttk.Progressbar(root, length=200, mode="determinate", maximum=100)
+        self.progress.pack(pady=5)
+
+        # 생성은 백그라운드 스레드에서, 현재 설정의 문제를 몇 개 미리 만들어 둠
+        self.worker = PuzzleWorker()
+        self.waiting = None  # 기다리는 설정 (노출 숫자, 난이도), 없으면 None
         try:
-            remain = int(self.entry.get())
-            remove_count = 81 - min(81, max(0, remain))
-            answer = generate_full_board()
-            problem = remove_numbers(answer, remove_count)
+            self.worker.set_target(self.current_key())
+        except ValueError:
+            pass
 
-            self.problem_text.delete("1.0", tk.END)
-            self.problem_text.insert("1.0", board_to_str(problem))
-            self.answer_text.delete("1.0", tk.END)
-            self.answer_text.insert("1.0", board_to_str(answer))
-        except:
+    # 입력창/난이도 → (노출 숫자, 난이도 또는 None)
+    def current_key(self):
+        remain = min(81, max(0, int(self.entry.get())))
+        k = self.level_names.index(self.level.get())
+        return remain, (LEVELS[k - 1] if k else None)
+
+    def generate(self):
+        try:
+            key = self.current_key()
+        except ValueError:
             self.problem_text.delete("1.0", tk.END)
             self.problem_text.insert("1.0", "입력 오류")
-
+            return
+        item = self.worker.take(key)
+        if item is not None:
+            self.show(*item)
+            return
+        # 준비된 문제가 없으면 기다림 (창은 계속 반응)
+        start = self.waiting is None
+        self.waiting = key
+        self.cancel_button.config(state="normal")
+        self.info_label.config(text="생성 중...")
+        self.progress["value"] = 0
+        if start:
+            self.root.after(POLL_MS, self.poll)
+
+    def poll(self):
+        if self.waiting is None:
+            return
+        if self.worker.error is not None:
+            err, self.worker.error = self.worker.error, None
+            self.waiting = None
+            self.cancel_button.config(state="disabled")
+            self.info_label.config(text=f"생성 오류: {err}")
+            return
+        item = self.worker.take(self.waiting)
+        if item is not None:
+            self.show(*item)
+            return
+        tries, left, target = self.worker.progress
+        # 유일해를 유지하며 지우므로 목표보다 일찍 멈출 수 있음 → 진행률은 대략
+        self.progress["value"] = min(100, 100 * (81 - left) / max(1, 81 - target))
+        self.info_label.config(text=f"생성 중... (시도 {tries}, 남은 힌트 {left})")
+        self.root.after(POLL_MS, self.poll)
+
+    def cancel(self):
+        self.worker.cancel()
+        self.waiting = None
+        self.cancel_button.config(state="disabled")
+        self.progress["value"] = 0
+        self.info_label.config(text="취소됨")
+
+    def show(self, problem, answer, info):
+        self.waiting = None
+        self.cancel_button.config(state="disabled")
+        self.progress["value"] = 100
+        self.problem_text.delete("1.0", tk.END)
+        self.problem_text.insert("1.0", board_to_str(problem))
+        self.answer_text.delete("1.0", tk.END)
+        self.answer_text.insert("1.0", board_to_str(answer))
+        short = f" (목표 {info['target']}개까지는 못 지움)" if info.get("target") and info["clues"] > info["target"] else ""
+        self.info_label.config(text=f"노출 {info['clues']}개{short} · 난이도 {LEVEL_NAMES[info['level']]} "
+                                    f"· {info['seconds'] * 1000:.0f}ms")
 
 if __name__ == "__main__":
     import os
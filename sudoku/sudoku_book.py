@@ -0,0 +1,149 @@
+import os
+import time
+import random
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku_generator import generate_cells, LEVELS
+from sudoku_solver import to_bytes
+
+# -------------------------
+# 문제집 일괄 생성 (GUI 없이, CLI / 라이브러리)
+#   여러 프로세스가 CHUNK 개씩 만들어 보내고, 부모는 받은 순서대로 파일에 바로 씀 (메모리 일정)
+#   보드는 81바이트 (b'0'~b'9', 빈칸 0) 로만 주고받음
+#
+#   python sudoku_book.py book.txt -n 10000 --clues 28 --workers 8 --dedup
+#     book.txt          번호<TAB>문제81<TAB>난이도<TAB>힌트수
+#     book_answers.txt  번호<TAB>답81   (답안지)
+#   python sudoku_book.py --scaling 1 2 4 8 -n 2000   워커 수별 문제/초만 측정
+#
+#   for problem, answer, level in iter_puzzles(100, clues=30, workers=4): ...
+# -------------------------
+CHUNK = 50               # 작업 1개당 문제 수
+MAX_IN_FLIGHT = 4        # 워커당 동시에 걸어 두는 작업 수
+ANSWER_SUFFIX = "_answers"
+
+
+# 작업 하나: 시드 문자열로 재현 가능, [(문제 bytes, 답 bytes, 난이도), ...]
+def _make_chunk(seed, count, clues, level, symmetric):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        problem, answer, info = generate_cells(clues, level, rng, symmetric)
+        out.append((to_bytes(problem), to_bytes(answer), info["level"]))
+    return out
+
+
+# 문제 n개를 (문제 bytes, 답 bytes, 난이도) 로 차례로 yield
+#   workers=0 이면 현재 프로세스에서, dedup 이면 같은 문제는 건너뛰고 n개를 채움
+#   seed 가 같으면 (워커 수와 무관하게) 같은 순서의 같은 문제
+def iter_puzzles(n, clues=None, level=None, workers=0, seed=0, dedup=False, symmetric=True, chunk=CHUNK):
+    seen = set()
+    made = 0
+    task = 0
+
+    def tasks():
+        nonlocal task
+        while True:
+            yield (f"{seed}:{task}", chunk, clues, level, symmetric)
+            task += 1
+
+    def accept(items):
+        nonlocal made
+        for p, a, lv in items:
+            if made >= n:
+                return
+            if dedup:
+                key = hashlib.blake2b(p, digest_size=16).digest()  # 문제 하나당 16바이트만 보관
+                if key in seen:
+                    continue
+                seen.add(key)
+            made += 1
+            yield p, a, lv
+
+    gen = tasks()
+    if workers <= 0:
+        while made < n:
+            yield from accept(_make_chunk(*next(gen)))
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        while made < n:
+            # 남은 수만큼만 작업을 걸어 둠 (중복 제거로 모자라면 더 걸림)
+            need = -(-(n - made) // chunk)
+            while len(pending) < min(need, workers * MAX_IN_FLIGHT):
+                pending.append(pool.submit(_make_chunk, *next(gen)))
+            yield from accept(pending.popleft().result())
+        for fut in pending:
+            fut.cancel()
+
+
+def answer_path(path):
+    root, ext = os.path.splitext(path)
+    return root + ANSWER_SUFFIX + (ext or ".txt")
+
+
+# 문제집/답안지 파일 작성, 통계 dict 반환
+def write_book(path, n, clues=None, level=None, workers=0, seed=0, dedup=False, symmetric=True,
+               answers=None):
+    answers = answers or answer_path(path)
+    t0 = time.perf_counter()
+    levels = dict.fromkeys(LEVELS, 0)
+    above = 0                                  # 목표 clues 까지 못 지운 문제 수 (목표는 최선 노력)
+    with open(path, "wb") as fp, open(answers, "wb") as fa:
+        for k, (p, a, lv) in enumerate(iter_puzzles(n, clues, level, workers, seed, dedup, symmetric), 1):
+            no = str(k).encode()
+            n_clues = 81 - p.count(b"0")
+            fp.write(b"%s\t%s\t%s\t%d\n" % (no, p, lv.encode(), n_clues))
+            fa.write(b"%s\t%s\n" % (no, a))
+            levels[lv] += 1
+            above += clues is not None and n_clues > clues
+    dt = time.perf_counter() - t0
+    return dict(puzzles=n, seconds=dt, puzzles_per_sec=n / dt if dt > 0 else 0.0, levels=levels,
+                above_target=above, output=path, answers=answers)
+
+
+# 워커 수별 문제/초 (파일 없이)
+def scaling(worker_counts, n, clues=None, level=None, seed=0):
+    rows = []
+    for w in worker_counts:
+        t0 = time.perf_counter()
+        for _ in iter_puzzles(n, clues, level, w, seed):
+            pass
+        dt = time.perf_counter() - t0
+        rows.append((w, dt, n / dt))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="스도쿠 문제집 일괄 생성 (답안지 포함)")
+    ap.add_argument("output", nargs="?", default="sudoku_book.txt")
+    ap.add_argument("-n", type=int, default=1000, help="문제 수")
+    ap.add_argument("--clues", type=int, default=None, help="노출 숫자 목표 (기본: 더 못 지울 때까지, 목표는 최선 노력)")
+    ap.add_argument("--level", choices=LEVELS, default=None)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 이면 현재 프로세스에서")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dedup", action="store_true", help="같은 문제는 한 번만")
+    ap.add_argument("--no-symmetric", action="store_true", help="점대칭 제거 대신 한 칸씩 무작위")
+    ap.add_argument("--answers", default=None, help="답안지 경로 (기본: 이름_answers.txt)")
+    ap.add_argument("--scaling", type=int, nargs="+", default=None, help="워커 수별 속도만 측정 (예: 1 2 4 8)")
+    args = ap.parse_args()
+
+    if args.scaling:
+        print(f"{'workers':>7} {'seconds':>9} {'puzzles/s':>10} {'speedup':>8}")
+        rows = scaling(args.scaling, args.n, args.clues, args.level, args.seed)
+        for w, dt, rate in rows:
+            print(f"{w:7d} {dt:9.2f} {rate:10.1f} {rate / rows[0][2]:7.2f}x")
+        return
+    st = write_book(args.output, args.n, args.clues, args.level, args.workers, args.seed, args.dedup,
+                    not args.no_symmetric, args.answers)
+    lv = ", ".join(f"{k} {v}" for k, v in st["levels"].items() if v)
+    print(f"{st['output']} (+ {st['answers']}): {st['puzzles']}문제 ({lv}), "
+          f"{st['seconds']:.1f}s, {st['puzzles_per_sec']:.1f} 문제/초")
+    if st["above_target"]:
+        print(f"주의: {st['above_target']}문제는 노출 {args.clues}개까지 못 지움 (실제 개수는 각 줄 마지막 열)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import time
+import random
+
+from sudoku_solver import State, search, propagate, to_grid, BITS
+
+# -------------------------
+# 유일해 스도쿠 문제 생성 + 난이도 판정
+#   완성 보드에서 칸을 정해진 순서(무작위, 기본은 점대칭 쌍 → 끝으로 남은 칸을 한 칸씩)로 하나씩 지우고
+#   지울 때마다 "그 칸에 원래 숫자 말고 다른 숫자를 넣어도 풀리는가" 를 검사 → 풀리면 되돌림
+#   (해를 2개까지 세는 것과 같은 결과지만, 지운 칸 하나만 분기하므로 더 빠름)
+#
+#   난이도 = 풀 때 필요한 기법
+#     easy   : naked single 만으로 풀림
+#     medium : hidden single 까지 필요
+#     hard   : 전파만으로 안 풀려 추측(분기)이 필요
+#     expert : 추측이 GUESS_EXPERT 번 넘게 필요
+#
+#   problem, answer, info = generate(clues=30, level="medium")
+# -------------------------
+LEVELS = ["easy", "medium", "hard", "expert"]
+LEVEL_NAMES = {"easy": "쉬움", "medium": "보통", "hard": "어려움", "expert": "매우 어려움"}
+GUESS_EXPERT = 10
+MAX_TRIES = 50       # 난이도를 못 맞추면 새 완성 보드로 다시 시도하는 횟수
+
+
+class Cancelled(Exception):
+    """stop 이벤트가 켜져 생성을 중단함"""
+
+
+# 지운 칸 i (원래 숫자 d) 에 다른 숫자를 넣어도 해가 있으면 True → 유일해가 아님
+def has_other_solution(st, i, d):
+    for bit in BITS[st.cand(i) & ~(1 << (d - 1))]:
+        nxt = st.copy()
+        nxt.place(i, bit)
+        if search(nxt, 1)[0]:
+            return True
+    return False
+
+
+# 문제를 푸는 데 필요한 기법으로 난이도 판정
+def grade(puzzle):
+    st = State.from_board(puzzle)
+    if st is None:
+        raise ValueError("주어진 숫자끼리 충돌합니다")
+    log = {}
+    naked = st.copy()
+    if propagate(naked, hidden=False, log=log) and 0 not in naked.cells:
+        level = "easy"
+    else:
+        full = st.copy()
+        log = {}
+        if propagate(full, hidden=True, log=log) and 0 not in full.cells:
+            level = "medium"
+        else:
+            sols, guesses = search(st, 2)
+            if len(sols) != 1:
+                raise ValueError(f"해가 {'없습니다' if not sols else '여러 개입니다'}")
+            log["guesses"] = guesses
+            level = "expert" if guesses > GUESS_EXPERT else "hard"
+    return dict(level=level, naked=log.get("naked", 0), hidden=log.get("hidden", 0),
+                guesses=log.get("guesses", 0))
+
+
+# 제거 순서: 무작위, symmetric 이면 점대칭 쌍 (i, 80 - i) 을 함께 지움
+def removal_order(rng, symmetric=True):
+    if not symmetric:
+        order = list(range(81))
+        rng.shuffle(order)
+        return [(i,) for i in order]
+    pairs = [(i, 80 - i) if i != 40 else (40,) for i in range(41)]
+    rng.shuffle(pairs)
+    return pairs
+
+
+# 완성 보드 answer(81칸) 에서 유일해를 유지하며 지움
+#   clues: 이 개수까지만 지움 (None 이면 더 못 지울 때까지 = 최소 문제)
+#          목표는 최선 노력: 보드에 따라 그 전에 더 못 지울 수 있음 (17 같은 값은 보통 못 맞춤)
+#   level: 이보다 어려워지는 제거는 되돌림
+#   symmetric: 점대칭 쌍으로 먼저 지우고, 쌍으로는 더 못 지우면 남은 칸을 한 칸씩 한 번 더 시도
+#              (힌트를 지울수록 해/난이도 조건은 나빠지기만 하므로 한 번 훑으면 최소 문제)
+#   stop: threading.Event 등 (is_set() 이면 Cancelled), progress(남은 힌트 수): 진행 상황 콜백
+def dig(answer, rng, clues=None, level=None, symmetric=True, stop=None, progress=None):
+    cells = answer[:]
+    max_rank = LEVELS.index(level) if level else None
+    left = _dig_pass(cells, removal_order(rng, symmetric), 81, clues, max_rank, stop, progress)
+    if symmetric and (clues is None or left > clues):
+        rest = [i for i in range(81) if cells[i]]
+        rng.shuffle(rest)
+        left = _dig_pass(cells, [(i,) for i in rest], left, clues, max_rank, stop, progress)
+    return cells
+
+
+# order 의 칸 묶음을 차례로 지워 보고(유일해/난이도가 깨지면 되돌림) 남은 힌트 수 반환, cells 를 직접 바꿈
+def _dig_pass(cells, order, left, clues, max_rank, stop, progress):
+    for group in order:
+        if stop is not None and stop.is_set():
+            raise Cancelled
+        if progress is not None:
+            progress(left)
+        if clues is not None and left - len(group) < clues:
+            if left <= clues:
+                break
+            continue  # 쌍은 못 지워도 가운데 칸(하나짜리)은 지울 수 있음
+        saved = [cells[i] for i in group]
+        for i in group:
+            cells[i] = 0
+        st = State.from_board(cells)
+        if any(has_other_solution(st, i, d) for i, d in zip(group, saved)) or (
+                max_rank is not None and LEVELS.index(grade(cells)["level"]) > max_rank):
+            for i, d in zip(group, saved):
+                cells[i] = d
+            continue
+        left -= len(group)
+    return left
+
+
+# 유일해 문제 생성 (칸 81개 리스트): (문제, 답, 정보 dict)
+#   info: clues(실제 힌트 수), target(요청한 clues), level/naked/hidden/guesses(grade 결과), tries, seconds
+#   clues 는 최선 노력: 이 보드로 만들 수 있는 최소보다 작으면 최소 문제를 돌려줌 (info["clues"] > info["target"])
+#   stop / progress(시도 번호, 남은 힌트 수): GUI 백그라운드 생성용 (dig 참고)
+def generate_cells(clues=None, level=None, rng=None, symmetric=True, max_tries=MAX_TRIES, stop=None,
+                   progress=None):
+    if level is not None and level not in LEVELS:
+        raise ValueError(f"level 은 {LEVELS} 중 하나")
+    rng = rng or random.Random()
+    t0 = time.perf_counter()
+    best = None
+    for tries in range(1, max_tries + 1):
+        answer = search(State(), 1, rng)[0][0]
+        report = (lambda left: progress(tries, left)) if progress is not None else None
+        problem = dig(answer, rng, clues, level, symmetric, stop, report)
+        info = grade(problem)
+        info.update(clues=81 - problem.count(0), target=clues, tries=tries)
+        if level is None or info["level"] == level:
+            best = (problem, answer, info)
+            break
+        if best is None or LEVELS.index(info["level"]) > LEVELS.index(best[2]["level"]):
+            best = (problem, answer, info)  # 목표 난이도를 못 맞추면 가장 가까운 것
+    problem, answer, info = best
+    info["seconds"] = time.perf_counter() - t0
+    return problem, answer, info
+
+
+# generate_cells 와 같고 문제/답을 9x9 리스트로
+def generate(clues=None, level=None, rng=None, symmetric=True, max_tries=MAX_TRIES, stop=None, progress=None):
+    problem, answer, info = generate_cells(clues, level, rng, symmetric, max_tries, stop, progress)
+    return to_grid(problem), to_grid(answer), info
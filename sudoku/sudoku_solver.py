@@ -0,0 +1,195 @@
+import random
+
+# -------------------------
+# 비트마스크 + 제약 전파 스도쿠 엔진 (tkinter 없이 사용 가능)
+#   칸 81개를 1차원 리스트로, 행/열/박스마다 쓰인 숫자를 9비트 마스크로 관리
+#   숫자 d 는 비트 1 << (d - 1), 후보 = ~(행 | 열 | 박스) & ALL
+#
+#   전파: naked single (후보가 1개인 칸) + hidden single (단위 안에서 그 숫자가 들어갈 칸이 1개)
+#   탐색: 후보가 가장 적은 칸(MRV)부터 분기
+#
+#   solve_fast(board)          → 푼 보드 (입력과 같은 모양) 또는 None
+#   count_solutions(board, 2)  → 해의 수 (limit 에서 멈춤, 유일해 검사용)
+#   board: 9x9 리스트, 칸 81개 리스트 또는 81글자 문자열 ('0' / '.' 은 빈칸)
+# -------------------------
+ALL = 0x1FF
+ROW = [i // 9 for i in range(81)]
+COL = [i % 9 for i in range(81)]
+BOX = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+UNITS = ([[r * 9 + c for c in range(9)] for r in range(9)]
+         + [[r * 9 + c for r in range(9)] for c in range(9)]
+         + [[(b // 3) * 27 + (b % 3) * 3 + r * 9 + c for r in range(3) for c in range(3)] for b in range(9)])
+DIGIT = {1 << d: d + 1 for d in range(9)}              # 비트 1개 → 숫자
+POPCOUNT = [bin(m).count("1") for m in range(ALL + 1)]
+BITS = [[1 << d for d in range(9) if m >> d & 1] for m in range(ALL + 1)]  # 마스크 → 비트 목록
+
+
+# 9x9 리스트 / 칸 81개 리스트 / 81글자 문자열(str, bytes) → 칸 81개 리스트 (새 리스트)
+def to_cells(board):
+    if isinstance(board, (bytes, bytearray)):
+        board = board.decode("ascii")
+    if isinstance(board, str):
+        s = "".join(ch for ch in board if not ch.isspace())
+        if len(s) != 81:
+            raise ValueError(f"81칸이어야 합니다 (현재 {len(s)}칸)")
+        return [int(ch) if ch.isdigit() else 0 for ch in s]
+    if len(board) == 81:
+        return list(board)
+    cells = [v for row in board for v in row]
+    if len(cells) != 81:
+        raise ValueError(f"81칸이어야 합니다 (현재 {len(cells)}칸)")
+    return cells
+
+
+# 칸 81개 → 9x9 리스트
+def to_grid(cells):
+    return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+
+# 칸 81개 → 81글자 문자열 (빈칸은 '0')
+def to_line(cells):
+    return "".join(map(str, cells))
+
+
+# 칸 81개 → 81바이트 (b'0'~b'9', 파일 한 줄 그대로), 9x9 리스트보다 훨씬 작음
+def to_bytes(cells):
+    return bytes(48 + v for v in cells)
+
+
+class State:
+    """칸 값과 행/열/박스 마스크. 분기할 때 copy() 로 복사 (작은 리스트 4개라 되돌리기보다 빠름)"""
+
+    __slots__ = ("cells", "rows", "cols", "boxes")
+
+    def __init__(self, cells=None, rows=None, cols=None, boxes=None):
+        self.cells = cells if cells is not None else [0] * 81
+        self.rows = rows if rows is not None else [0] * 9
+        self.cols = cols if cols is not None else [0] * 9
+        self.boxes = boxes if boxes is not None else [0] * 9
+
+    @classmethod
+    def from_board(cls, board):
+        """주어진 숫자끼리 충돌하면 None"""
+        st = cls()
+        for i, v in enumerate(to_cells(board)):
+            if v and not st.place(i, 1 << (v - 1)):
+                return None
+        return st
+
+    def copy(self):
+        return State(self.cells[:], self.rows[:], self.cols[:], self.boxes[:])
+
+    def cand(self, i):
+        return ~(self.rows[ROW[i]] | self.cols[COL[i]] | self.boxes[BOX[i]]) & ALL
+
+    def place(self, i, bit):
+        r, c, b = ROW[i], COL[i], BOX[i]
+        if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+            return False
+        self.cells[i] = DIGIT[bit]
+        self.rows[r] |= bit; self.cols[c] |= bit; self.boxes[b] |= bit
+        return True
+
+
+# naked / hidden single 을 더 이상 없을 때까지 채움. 모순이면 False
+#   hidden=False 면 naked single 만 (난이도 판정용), log 에 기법별 사용 횟수 누적
+def propagate(st, hidden=True, log=None):
+    cells, rows, cols, boxes = st.cells, st.rows, st.cols, st.boxes
+    while True:
+        changed = False
+        for i in range(81):
+            if cells[i]:
+                continue
+            cand = ~(rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]]) & ALL
+            if not cand:
+                return False
+            if not cand & (cand - 1):
+                st.place(i, cand); changed = True
+                if log is not None: log["naked"] = log.get("naked", 0) + 1
+        if changed:
+            continue
+        if not hidden:
+            return True
+        for unit in UNITS:
+            once = twice = placed = 0
+            for i in unit:
+                if cells[i]:
+                    placed |= 1 << (cells[i] - 1)
+                else:
+                    cand = ~(rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]]) & ALL
+                    twice |= once & cand; once |= cand
+            if (once | placed) != ALL:
+                return False  # 이 단위에 들어갈 곳이 없는 숫자
+            single = once & ~twice & ~placed
+            for bit in BITS[single]:
+                for i in unit:
+                    if not cells[i] and st.cand(i) & bit:
+                        st.place(i, bit); changed = True
+                        break
+                else:
+                    return False  # 같은 칸에 hidden single 두 개
+                if log is not None: log["hidden"] = log.get("hidden", 0) + 1
+        if not changed:
+            return True
+
+
+# 후보가 가장 적은 빈칸 (i, 후보 마스크). 빈칸이 없으면 (None, 0)
+def pick_cell(st):
+    best, best_cand, best_n = None, 0, 10
+    cells, rows, cols, boxes = st.cells, st.rows, st.cols, st.boxes
+    for i in range(81):
+        if cells[i]:
+            continue
+        cand = ~(rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]]) & ALL
+        n = POPCOUNT[cand]
+        if n < best_n:
+            best, best_cand, best_n = i, cand, n
+            if n == 2:
+                break
+    return best, best_cand
+
+
+# 해를 limit 개까지 모아 (해 목록, 분기 횟수) 반환. rng 를 주면 숫자를 무작위 순서로 시도
+def search(st, limit=1, rng=None, hidden=True):
+    out, guesses = [], 0
+
+    def rec(st):
+        nonlocal guesses
+        if not propagate(st, hidden):
+            return
+        i, cand = pick_cell(st)
+        if i is None:
+            out.append(st.cells[:]); return
+        bits = BITS[cand]
+        if rng is not None:
+            bits = bits[:]; rng.shuffle(bits)
+        for bit in bits:
+            guesses += 1
+            nxt = st.copy()
+            nxt.place(i, bit)
+            rec(nxt)
+            if len(out) >= limit:
+                return
+
+    if st is not None:
+        rec(st.copy())
+    return out, guesses
+
+
+# 보드를 풀어 같은 모양(9x9 리스트 / 81글자 문자열)으로 반환, 해가 없으면 None
+def solve_fast(board, rng=None):
+    sols, _ = search(State.from_board(board), 1, rng)
+    if not sols:
+        return None
+    return to_line(sols[0]) if isinstance(board, str) else to_grid(sols[0])
+
+
+# 해의 수를 limit 에서 멈춰 셈 (limit=2 면 유일해 검사)
+def count_solutions(board, limit=2):
+    st = board if isinstance(board, State) else State.from_board(board)
+    return len(search(st, limit)[0])
+
+
+# 무작위 완성 보드 (9x9 리스트)
+def random_full_board(rng=None):
+    return to_grid(search(State(), 1, rng or random.Random())[0][0])
@@ -0,0 +1,79 @@
+import threading
+from collections import deque
+
+from sudoku_generator import generate, Cancelled
+
+# -------------------------
+# GUI 용 백그라운드 생성기 (tkinter 없이 동작, GUI 는 root.after 로 take() 를 폴링)
+#   스레드 하나가 현재 설정(노출 숫자, 난이도)의 문제를 PREFETCH 개까지 미리 만들어 둠
+#   → "생성" 을 누르면 준비된 문제를 바로 꺼내고, 빈 자리는 뒤에서 다시 채움
+#   cancel() 은 만들던 문제를 버리고 다음 요청(take / set_target) 까지 쉼
+#   Tk 위젯은 건드리지 않음 (Tk 는 메인 스레드에서만)
+# -------------------------
+PREFETCH = 3
+
+
+class PuzzleWorker:
+    def __init__(self, prefetch=PREFETCH):
+        self.prefetch = prefetch
+        self.lock = threading.Lock()
+        self.ready = {}                  # (노출 숫자, 난이도) → deque[(문제, 답, 정보)]
+        self.key = None                  # 미리 만들 설정
+        self.paused = False
+        self.progress = (0, 0, 81)       # (만드는 중인 설정의 시도 번호, 남은 힌트 수, 목표 힌트 수)
+        self.error = None
+        self.wake = threading.Event()
+        self.stop = threading.Event()    # 만들던 문제 중단
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def set_target(self, key):
+        """key=(노출 숫자, 난이도 또는 None) 설정의 문제를 미리 만들기 시작"""
+        with self.lock:
+            if key != self.key:
+                self.stop.set()          # 다른 설정을 만들던 중이면 버림
+            self.key = key
+            self.paused = False
+        self.wake.set()
+
+    def take(self, key):
+        """준비된 문제를 꺼냄 (없으면 None, 그 설정으로 만들기 시작)"""
+        self.set_target(key)
+        with self.lock:
+            q = self.ready.get(key)
+            item = q.popleft() if q else None
+        self.wake.set()
+        return item
+
+    def cancel(self):
+        with self.lock:
+            self.paused = True
+        self.stop.set()
+
+    def _report(self, tries, left):
+        self.progress = (tries, left, self.progress[2])
+
+    def _run(self):
+        while True:
+            self.wake.wait()
+            with self.lock:
+                self.wake.clear()
+                self.stop.clear()
+                key, paused = self.key, self.paused
+                full = key is None or len(self.ready.get(key, ())) >= self.prefetch
+            if paused or full:
+                continue
+            clues, level = key
+            self.progress = (1, 81, clues)
+            try:
+                item = generate(clues=clues, level=level, stop=self.stop, progress=self._report)
+            except Cancelled:
+                continue
+            except Exception as e:  # GUI 에 보여 줄 수 있게 남겨 둠
+                self.error = e
+                with self.lock:
+                    self.paused = True
+                continue
+            with self.lock:
+                self.ready.setdefault(key, deque()).append(item)
+            self.wake.set()              # 더 채울 자리가 있으면 계속
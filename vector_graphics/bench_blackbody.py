@@ -0,0 +1,81 @@
+import sys
+sys.path.append(r"D:\seolgit\python_packages")  # 패키지가 설치된 경로 지정
+
+import time
+import argparse
+
+import numpy as np
+
+import blackbody as bb
+
+# -------------------------------
+# 흑체복사 격자 벤치마크: 온도 10⁴ × 파장 10⁵ (= 10⁹ 점, 한 번에 만들면 8 GB)
+#   기존 방식: 온도마다 u_lambda 를 파이썬 루프로 (일부 온도만 돌려 전체 시간을 추정)
+#   격자 방식: iter_grid 로 CHUNK_BYTES 씩 나눠 계산, 블록마다 꼭짓점/가시광선 에너지만 남김
+#   python bench_blackbody.py --temps 10000 --waves 100000 --chunk-mb 64
+# -------------------------------
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 1024 if sys.platform != "darwin" else kb / 1024**2
+
+
+# 기존 스크립트와 같은 식 (np.exp, 0 파장 제외)
+def u_lambda_loop(lam, T):
+    a = 8 * np.pi * bb.h * bb.c / (lam**5)
+    b = bb.h * bb.c / (lam * bb.k * T)
+    return a / (np.exp(b) - 1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="흑체복사 (온도 × 파장) 격자 벤치마크")
+    ap.add_argument("--temps", type=int, default=10_000)
+    ap.add_argument("--waves", type=int, default=100_000)
+    ap.add_argument("--chunk-mb", type=float, default=64, help="iter_grid 블록 최대 크기 (MB)")
+    ap.add_argument("--loop-sample", type=int, default=200, help="기존 루프 방식을 돌릴 온도 수 (전체는 추정)")
+    args = ap.parse_args()
+
+    temps = np.linspace(1000, 10000, args.temps)
+    lam = np.linspace(10e-9, 5000e-9, args.waves)     # 0 파장은 기존 식이 0 으로 나누므로 제외
+    vis = (lam >= bb.VISIBLE[0]) & (lam <= bb.VISIBLE[1])
+    dlam = lam[1] - lam[0]
+    n_pts = temps.size * lam.size
+    print(f"격자: 온도 {temps.size} × 파장 {lam.size} = {n_pts:.2e} 점 "
+          f"(한 번에 만들면 {n_pts * 8 / 2**30:.1f} GiB)")
+
+    # 기존: 온도마다 루프
+    sample = temps[:args.loop_sample]
+    t0 = time.perf_counter()
+    loop_peak = np.empty(sample.size)
+    with np.errstate(over="ignore"):
+        for i, T in enumerate(sample):
+            u = u_lambda_loop(lam, T)
+            loop_peak[i] = lam[u.argmax()]
+    t_loop = (time.perf_counter() - t0) * temps.size / sample.size
+    print(f"{'loop (추정)':<16} {t_loop:8.2f}s  {n_pts / t_loop:10.3e} 점/s")
+
+    # 격자: 블록 단위 계산 + 줄별 축약
+    peak = np.empty(temps.size)
+    vis_energy = np.empty(temps.size)
+    t0 = time.perf_counter()
+    for i0, i1, block in bb.iter_grid(temps, lam, max_bytes=int(args.chunk_mb * 2**20)):
+        peak[i0:i1] = lam[block.argmax(axis=1)]
+        vis_energy[i0:i1] = block[:, vis].sum(axis=1) * dlam
+    t_grid = time.perf_counter() - t0
+    print(f"{'iter_grid':<16} {t_grid:8.2f}s  {n_pts / t_grid:10.3e} 점/s  "
+          f"({t_loop / t_grid:.1f}x, 최대 RSS {peak_rss_mb():.0f} MB)")
+
+    # 확인: 루프와 같은 꼭짓점, Wien 법칙과 격자 간격 이내
+    lam_w, _ = bb.wien_peak(temps)
+    print(f"loop 와 꼭짓점 일치: {np.array_equal(loop_peak, peak[:sample.size])}, "
+          f"Wien 법칙과 최대 차이 {np.abs(peak - lam_w).max() * 1e9:.3f} nm (격자 간격 {dlam * 1e9:.3f} nm)")
+    frac = vis_energy / bb.total_energy(temps)
+    print(f"가시광선 비율: {temps[0]:.0f} K {frac[0]:.4f}, {temps[-1]:.0f} K {frac[-1]:.4f}")
+
+if __name__ == "__main__":
+    main()
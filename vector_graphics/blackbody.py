@@ -6,7 +6,19 @@ sys.path.append(r"D:\seolgit\python_packages")  # 패키지가 설치된 경로
 
 # 사용할 외부 패키지(설치함)
 import numpy as np                  # 수치 계산 (배열, 지수함수 등)
-import matplotlib.pyplot as plt     # 그래프 그리기
+# matplotlib 은 그림 그릴 때만 불러옴 (계산만 import 할 때 느려지지 않게)
+
+# -------------------------------
+# 흑체복사 계산 모듈 + 그림 스크립트
+#   import blackbody as bb
+#   u = bb.u_lambda(lam, T)                 # lam, T 는 numpy 브로드캐스트 규칙 (스칼라/배열)
+#   U = bb.spectrum_grid(temps, lam)         # (온도 수, 파장 수) 격자
+#   lam_max, u_max = bb.wien_peak(temps)     # 온도 배열 → 꼭짓점 배열
+#   P = bb.band_energy(temps, 380e-9, 750e-9)   # 가시광선 구간 에너지 밀도
+#   for i0, i1, block in bb.iter_grid(temps, lam): ...   # 큰 격자는 메모리 한도 안에서 나눠 계산
+#
+#   python blackbody.py  → 그래프 창
+# -------------------------------
 
 # -------------------------------
 # 사용되는 기본 물리 상수 (SI 단위계)
@@ -15,111 +27,208 @@ h = 6.62607015e-34      # 플랑크 상수 [J·s]
 c = 2.99792458e8        # 빛의 속도 [m/s]
 k = 1.380649e-23        # 볼츠만 상수 [J/K]
 
+HC_K = h * c / k                                # 제2 복사 상수 c2 [m·K]
+A8PI = 8 * np.pi * h * c                        # u_lambda 앞 계수 [J·m]
+SIGMA = 2 * np.pi**5 * k**4 / (15 * c**2 * h**3)  # 슈테판-볼츠만 상수 [W m^-2 K^-4]
+b_wien_mK = 2.897771955e-3                      # Wien 변위 상수 [m·K]
+
+VISIBLE = (380e-9, 750e-9)                      # 가시광선 범위 [m]
+CHUNK_BYTES = 64 << 20                          # iter_grid 블록 하나의 최대 크기 (버퍼 2개)
+
+# 단위 변환 (u_lambda [J·m^-4] 에 곱함)
+UNIT_SCALE = {
+    "J/m^4": 1.0,            # J/m^3 per m
+    "J/m^3/nm": 1e-9,        # per m → per nm
+    "kJ/nm": 1e-12,          # 그림 축: J→kJ(×1e-3), per m→per nm(×1e-9)
+}
+UNIT_LABEL = {"J/m^4": "J/m$^4$", "J/m^3/nm": "J/m$^3$/nm", "kJ/nm": "kJ/nm"}   # 축 라벨 표기
+
+
 # -------------------------------
 # 플랑크의 복사 법칙 (에너지 밀도 표현)
-# lam : 파장 [m]
+# lam : 파장 [m]   (lam <= 0 이면 0, 극한값)
 # T   : 절대온도 [K]
-# 반환값 : u_lambda [J·m^-4] (J/m^3 per m)
+# 반환값 : u_lambda [J·m^-4] (J/m^3 per m), lam 과 T 를 브로드캐스트한 모양
+#   u = a / (e^x - 1) = a·e^-x / (1 - e^-x),  x = hc/(λkT)
+#   e^x 대신 e^-x 와 expm1 을 써서 x 가 커도 넘치지 않고, x 가 작아도 1 - e^-x 가 정확함
 # -------------------------------
 def u_lambda(lam, T):
-    a = 8 * np.pi * h * c / (lam**5)
-    b = h * c / (lam * k * T)
-    return a / (np.exp(b) - 1)
-
-# -------------------------------
-# 계산할 파장 범위 설정
+    lam = np.asarray(lam, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        x = HC_K / (lam * T)
+        u = A8PI / lam**5 * np.exp(-x) / -np.expm1(-x)
+    return np.where(lam > 0, u, 0.0)
+
+
+# 온도 배열 × 파장 배열 → (len(temps), len(lam)) 격자
+def spectrum_grid(temps, lam):
+    return u_lambda(np.asarray(lam)[None, :], np.asarray(temps, dtype=np.float64)[:, None])
+
+
+# 큰 격자를 온도 몇 줄씩 나눠 계산: (시작, 끝, 블록) 을 차례로 yield
+#   블록은 같은 버퍼를 다시 쓰므로 다음 블록 전에 필요한 값만 꺼내 둘 것 (out 버퍼 재사용)
+#   메모리: 버퍼 2개 × rows × len(lam) × 8바이트 <= max_bytes
+def iter_grid(temps, lam, max_bytes=CHUNK_BYTES):
+    temps = np.asarray(temps, dtype=np.float64)
+    lam = np.asarray(lam, dtype=np.float64)
+    rows = max(1, int(max_bytes // (2 * 8 * max(1, lam.size))))
+    pos = lam > 0
+    lam_safe = np.where(pos, lam, 1.0)          # 0 파장 자리는 계산 후 0 으로 덮음
+    a = A8PI / lam_safe**5                      # 파장마다 한 번만
+    buf_x = np.empty((min(rows, temps.size), lam.size))
+    buf_e = np.empty_like(buf_x)
+    for i0 in range(0, temps.size, rows):
+        i1 = min(i0 + rows, temps.size)
+        x, e = buf_x[:i1 - i0], buf_e[:i1 - i0]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):  # u_lambda 와 같게 (T=0 → 0)
+            np.multiply.outer(temps[i0:i1], lam_safe, out=x)   # λT
+            np.divide(-HC_K, x, out=x)                          # -x
+            np.exp(x, out=e)                                    # e^-x
+            np.expm1(x, out=x)
+            np.negative(x, out=x)                               # 1 - e^-x
+            np.divide(e, x, out=e)
+            np.multiply(e, a, out=e)
+        e[:, ~pos] = 0.0
+        yield i0, i1, e
+
+
+# -------------------------------
+# Wien 꼭짓점 (벡터화)
+# λ_max = b/T,  b ≈ 2.897771955×10^-3 m·K  (= 2.897771955×10^6 nm·K)
+# 반환값 : (λ_max [m], u(λ_max) [J·m^-4]) — T 와 같은 모양
 # -------------------------------
-w_nm = np.linspace(0, 3000, 1000)   # 파장 (nm 단위)
-lam = w_nm * 1e-9                   # m 단위 변환
+def wien_peak(T):
+    T = np.asarray(T, dtype=np.float64)
+    lam_max = b_wien_mK / T
+    return lam_max, u_lambda(lam_max, T)
 
 
-# 그림 크기 지정 - 가로, 세로
-fig, ax = plt.subplots(figsize=(5, 3))
+# 전체 파장 에너지 밀도 [J/m^3] = 4σT⁴/c
+def total_energy(T):
+    return 4 * SIGMA / c * np.asarray(T, dtype=np.float64)**4
 
 
-# -------------------------------
-# 여러 온도에서 흑체복사 곡선 (절대값) 그리기
-# -------------------------------
-temps = [2500, 3000, 3500, 4000, 4500, 5000, 5500]     # K
-for T in temps:
-    u = u_lambda(lam, T)             # [J m^-4]
-    u_kJ_per_nm = u * 1e-12          # J→kJ(×1e-3), per m→per nm(×1e-9) ⇒ ×1e-12
-    ax.plot(w_nm, u_kJ_per_nm, label=f"{T} K")
+# 파장 구간 [lo, hi] 의 에너지 밀도 [J/m^3] (온도 배열이면 배열), 사다리꼴 적분 n 점
+def band_energy(T, lo=VISIBLE[0], hi=VISIBLE[1], n=2001):
+    T = np.asarray(T, dtype=np.float64)
+    lam = np.linspace(lo, hi, n)
+    w = np.full(n, (hi - lo) / (n - 1))         # 사다리꼴 가중치
+    w[[0, -1]] *= 0.5
+    out = np.empty(T.size)
+    for i0, i1, block in iter_grid(T.ravel(), lam):
+        out[i0:i1] = block @ w
+    return out.reshape(T.shape)
 
-# -------------------------------
-# Wien 꼭짓점(피크) 점 + 점선
-# λ_max = b/T,  b ≈ 2.897771955×10^-3 m·K  (= 2.897771955×10^6 nm·K)
-# -------------------------------
-b_wien_mK  = 2.897771955e-3          # m·K
-peak_x_nm  = []
-peak_y_kjn = []
-for T in temps:
-    lam_max = b_wien_mK / T          # [m]
-    x_nm    = lam_max * 1e9          # [nm]
-    y_kjn   = u_lambda(lam_max, T) * 1e-12  # [kJ/nm]
-    peak_x_nm.append(x_nm)
-    peak_y_kjn.append(y_kjn)
-    ax.plot(x_nm, y_kjn, "o", color="k", markersize=4)  # 꼭짓점 표시
-
-ax.plot(peak_x_nm, peak_y_kjn, "k--", linewidth=1, label="Wien's law")
 
-# -------------------------------
-# 가시광선 범위 수직선 (380 nm, 750 nm)
-# -------------------------------
-ax.axvline(380, color="gray", linestyle=":", linewidth=1, label="Visible range")
-ax.axvline(750, color="gray", linestyle=":", linewidth=1)
+# 구간 에너지 / 전체 에너지 (예: 가시광선 효율)
+def band_fraction(T, lo=VISIBLE[0], hi=VISIBLE[1], n=2001):
+    return band_energy(T, lo, hi, n) / total_energy(T)
 
-# -------------------------------
-# 라벨/제목/범례
-# -------------------------------
-ax.set_xlabel("Wavelength (nm)", fontsize=10)
-ax.set_ylabel(r"$u(\lambda)$ ($10^{-7}$ kJ/nm)", fontsize=10)  # 지수 포함 라벨(숫자는 그대로)
-ax.set_title("Blackbody radiation", fontsize=10)
-ax.legend(title="Temperature", loc="upper right", fontsize=10)
-ax.tick_params(axis='both', labelsize=10)        # 눈금 폰트
-
-# 온도 범례를 뒤집음(고온이 위로 가도록)
-# 현재 모든 범례 항목 가져오기
-handles, labels = ax.get_legend_handles_labels()
-
-# 온도 라인만 (끝에서 2개는 Wien's law, Visible range)
-temp_handles = handles[:-2][::-1]   # 역순 (고온이 위)
-temp_labels = labels[:-2][::-1]
-
-# 추가 라인만
-extra_handles = handles[-2:]
-extra_labels = labels[-2:]
-
-# 합치기 (온도 먼저, 그 다음 추가 라인)
-new_handles = temp_handles + extra_handles
-new_labels = temp_labels + extra_labels
-
-# 범례 출력
-ax.legend(new_handles, new_labels, title="", loc="upper right", fontsize=10)
-
-# 원점이 꼭짓점에 붙도록 설정
-ax.set_xlim(0, 3000)    # x축 0~3000 nm
-ax.set_ylim(0, None)    # y축 0부터 시작
-ax.margins(x=0, y=0)    # x, y축 여백 제거
-ax.yaxis.get_offset_text().set_visible(False)  # 축 위쪽 1e-? 표시 제거
-
-plt.tight_layout()
-
-# 0 눈금 라벨 숨기기 (x, y 모두)
-xt = ax.get_xticks(); ax.set_xticks([t for t in xt if t != 0])
-yt = ax.get_yticks(); ax.set_yticks([t for t in yt if t != 0])
-# 원점에 '0'을 한 번만 표시
-ax.annotate("0", xy=(0, 0), xycoords="data",
-            xytext=(-8, -8), textcoords="offset points",
-            ha="center", va="center", clip_on=False)
 
 # -------------------------------
-# 결과 저장 (벡터) - 비활성화하고 수동으로 저장
+# 단위 변환
 # -------------------------------
-# plt.savefig("blackbody_u_lambda.svg")
-# plt.savefig("blackbody_u_lambda.pdf") 
+# 에너지 밀도 u_λ [J m^-4] → 분광 복사휘도 B_λ [W sr^-1 m^-3] (B = c·u / 4π)
+def to_radiance(u):
+    return np.asarray(u) * (c / (4 * np.pi))
+
+
+# 분광 복사휘도 B_λ [W sr^-1 m^-3] → 파장 1 nm 당 [W sr^-1 m^-2 nm^-1]
+def radiance_per_nm(B):
+    return np.asarray(B) * 1e-9
+
+
+# 분광 복사휘도 B_λ → 광자 복사휘도 [photons s^-1 sr^-1 m^-3] (광자 하나 에너지 hc/λ 로 나눔)
+def photon_radiance(B, lam):
+    return np.asarray(B) * np.asarray(lam) / (h * c)
+
+
+# 파장 기준 B_λ [.. m^-1] → 진동수 기준 B_ν [W sr^-1 m^-2 Hz^-1] (B_ν = B_λ λ²/c)
+def radiance_per_hz(B, lam):
+    return np.asarray(B) * np.asarray(lam)**2 / c
+
 
 # -------------------------------
-# 화면 출력
+# 그림: 여러 온도의 흑체복사 곡선 + Wien 꼭짓점 + 가시광선 범위
 # -------------------------------
-plt.show()
\ No newline at end of file
+def plot_spectra(ax, temps, w_max_nm=3000, n=1000, unit="kJ/nm"):
+    # 계산할 파장 범위 설정 (0 nm 부터, u_lambda 가 0 파장을 0 으로 처리)
+    w_nm = np.linspace(0, w_max_nm, n)   # 파장 (nm 단위)
+    lam = w_nm * 1e-9                    # m 단위 변환
+    scale = UNIT_SCALE[unit]
+
+    # 여러 온도에서 흑체복사 곡선 (절대값) 한 번에 계산
+    U = spectrum_grid(temps, lam) * scale
+    lam_max, u_max = wien_peak(temps)
+    u_max = u_max * scale
+
+    # y 축 지수: 데이터 최댓값에서 계산해 값을 10^exp 로 나누고 라벨에 표시 (온도/단위가 바뀌어도 맞음)
+    top = max(U.max(), u_max.max())
+    exp = int(np.floor(np.log10(top))) if top > 0 else 0
+    U, u_max = U / 10.0**exp, u_max / 10.0**exp
+    for T, u in zip(temps, U):
+        ax.plot(w_nm, u, label=f"{T} K")
+
+    # Wien 꼭짓점(피크) 점 + 점선
+    peak_x_nm, peak_y = lam_max * 1e9, u_max
+    ax.plot(peak_x_nm, peak_y, "o", color="k", markersize=4)   # 꼭짓점 표시
+    ax.plot(peak_x_nm, peak_y, "k--", linewidth=1, label="Wien's law")
+
+    # 가시광선 범위 수직선 (380 nm, 750 nm)
+    ax.axvline(380, color="gray", linestyle=":", linewidth=1, label="Visible range")
+    ax.axvline(750, color="gray", linestyle=":", linewidth=1)
+
+    # 라벨/제목
+    ax.set_xlabel("Wavelength (nm)", fontsize=10)
+    unit_label = UNIT_LABEL.get(unit, unit)
+    ax.set_ylabel(rf"$u(\lambda)$ ($10^{{{exp}}}$ {unit_label})" if exp else rf"$u(\lambda)$ ({unit_label})",
+                  fontsize=10)  # 지수 포함 라벨 (눈금 숫자는 10^exp 로 나눈 값)
+    ax.set_title("Blackbody radiation", fontsize=10)
+    ax.tick_params(axis='both', labelsize=10)        # 눈금 폰트
+
+    # 온도 범례를 뒤집음(고온이 위로 가도록)
+    # 온도 라인만 (끝에서 2개는 Wien's law, Visible range)
+    handles, labels = ax.get_legend_handles_labels()
+    new_handles = handles[:-2][::-1] + handles[-2:]
+    new_labels = labels[:-2][::-1] + labels[-2:]
+    ax.legend(new_handles, new_labels, title="", loc="upper right", fontsize=10)
+
+    # 원점이 꼭짓점에 붙도록 설정
+    ax.set_xlim(0, w_max_nm)    # x축 0~w_max nm
+    ax.set_ylim(0, None)        # y축 0부터 시작
+    ax.margins(x=0, y=0)        # x, y축 여백 제거 (값을 미리 나눠 두어 축 위쪽 1e-? 표시는 생기지 않음)
+
+
+# 0 눈금 라벨 숨기고 원점에 '0' 을 한 번만 표시 (tight_layout 이후에 호출)
+def single_origin_label(ax):
+    xt = ax.get_xticks(); ax.set_xticks([t for t in xt if t != 0])
+    yt = ax.get_yticks(); ax.set_yticks([t for t in yt if t != 0])
+    ax.annotate("0", xy=(0, 0), xycoords="data",
+                xytext=(-8, -8), textcoords="offset points",
+                ha="center", va="center", clip_on=False)
+
+
+def main():
+    import matplotlib.pyplot as plt     # 그래프 그리기
+
+    # 그림 크기 지정 - 가로, 세로
+    fig, ax = plt.subplots(figsize=(5, 3))
+    temps = [2500, 3000, 3500, 4000, 4500, 5000, 5500]     # K
+    plot_spectra(ax, temps)
+    plt.tight_layout()
+    single_origin_label(ax)
+
+    # -------------------------------
+    # 결과 저장 (벡터) - 비활성화하고 수동으로 저장
+    # -------------------------------
+    # plt.savefig("blackbody_u_lambda.svg")
+    # plt.savefig("blackbody_u_lambda.pdf")
+
+    # -------------------------------
+    # 화면 출력
+    # -------------------------------
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import sys
+sys.path.append(r"D:\seolgit\python_packages")  # 패키지가 설치된 경로 지정
+
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import blackbody as bb
+
+# -------------------------------
+# 흑체복사 그림 일괄 저장 (창 없이, pyplot 을 쓰지 않고 Figure 를 바로 SVG/PDF/PNG 로)
+#   그림 설정(spec) 목록을 받아 프로세스 여러 개로 나눠 그림
+#   spec + 계산 데이터 + blackbody.py 코드의 해시가 지난번과 같고 파일이 있으면 건너뜀
+#
+#   python render_figures.py                         기본 그림들 → figures/
+#   python render_figures.py specs.json -o out --workers 4 --force
+#
+#   spec (JSON 목록의 원소):
+#     {"name": "visible", "temps": [3000, 4000], "w_max_nm": 1500, "n": 1000,
+#      "unit": "kJ/nm", "figsize": [5, 3], "formats": ["svg", "pdf"],
+#      "style": "default", "rc": {"font.family": "serif"}}
+# -------------------------------
+OUT_DIR = "figures"
+MANIFEST = ".render_cache.json"     # 그림 이름 → 해시 (출력 폴더 안)
+SPEC_DEFAULTS = dict(temps=[2500, 3000, 3500, 4000, 4500, 5000, 5500], w_max_nm=3000, n=1000,
+                     unit="kJ/nm", figsize=[5, 3], formats=["svg", "pdf"], style="default", rc={})
+
+DEFAULT_SPECS = [
+    dict(name="blackbody_u_lambda"),
+    dict(name="blackbody_hot", temps=[6000, 7000, 8000, 9000, 10000], w_max_nm=2000),
+    dict(name="blackbody_cool", temps=[1000, 1500, 2000, 2500], w_max_nm=6000),
+    dict(name="blackbody_u_lambda_serif", rc={"font.family": "serif"}, formats=["svg"]),
+]
+
+
+def full_spec(spec):
+    s = dict(SPEC_DEFAULTS, **spec)
+    if "name" not in s:
+        raise ValueError(f"spec 에 name 이 없습니다: {spec}")
+    return s
+
+
+def _code_hash():
+    with open(bb.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# spec + 그릴 데이터 + 계산/그림 코드 + matplotlib 버전 → 해시 (같으면 다시 그릴 필요 없음)
+def figure_hash(spec, code_hash):
+    import matplotlib
+    lam = np.linspace(0, spec["w_max_nm"], spec["n"]) * 1e-9
+    data = bb.spectrum_grid(spec["temps"], lam)
+    hs = hashlib.sha256()
+    hs.update(json.dumps(spec, sort_keys=True).encode())
+    hs.update(np.ascontiguousarray(data).tobytes())
+    hs.update(code_hash.encode())
+    hs.update(matplotlib.__version__.encode())
+    return hs.hexdigest()
+
+
+def output_paths(spec, out_dir):
+    return [os.path.join(out_dir, f"{spec['name']}.{fmt}") for fmt in spec["formats"]]
+
+
+# 그림 하나 그리기 (워커 프로세스에서 실행), 결과 dict
+def render_one(spec, out_dir, old_hash=None, force=False, code_hash=None):
+    t0 = time.perf_counter()
+    spec = full_spec(spec)
+    digest = figure_hash(spec, code_hash or _code_hash())
+    paths = output_paths(spec, out_dir)
+    if not force and digest == old_hash and all(os.path.exists(p) for p in paths):
+        return dict(name=spec["name"], status="skipped", hash=digest, files=paths,
+                    seconds=time.perf_counter() - t0)
+
+    import matplotlib
+    from matplotlib import style as mpl_style
+    from matplotlib.figure import Figure       # pyplot/GUI 백엔드를 불러오지 않음
+
+    with mpl_style.context(spec["style"]), matplotlib.rc_context(dict(spec["rc"], **{"svg.hashsalt": spec["name"]})):
+        fig = Figure(figsize=tuple(spec["figsize"]))
+        ax = fig.subplots()
+        bb.plot_spectra(ax, spec["temps"], spec["w_max_nm"], spec["n"], spec["unit"])
+        fig.tight_layout()
+        bb.single_origin_label(ax)
+        for path, fmt in zip(paths, spec["formats"]):
+            # 날짜 메타데이터를 빼서 같은 그림이면 같은 파일
+            meta = {"Date": None} if fmt == "svg" else {"CreationDate": None} if fmt == "pdf" else {}
+            fig.savefig(path, format=fmt, metadata=meta)
+    return dict(name=spec["name"], status="rendered", hash=digest, files=paths,
+                seconds=time.perf_counter() - t0)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# spec 목록 전체 그리기, 그림별 결과 리스트 (spec 순서)
+def render_all(specs, out_dir=OUT_DIR, workers=0, force=False):
+    os.makedirs(out_dir, exist_ok=True)
+    names = [full_spec(s)["name"] for s in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("spec name 이 중복됩니다 (출력 파일 이름으로 쓰임)")
+    manifest = load_manifest(out_dir)
+    code_hash = _code_hash()
+    jobs = [(s, out_dir, manifest.get(n), force, code_hash) for s, n in zip(specs, names)]
+    if workers <= 0:
+        results = [render_one(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(render_one, *zip(*jobs)))
+    manifest.update({r["name"]: r["hash"] for r in results})
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="흑체복사 그림 일괄 저장 (SVG/PDF, 창 없이)")
+    ap.add_argument("specs", nargs="?", default=None, help="spec 목록 JSON (기본: DEFAULT_SPECS)")
+    ap.add_argument("-o", "--out-dir", default=OUT_DIR)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 이면 현재 프로세스에서")
+    ap.add_argument("--force", action="store_true", help="해시가 같아도 다시 그림")
+    args = ap.parse_args()
+
+    specs = DEFAULT_SPECS
+    if args.specs:
+        with open(args.specs, encoding="utf-8") as f:
+            specs = json.load(f)
+    t0 = time.perf_counter()
+    results = render_all(specs, args.out_dir, args.workers, args.force)
+    for r in results:
+        print(f"{r['name']:<32} {r['status']:<9} {r['seconds']:7.3f}s  {', '.join(os.path.basename(p) for p in r['files'])}")
+    done = sum(r["status"] == "rendered" for r in results)
+    print(f"그림 {len(results)}개 (새로 그림 {done}, 건너뜀 {len(results) - done}), {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()